@@ -177,10 +177,13 @@ class ExecutionBuilder {
     table.className = "test-table individual-test-table";
 
     table.appendChild(this._table_header());
-    table.appendChild(this._table_body());
     table.appendChild(this._table_footer());
 
-    return table;
+    // Only the rows scrolled into view are built
+    const rows = this._model.get_rows();
+    const virtual_table = new VirtualTable(rows.map(() => 1), (i) => [this._table_body_row(rows[i])], 3);
+
+    return virtual_table.build(table);
   }
 
   _table_header() {
@@ -210,22 +213,13 @@ class ExecutionBuilder {
     return cell;
   }
 
-  _table_body() {
-    let body = document.createElement("tbody");
-
-    for (let i = 0; i < this._filtered_execution.steps.length; i++) {
-      const step = this._filtered_execution.steps[i];
-      body.appendChild(this._table_body_row(step));
-    }
-
-    return body;
-  }
+  _table_body_row(row_model) {
+    const step = row_model.step;
 
-  _table_body_row(step) {
     let row = document.createElement("tr");
     row.className = step.outcome;
 
-    row.appendChild(this._table_body_cell(`${parseInt(step.id) + 1}/${this._execution.steps.length}`));
+    row.appendChild(this._table_body_cell(row_model.label));
     row.appendChild(this._table_body_cell(step.description));
     row.appendChild(this._table_body_cell(step.outcome));
 
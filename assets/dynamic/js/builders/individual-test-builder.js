@@ -31,11 +31,16 @@ class IndividualTestBuilder {
     if (this._filtered_test != null) {
       this._root.className = "individual-test";
       this._root.appendChild(this._title());
-      this._root.appendChild(this._description());
-      this._root.appendChild(this._ran_on());
+      this._root.appendChild(this._action_bar());
 
-      const execution_builder = new ExecutionBuilder(this._model.get_selected_execution_model());
-      this._root.appendChild(execution_builder.build());
+      // The details are only built (and loaded) once the test is shown
+      if (this._model.is_expanded()) {
+        this._root.appendChild(this._description());
+        this._root.appendChild(this._ran_on());
+
+        const execution_builder = new ExecutionBuilder(this._model.get_selected_execution_model());
+        this._root.appendChild(execution_builder.build());
+      }
     }
 
     return this._root;
@@ -62,6 +67,28 @@ class IndividualTestBuilder {
     return title;
   }
 
+  _action_bar() {
+    let action_bar = document.createElement("div");
+    action_bar.className = "action-bar";
+
+    let button = document.createElement("button");
+    button.className = "show";
+
+    if (this._model.is_expanded()) {
+      button.innerText = "Hide test";
+    } else {
+      button.innerText = "Show test";
+    }
+
+    button.onclick = () => {
+      this._model.toggle_expanded();
+    };
+
+    action_bar.appendChild(button);
+
+    return action_bar;
+  }
+
   _description() {
     let description = document.createElement("div");
     description.className = "test-description";
@@ -88,7 +115,9 @@ class IndividualTestBuilder {
         continue;
       }
 
-      text.innerHTML += descriptions[i] + "<br/>\n";
+      // Text nodes, the description is written by the user and is not HTML
+      text.appendChild(document.createTextNode(descriptions[i]));
+      text.appendChild(document.createElement("br"));
     }
 
     return text;
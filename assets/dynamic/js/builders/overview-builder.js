@@ -8,11 +8,14 @@
  */
 
 class OverviewBuilder {
+  static SEARCH_DELAY = 150;
+
   _root = null;
   _model = null;
   _tests = null;
   _filtered_tests = null;
   _table_model = null;
+  _search = null;
 
   constructor(model) {
     this._model = model;
@@ -40,6 +43,9 @@ class OverviewBuilder {
   }
 
   update() {
+    // The search box is kept while the overview is rebuilt, the focus is lost when it is removed
+    const searching = this._search != null && document.activeElement == this._search;
+
     while (this._root.firstChild) {
       this._root.removeChild(this._root.firstChild);
     }
@@ -47,6 +53,10 @@ class OverviewBuilder {
     this._filtered_tests = this._model.get_filtered_tests();
 
     this.build();
+
+    if (searching) {
+      this._search.focus();
+    }
   }
 
   _title() {
@@ -62,9 +72,49 @@ class OverviewBuilder {
     action_bar.appendChild(this._action_bar_visibility_button());
     action_bar.appendChild(this._action_bar_summary());
 
+    if (this._model.get_devices().length > 1) {
+      action_bar.appendChild(this._action_bar_devices());
+    }
+
+    action_bar.appendChild(this._action_bar_search());
+
     return action_bar;
   }
 
+  _action_bar_search() {
+    if (this._search == null) {
+      this._search = document.createElement("input");
+      this._search.type = "search";
+      this._search.className = "search";
+      this._search.placeholder = "Search tests";
+
+      // Searched once the typing pauses, not on every key
+      let timeout = null;
+
+      this._search.oninput = () => {
+        clearTimeout(timeout);
+        timeout = setTimeout(() => this._model.set_query(this._search.value), OverviewBuilder.SEARCH_DELAY);
+      };
+    }
+
+    return this._search;
+  }
+
+  _action_bar_devices() {
+    const devices = this._model.get_devices();
+    let options = [new SelectOption(-1, "All devices", "")];
+
+    for (let i = 0; i < devices.length; i++) {
+      options.push(new SelectOption(i, devices[i], ""));
+    }
+
+    const select = new Select(options, (id) => {
+      this._model.set_device(id < 0 ? null : devices[id]);
+    });
+
+    return select.build(devices.indexOf(this._model.get_device()));
+  }
+
   _action_bar_visibility_button() {
     let button = document.createElement("button");
     button.className = "show";
@@ -86,19 +136,11 @@ class OverviewBuilder {
     let summary = document.createElement("span");
     summary.className = "summary";
 
-    let passed = 0;
-    let failed = 0;
-    let skipped = 0;
-
-    for (let i = 0; i < this._tests.length; i++) {
-      if (this._tests[i].get_outcome() == "passed") {
-        passed++;
-      } else if (this._tests[i].get_outcome() == "failed") {
-        failed++;
-      } else if (this._tests[i].get_outcome() == "skipped") {
-        skipped++;
-      }
-    }
+    // Counted by the generator, the number of tests of every outcome is the length of its posting list
+    const index = this._model.get_index();
+    const passed = index.count("passed");
+    const failed = index.count("failed");
+    const skipped = index.count("skipped");
 
     const total = passed + failed + skipped;
 
@@ -185,9 +227,12 @@ class OverviewBuilder {
     table.className = "test-table";
 
     table.appendChild(this._table_header());
-    table.appendChild(this._table_body());
 
-    return table;
+    // Only the rows scrolled into view are built
+    const groups = this._model.get_row_groups();
+    const virtual_table = new VirtualTable(groups.map((group) => group.rows.length), (i) => this._table_body_rows(groups[i]), 6);
+
+    return virtual_table.build(table);
   }
 
   _table_header() {
@@ -220,31 +265,24 @@ class OverviewBuilder {
     return cell;
   }
 
-  _table_body() {
-    let body = document.createElement("tbody");
+  _table_body_rows(group) {
+    let rows = [];
 
-    for (let i = 0; i < this._filtered_tests.length; i++) {
-      const test = this._filtered_tests[i];
-      for (let j = 0; j < test.executions.length; j++) {
-        body.appendChild(this._table_body_row(test, test.executions[j], j));
-      }
+    for (let i = 0; i < group.rows.length; i++) {
+      rows.push(this._table_body_row(group, group.rows[i], i));
     }
 
-    return body;
+    return rows;
   }
 
-  _table_body_row(test, execution, row_count) {
-    let row = document.createElement("tr");
-    row.className = "selectable";
+  _table_body_row(group, row_model, row_count) {
+    const test = group.test;
+    const execution = row_model.execution;
 
-    if (test.has_same_outcome()) {
-      row.className += ` ${test.get_outcome()}`;
-    } else {
-      row.className += " mixed";
-    }
+    let row = document.createElement("tr");
+    row.className = group.class_name;
 
-    const is_last = test.executions.length == 1 || execution.id == test.executions.length - 1;
-    if (!is_last) {
+    if (row_count != group.rows.length - 1) {
       row.className += " no-border";
     }
 
@@ -253,16 +291,16 @@ class OverviewBuilder {
     };
 
     if (row_count == 0) {
-      row.appendChild(this._table_body_cell(test.id, "", { rowspan: test.executions.length }));
+      row.appendChild(this._table_body_cell(test.id, "", { rowspan: group.rows.length }));
       row.appendChild(this._table_body_cell(execution.outcome, execution.outcome));
       row.appendChild(this._table_body_cell(execution.device, execution.outcome));
-      row.appendChild(this._table_body_cell(test.name, "", { rowspan: test.executions.length }));
-      row.appendChild(this._table_body_cell(`${execution.duration.toFixed(2).toString()}s`, execution.outcome));
-      row.appendChild(this._table_body_cell(test.executions.length, "", { align: "center", rowspan: test.executions.length }));
+      row.appendChild(this._table_body_cell(test.name, "", { rowspan: group.rows.length }));
+      row.appendChild(this._table_body_cell(row_model.duration, execution.outcome));
+      row.appendChild(this._table_body_cell(group.rows.length, "", { align: "center", rowspan: group.rows.length }));
     } else {
       row.appendChild(this._table_body_cell(execution.outcome, execution.outcome));
       row.appendChild(this._table_body_cell(execution.device, execution.outcome));
-      row.appendChild(this._table_body_cell(`${execution.duration.toFixed(2).toString()}s`, execution.outcome));
+      row.appendChild(this._table_body_cell(row_model.duration, execution.outcome));
     }
 
     return row;
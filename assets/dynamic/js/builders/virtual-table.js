@@ -0,0 +1,170 @@
+/*
+ * SPDX-License-Identifier: MIT
+ * File     :  virtual-table.js
+ * Desc     :  VirtualTable class, to only build the rows of a table which are scrolled into view
+ * Authors  :  Nick Vissers <nick.vissers@openpixelsystems.org>
+ * Date     :  18/10/2026
+ * Version  :  1.0
+ */
+
+class VirtualTable {
+  static BUFFER_ROWS = 20;
+  static DEFAULT_ROW_HEIGHT = 45;
+  static DEFAULT_VISIBLE_ROWS = 50;
+
+  _groups = [];
+  _offsets = [];
+  _build_group = null;
+  _columns = 0;
+  _row_height = VirtualTable.DEFAULT_ROW_HEIGHT;
+  _measured = false;
+  _container = null;
+  _body = null;
+  _top = null;
+  _bottom = null;
+  _first = -1;
+  _last = -1;
+  _frame = false;
+
+  // Rows are built per group (e.g., the executions of a test), so rowspan cells are always complete. build_group(i)
+  // returns the rows of group i, groups[i] is its number of rows.
+  constructor(groups, build_group, columns) {
+    this._groups = groups;
+    this._build_group = build_group;
+    this._columns = columns;
+
+    // Offsets of the first row of every group, computed once per table
+    this._offsets = [0];
+
+    for (let i = 0; i < groups.length; i++) {
+      this._offsets.push(this._offsets[i] + groups[i]);
+    }
+  }
+
+  build(table) {
+    this._container = document.createElement("div");
+    this._container.className = "virtual-table";
+
+    this._body = document.createElement("tbody");
+    this._top = this._spacer();
+    this._bottom = this._spacer();
+
+    this._body.appendChild(this._top);
+    this._body.appendChild(this._bottom);
+
+    table.appendChild(this._body);
+    this._container.appendChild(table);
+
+    this._container.onscroll = () => {
+      if (!this._frame) {
+        this._frame = true;
+
+        requestAnimationFrame(() => {
+          this._frame = false;
+          this._update();
+        });
+      }
+    };
+
+    this._update();
+
+    // Rows are only measured once they are laid out
+    requestAnimationFrame(() => this._measure());
+
+    return this._container;
+  }
+
+  _update() {
+    const rows = this._offsets[this._groups.length];
+
+    if (rows == 0) {
+      return;
+    }
+
+    const scroll_top = this._container.scrollTop;
+    const height = this._container.clientHeight > 0 ? this._container.clientHeight : VirtualTable.DEFAULT_VISIBLE_ROWS * this._row_height;
+
+    const first_row = Math.max(0, Math.floor(scroll_top / this._row_height) - VirtualTable.BUFFER_ROWS);
+    const last_row = Math.min(rows - 1, Math.ceil((scroll_top + height) / this._row_height) + VirtualTable.BUFFER_ROWS);
+
+    const first = this._group(first_row);
+    const last = this._group(last_row);
+
+    if (first == this._first && last == this._last) {
+      return;
+    }
+
+    this._first = first;
+    this._last = last;
+
+    while (this._top.nextSibling != this._bottom) {
+      this._body.removeChild(this._top.nextSibling);
+    }
+
+    for (let i = first; i <= last; i++) {
+      const group_rows = this._build_group(i);
+
+      for (let j = 0; j < group_rows.length; j++) {
+        this._body.insertBefore(group_rows[j], this._bottom);
+      }
+    }
+
+    // The spacers keep the scroll height of the rows which are not built
+    this._top.style.height = `${this._offsets[first] * this._row_height}px`;
+    this._bottom.style.height = `${(rows - this._offsets[last + 1]) * this._row_height}px`;
+  }
+
+  _measure() {
+    if (this._measured || this._first < 0) {
+      return;
+    }
+
+    let height = 0;
+    let count = 0;
+
+    for (let row = this._top.nextSibling; row != null && row != this._bottom; row = row.nextSibling) {
+      height += row.offsetHeight;
+      count++;
+    }
+
+    if (count > 0 && height > 0) {
+      this._measured = true;
+      this._row_height = height / count;
+
+      // Rebuild the rows for the measured height
+      this._first = -1;
+      this._last = -1;
+      this._update();
+    }
+  }
+
+  _group(row) {
+    // Binary search for the group holding the row
+    let low = 0;
+    let high = this._groups.length - 1;
+
+    while (low < high) {
+      const middle = (low + high + 1) >> 1;
+
+      if (this._offsets[middle] <= row) {
+        low = middle;
+      } else {
+        high = middle - 1;
+      }
+    }
+
+    return low;
+  }
+
+  _spacer() {
+    let row = document.createElement("tr");
+    row.className = "virtual-spacer";
+
+    let cell = document.createElement("td");
+    cell.setAttribute("colspan", this._columns);
+
+    row.appendChild(cell);
+
+    return row;
+  }
+}
@@ -8,11 +8,23 @@
  */
 
 // Wait for the DOM to be ready
-document.addEventListener("DOMContentLoaded", () => {
+document.addEventListener("DOMContentLoaded", async () => {
   const parser = new Parser();
-  const tests = parser.parse();
+  const tests = await parser.parse();
 
-  const model = new Model(tests);
+  const model = new Model(tests, parser);
   const builder = new Builder(model);
   document.body.appendChild(builder.build());
+
+  // Tests are shown when they are linked, e.g., from the overview
+  const show_linked_test = () => {
+    const match = window.location.hash.match(/^#test-(\d+)$/);
+
+    if (match) {
+      model.show_test(parseInt(match[1]));
+    }
+  };
+
+  window.addEventListener("hashchange", show_linked_test);
+  show_linked_test();
 });
@@ -0,0 +1,140 @@
+/*
+ * SPDX-License-Identifier: MIT
+ * File     :  search-index.js
+ * Desc     :  SearchIndex class, to search the tests with the token index precomputed by the generator
+ * Authors  :  Nick Vissers <nick.vissers@openpixelsystems.org>
+ * Date     :  18/10/2026
+ * Version  :  1.0
+ */
+
+class SearchIndex {
+  _count = 0;
+  _tokens = [];
+  _tests = [];
+  _decoded = [];
+
+  // The tokens are sorted, the delta encoded test indices of token i are found in tests[i]
+  constructor(count, search) {
+    this._count = count;
+    this._tokens = search.tokens;
+    this._tests = search.tests;
+    this._decoded = new Array(search.tokens.length).fill(null);
+  }
+
+  // Same words as the generator: lowercase letters, marks and digits
+  static tokenize(text) {
+    return text.toLowerCase().match(/[\p{L}\p{M}\p{N}]+/gu) || [];
+  }
+
+  // Code point order, as the tokens are sorted by the generator (< compares UTF-16 code units)
+  static before(a, b) {
+    const length = Math.min(a.length, b.length);
+
+    for (let i = 0; i < length; i++) {
+      const x = a.codePointAt(i);
+      const y = b.codePointAt(i);
+
+      if (x != y) {
+        return x < y;
+      } else if (x > 0xffff) {
+        i++;
+      }
+    }
+
+    return a.length < b.length;
+  }
+
+  // Sorted indices of the tests with a word starting with every word of the query, null for an empty query
+  search(query) {
+    const words = SearchIndex.tokenize(query);
+
+    if (words.length == 0) {
+      return null;
+    }
+
+    let ids = null;
+
+    for (let i = 0; i < words.length; i++) {
+      const matches = this._prefix(words[i]);
+
+      ids = ids == null ? matches : TestIndex.intersect(ids, matches);
+
+      if (ids.length == 0) {
+        break;
+      }
+    }
+
+    return ids;
+  }
+
+  _prefix(word) {
+    // The tokens starting with the word are next to each other in the sorted tokens
+    const first = this._lower_bound(word);
+    let last = first;
+
+    while (last < this._tokens.length && this._tokens[last].startsWith(word)) {
+      last++;
+    }
+
+    if (first == last) {
+      return [];
+    } else if (last - first == 1) {
+      return this._postings(first);
+    }
+
+    let marks = new Uint8Array(this._count);
+
+    for (let i = first; i < last; i++) {
+      const postings = this._postings(i);
+
+      for (let j = 0; j < postings.length; j++) {
+        marks[postings[j]] = 1;
+      }
+    }
+
+    let ids = [];
+
+    for (let i = 0; i < marks.length; i++) {
+      if (marks[i] == 1) {
+        ids.push(i);
+      }
+    }
+
+    return ids;
+  }
+
+  _postings(token) {
+    // Decoded on first use
+    if (this._decoded[token] == null) {
+      const deltas = this._tests[token];
+      let ids = new Array(deltas.length);
+      let id = 0;
+
+      for (let i = 0; i < deltas.length; i++) {
+        id += deltas[i];
+        ids[i] = id;
+      }
+
+      this._decoded[token] = ids;
+    }
+
+    return this._decoded[token];
+  }
+
+  _lower_bound(word) {
+    let low = 0;
+    let high = this._tokens.length;
+
+    while (low < high) {
+      const middle = (low + high) >> 1;
+
+      if (SearchIndex.before(this._tokens[middle], word)) {
+        low = middle + 1;
+      } else {
+        high = middle;
+      }
+    }
+
+    return low;
+  }
+}
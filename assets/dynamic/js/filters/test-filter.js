@@ -8,12 +8,33 @@
  */
 
 class TestFilter {
-  tests(tests, passed_active, failed_active, skipped_active) {
+  _index = null;
+
+  constructor(index) {
+    this._index = index;
+  }
+
+  // Matches are the sorted indices of the tests found by a search, null if there is no search
+  tests(tests, passed_active, failed_active, skipped_active, device = null, matches = null) {
     let filtered_tests = [];
 
-    for (let i = 0; i < tests.length; i++) {
-      const test = tests[i];
-      const filtered_test = this.test(test, passed_active, failed_active, skipped_active);
+    // Only the tests in the posting lists of the active outcomes (and the device) are visited
+    let ids = this._index.select(passed_active, failed_active, skipped_active, device);
+
+    if (matches != null) {
+      ids = TestIndex.intersect(ids, matches);
+    }
+
+    for (let i = 0; i < ids.length; i++) {
+      const test = tests[ids[i]];
+
+      // All executions of a uniform test have the selected outcome, the test is kept as is
+      if (device == null && this._index.is_uniform(test.id)) {
+        filtered_tests.push(test);
+        continue;
+      }
+
+      const filtered_test = this.test(test, passed_active, failed_active, skipped_active, device);
       if (filtered_test) {
         filtered_tests.push(filtered_test);
       }
@@ -22,12 +43,12 @@ class TestFilter {
     return filtered_tests;
   }
 
-  test(test, passed_active, failed_active, skipped_active) {
+  test(test, passed_active, failed_active, skipped_active, device = null) {
     let filtered_executions = [];
 
     for (let i = 0; i < test.executions.length; i++) {
       const execution = test.executions[i];
-      const filtered_execution = this.execution(execution, passed_active, failed_active, skipped_active);
+      const filtered_execution = this.execution(execution, passed_active, failed_active, skipped_active, device);
       if (filtered_execution) {
         filtered_executions.push(filtered_execution);
       }
@@ -40,18 +61,16 @@ class TestFilter {
     return null;
   }
 
-  execution(execution, passed_active, failed_active, skipped_active) {
+  execution(execution, passed_active, failed_active, skipped_active, device = null) {
     if ((execution.outcome == "passed" && !passed_active) || (execution.outcome == "failed" && !failed_active) || (execution.outcome == "skipped" && !skipped_active)) {
       return null;
     }
 
-    let filtered_steps = [];
-
-    for (let i = 0; i < execution.steps.length; i++) {
-      const step = execution.steps[i];
-      filtered_steps.push(new Step(step.id, step.description, step.outcome));
+    if (device != null && execution.device != device) {
+      return null;
     }
 
-    return new Execution(execution.id, execution.device, execution.outcome, execution.duration, filtered_steps);
+    // The steps are shared, they are not loaded yet for tests which were not shown
+    return new Execution(execution.id, execution.device, execution.outcome, execution.duration, execution.steps);
   }
 }
@@ -0,0 +1,117 @@
+/*
+ * SPDX-License-Identifier: MIT
+ * File     :  test-index.js
+ * Desc     :  TestIndex class, to select tests with the posting lists precomputed by the generator
+ * Authors  :  Nick Vissers <nick.vissers@openpixelsystems.org>
+ * Date     :  18/10/2026
+ * Version  :  1.0
+ */
+
+class TestIndex {
+  _count = 0;
+  _outcomes = {};
+  _execution_outcomes = {};
+  _devices = {};
+  _uniform = null;
+
+  // Every posting list holds the sorted indices of the tests with an outcome, an execution outcome or a device
+  constructor(count, indexes) {
+    this._count = count;
+    this._outcomes = indexes.outcome;
+    this._execution_outcomes = indexes.execution_outcome;
+    this._devices = indexes.device;
+    this._uniform = new Uint8Array(count);
+
+    for (let i = 0; i < indexes.uniform.length; i++) {
+      this._uniform[indexes.uniform[i]] = 1;
+    }
+  }
+
+  count(outcome) {
+    return outcome in this._outcomes ? this._outcomes[outcome].length : 0;
+  }
+
+  devices() {
+    return Object.keys(this._devices);
+  }
+
+  is_uniform(id) {
+    return this._uniform[id] == 1;
+  }
+
+  // Tests with an execution of an active outcome (outcomes other than passed, failed or skipped are always active)
+  // and, if a device is given, an execution on that device
+  select(passed_active, failed_active, skipped_active, device = null) {
+    let lists = [];
+
+    for (const outcome in this._execution_outcomes) {
+      if ((outcome == "passed" && !passed_active) || (outcome == "failed" && !failed_active) || (outcome == "skipped" && !skipped_active)) {
+        continue;
+      }
+
+      lists.push(this._execution_outcomes[outcome]);
+    }
+
+    let ids = TestIndex.union(lists);
+
+    if (device != null) {
+      ids = TestIndex.intersect(ids, device in this._devices ? this._devices[device] : []);
+    }
+
+    return ids;
+  }
+
+  static union(lists) {
+    if (lists.length == 1) {
+      return lists[0];
+    }
+
+    let ids = [];
+
+    for (let i = 0; i < lists.length; i++) {
+      ids = TestIndex._merge(ids, lists[i]);
+    }
+
+    return ids;
+  }
+
+  static intersect(a, b) {
+    let ids = [];
+    let i = 0;
+    let j = 0;
+
+    while (i < a.length && j < b.length) {
+      if (a[i] < b[j]) {
+        i++;
+      } else if (a[i] > b[j]) {
+        j++;
+      } else {
+        ids.push(a[i]);
+        i++;
+        j++;
+      }
+    }
+
+    return ids;
+  }
+
+  static _merge(a, b) {
+    let ids = [];
+    let i = 0;
+    let j = 0;
+
+    while (i < a.length || j < b.length) {
+      if (j >= b.length || (i < a.length && a[i] < b[j])) {
+        ids.push(a[i++]);
+      } else if (i >= a.length || b[j] < a[i]) {
+        ids.push(b[j++]);
+      } else {
+        ids.push(a[i]);
+        i++;
+        j++;
+      }
+    }
+
+    return ids;
+  }
+}
@@ -7,9 +7,21 @@
  * Version  :  1.0
  */
 
+class StepRow {
+  step = null;
+  label = "";
+
+  constructor(step, count) {
+    this.step = step;
+    this.label = `${parseInt(step.id) + 1}/${count}`;
+  }
+}
+
 class ExecutionModel {
   _execution = null;
   _filtered_execution = null;
+  _rows = [];
+  _filtered_rows = [];
   _builder = null;
   _model = null;
   _filter = null;
@@ -19,6 +31,10 @@ class ExecutionModel {
     this._filtered_execution = execution;
     this._filter = new ExecutionFilter();
 
+    // Row models are built once, filtering only selects them
+    this._rows = execution.steps.map((step) => new StepRow(step, execution.steps.length));
+    this._filtered_rows = this._rows;
+
     let passed = null;
     let failed = null;
     let skipped = null;
@@ -63,12 +79,17 @@ class ExecutionModel {
     return this._model;
   }
 
+  get_rows() {
+    return this._filtered_rows;
+  }
+
   _visible_changed() {
     this.update();
   }
 
   _filters_changed() {
     this._filtered_execution = this._filter.execution(this._execution, this._model.passed_active(), this._model.failed_active(), this._model.skipped_active());
+    this._filtered_rows = this._filtered_execution.steps.map((step) => this._rows[step.id]);
     this.update();
   }
 }
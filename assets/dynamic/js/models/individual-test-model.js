@@ -12,22 +12,18 @@ class IndividualTestModel {
   _filtered_test = null;
   _builder = null;
   _execution_models = [];
-  _filter = null;
   _selected_execution_id = -1;
+  _parser = null;
+  _expanded = false;
 
-  constructor(test) {
+  constructor(test, parser) {
     this._test = test;
     this._filtered_test = test;
-    this._filter = new TestFilter();
+    this._parser = parser;
 
-    for (let i = 0; i < test.executions.length; i++) {
-      const execution = test.executions[i];
-      this._execution_models.push(new ExecutionModel(execution));
-
-      if (i == 0) {
-        // By default, select the first execution
-        this._selected_execution_id = execution.id;
-      }
+    if (test.executions.length > 0) {
+      // By default, select the first execution
+      this._selected_execution_id = test.executions[0].id;
     }
   }
 
@@ -39,6 +35,50 @@ class IndividualTestModel {
     }
   }
 
+  is_expanded() {
+    return this._expanded;
+  }
+
+  async toggle_expanded() {
+    if (this._expanded) {
+      this._expanded = false;
+      this.update();
+    } else {
+      await this.expand();
+    }
+  }
+
+  async expand() {
+    if (this._expanded) {
+      return;
+    }
+
+    try {
+      if (!this._test.loaded) {
+        await this._parser.load(this._test);
+      }
+    } catch (error) {
+      console.log("Could not load the details of test " + this._test.id + ": " + error.message);
+      return;
+    }
+
+    // The execution models need the steps, they are created once the details are loaded
+    if (this._execution_models.length == 0) {
+      for (let i = 0; i < this._test.executions.length; i++) {
+        const execution_model = new ExecutionModel(this._test.executions[i]);
+
+        if (this._builder != null) {
+          execution_model.register(this._builder);
+        }
+
+        this._execution_models.push(execution_model);
+      }
+    }
+
+    this._expanded = true;
+    this.update();
+  }
+
   update() {
     if (this._builder != null) {
       this._builder.update();
@@ -92,8 +132,13 @@ class IndividualTestModel {
     return null;
   }
 
-  overview_filters_changed(model) {
-    this._filtered_test = this._filter.test(this._test, model.passed_active(), model.failed_active(), model.skipped_active());
+  set_filtered_test(filtered_test) {
+    // Unchanged by the filters, e.g., a uniform test of which the outcome stays active
+    if (filtered_test === this._filtered_test) {
+      return;
+    }
+
+    this._filtered_test = filtered_test;
 
     if (this._filtered_test != null) {
       let execution_found = false;
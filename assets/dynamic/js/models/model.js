@@ -11,17 +11,39 @@ class Model {
   overview_model = null;
   individual_test_models = [];
 
-  constructor(tests) {
-    this.overview_model = new OverviewModel(tests, this.overview_filters_changed.bind(this));
+  constructor(tests, parser) {
+    this.overview_model = new OverviewModel(tests, parser.get_index(), parser.get_search_index(), this.overview_filters_changed.bind(this));
 
     for (let i = 0; i < tests.length; i++) {
-      this.individual_test_models.push(new IndividualTestModel(tests[i]));
+      this.individual_test_models.push(new IndividualTestModel(tests[i], parser));
     }
   }
 
-  overview_filters_changed(model) {
+  async show_test(id) {
+    if (id < 0 || id >= this.individual_test_models.length) {
+      return;
+    }
+
+    await this.individual_test_models[id].expand();
+
+    // The test is rebuilt once its details are loaded
+    const title = document.getElementById(`test-${id}`);
+    if (title != null) {
+      title.scrollIntoView();
+    }
+  }
+
+  overview_filters_changed() {
+    // The tests are filtered once by the overview, a test which is filtered out is null
+    let filtered_tests = new Array(this.individual_test_models.length).fill(null);
+    const tests = this.overview_model.get_filtered_tests();
+
+    for (let i = 0; i < tests.length; i++) {
+      filtered_tests[tests[i].id] = tests[i];
+    }
+
     for (let i = 0; i < this.individual_test_models.length; i++) {
-      this.individual_test_models[i].overview_filters_changed(model);
+      this.individual_test_models[i].set_filtered_test(filtered_tests[i]);
     }
   }
 }
@@ -7,35 +7,59 @@
  * Version  :  1.0
  */
 
+class OverviewRow {
+  execution = null;
+  duration = "";
+
+  constructor(execution) {
+    this.execution = execution;
+    this.duration = `${execution.duration.toFixed(2).toString()}s`;
+  }
+}
+
+class OverviewRowGroup {
+  test = null;
+  class_name = "";
+  rows = [];
+
+  // The rows of the executions of a test, the outcome classes depend on the executions left after filtering
+  constructor(test, rows) {
+    this.test = test;
+    this.class_name = test.has_same_outcome() ? `selectable ${test.get_outcome()}` : "selectable mixed";
+    this.rows = rows;
+  }
+}
+
 class OverviewModel {
   _tests = [];
   _filtered_tests = null;
+  _rows = [];
+  _row_groups = [];
   _builder = null;
   _model = null;
+  _index = null;
+  _search_index = null;
   _filter = null;
+  _device = null;
+  _query = "";
   _filters_changed_callback = null;
 
-  constructor(tests, filters_changed_callback) {
+  constructor(tests, index, search_index, filters_changed_callback) {
     this._tests = tests;
     this._filtered_tests = tests;
-    this._filter = new TestFilter();
+    this._index = index;
+    this._search_index = search_index;
+    this._filter = new TestFilter(index);
     this._filters_changed_callback = filters_changed_callback;
 
-    let passed = false;
-    let failed = false;
-    let skipped = false;
+    // Row models are built once, filtering only regroups them
+    this._rows = tests.map((test) => test.executions.map((execution) => new OverviewRow(execution)));
+    this._row_groups = this._group_rows(tests);
 
-    for (let i = 0; i < tests.length; i++) {
-      const test = tests[i];
-
-      if (test.get_outcome() == "passed") {
-        passed = new TableModelToggle(true, this._filters_changed.bind(this));
-      } else if (test.get_outcome() == "failed") {
-        failed = new TableModelToggle(true, this._filters_changed.bind(this));
-      } else if (test.get_outcome() == "skipped") {
-        skipped = new TableModelToggle(true, this._filters_changed.bind(this));
-      }
-    }
+    // The toggles of the outcomes without tests are left out
+    const passed = index.count("passed") > 0 ? new TableModelToggle(true, this._filters_changed.bind(this)) : false;
+    const failed = index.count("failed") > 0 ? new TableModelToggle(true, this._filters_changed.bind(this)) : false;
+    const skipped = index.count("skipped") > 0 ? new TableModelToggle(true, this._filters_changed.bind(this)) : false;
 
     const visible = new TableModelToggle(true, this._visible_changed.bind(this));
     const total = new TableModelToggle(passed || failed || skipped, this._filters_changed.bind(this));
@@ -61,20 +85,61 @@ class OverviewModel {
     return this._filtered_tests;
   }
 
+  get_index() {
+    return this._index;
+  }
+
+  get_devices() {
+    return this._index.devices();
+  }
+
+  get_device() {
+    return this._device;
+  }
+
+  set_device(device) {
+    this._device = device;
+    this._filters_changed();
+  }
+
+  get_query() {
+    return this._query;
+  }
+
+  set_query(query) {
+    if (query == this._query) {
+      return;
+    }
+
+    this._query = query;
+    this._filters_changed();
+  }
+
   get_model() {
     return this._model;
   }
 
+  get_row_groups() {
+    return this._row_groups;
+  }
+
+  _group_rows(tests) {
+    return tests.map((test) => new OverviewRowGroup(test, test.executions.map((execution) => this._rows[test.id][execution.id])));
+  }
+
   _visible_changed() {
     this.update();
   }
 
   _filters_changed() {
-    this._filtered_tests = this._filter.tests(this._tests, this._model.passed_active(), this._model.failed_active(), this._model.skipped_active());
+    const matches = this._search_index.search(this._query);
+
+    this._filtered_tests = this._filter.tests(this._tests, this._model.passed_active(), this._model.failed_active(), this._model.skipped_active(), this._device, matches);
+    this._row_groups = this._group_rows(this._filtered_tests);
     this.update();
 
-    if (this._filters_changed != null) {
-      this._filters_changed_callback(this._model);
+    if (this._filters_changed_callback != null) {
+      this._filters_changed_callback();
     }
   }
 }
@@ -1,50 +1,158 @@
 /*
  * SPDX-License-Identifier: MIT
  * File     :  parser.js
- * Desc     :  Parser class, to parser the JSON test data into objects
+ * Desc     :  Parser class, to parse the (compressed) columnar JSON test data into objects
  * Authors  :  Nick Vissers <nick.vissers@openpixelsystems.org>
  * Date     :  31/12/2023
  * Version  :  1.0
  */
 
+// Called by the shard scripts, shards are loaded with script elements since file:// URLs cannot be fetched
+function reportify_shard(index, data) {
+  Parser.shard_loaded(index, data);
+}
+
 class Parser {
-  parse() {
+  static _callbacks = {};
+
+  _tests = [];
+  _index = null;
+  _search_index = null;
+  _tests_per_shard = 0;
+  _shards = {};
+
+  async parse() {
     let tests = [];
 
-    const json = this._read();
+    const json = await this._read();
+    const strings = json["strings"];
     const test_data = json["tests"];
+    const execution_data = json["executions"];
 
-    let test_id = 0;
-
-    for (const test_key in test_data) {
+    // Columnar data, the executions of test i are found between offsets i and i + 1 of the executions column. The
+    // details of the tests (node IDs, descriptions and steps) are in the shards, loaded when a test is shown.
+    for (let test_id = 0; test_id < test_data.name.length; test_id++) {
       let executions = [];
-      const executions_json = test_data[test_key]["executions"];
-      const test = test_data[test_key];
 
-      for (const execution_key in executions_json) {
-        const execution = executions_json[execution_key];
+      const first_execution = test_data.executions[test_id];
+      const last_execution = test_data.executions[test_id + 1];
+
+      for (let execution_id = first_execution; execution_id < last_execution; execution_id++) {
+        executions.push(new Execution(execution_id - first_execution, strings[execution_data.device[execution_id]],
+          strings[execution_data.outcome[execution_id]], execution_data.duration[execution_id], null));
+      }
+
+      tests.push(new Test(test_id, null, strings[test_data.name[test_id]], null, test_data.self_test[test_id] == 1, executions,
+        strings[test_data.outcome[test_id]], test_data.mixed[test_id] == 1));
+    }
+
+    this._tests = tests;
+    this._index = new TestIndex(tests.length, json["indexes"]);
+    this._search_index = new SearchIndex(tests.length, json["search"]);
+    this._tests_per_shard = json["shards"].tests;
+
+    return tests;
+  }
+
+  get_index() {
+    return this._index;
+  }
+
+  get_search_index() {
+    return this._search_index;
+  }
+
+  load(test) {
+    const index = Math.floor(test.id / this._tests_per_shard);
+
+    if (!(index in this._shards)) {
+      this._shards[index] = new Promise((resolve, reject) => {
+        Parser._callbacks[index] = resolve;
+
+        let script = document.createElement("script");
+        script.src = `data/shard-${index}.js`;
+        script.onerror = () => {
+          script.remove();
+          delete Parser._callbacks[index];
+          reject(new Error(`failed to load ${script.src}`));
+        };
+
+        document.head.appendChild(script);
+      }).then(async (data) => this._parse_shard(index, await this._decode(data))).catch((error) => {
+        // Not cached, the shard is loaded again when the test is shown again (e.g., after a transient failure)
+        delete this._shards[index];
+        throw error;
+      });
+    }
+
+    return this._shards[index];
+  }
+
+  static shard_loaded(index, data) {
+    if (index in Parser._callbacks) {
+      Parser._callbacks[index](data);
+      delete Parser._callbacks[index];
+    }
+  }
+
+  _parse_shard(index, json) {
+    const strings = json["strings"];
+    const test_data = json["tests"];
+    const execution_data = json["executions"];
+    const step_data = json["steps"];
+
+    // Offsets start at the first test of the shard, the executions are in the order of the tests
+    const first_test = index * this._tests_per_shard;
+    let execution_id = 0;
+
+    for (let i = 0; i < test_data.node_id.length; i++) {
+      const test = this._tests[first_test + i];
+
+      test.node_id = strings[test_data.node_id[i]];
+      test.description = strings[test_data.description[i]];
 
+      for (let j = 0; j < test.executions.length; j++, execution_id++) {
         let steps = [];
-        const steps_json = executions_json[execution_key]["steps"];
 
-        for (const steps_key in steps_json) {
-          const step = steps_json[steps_key];
+        const first_step = execution_data.steps[execution_id];
+        const last_step = execution_data.steps[execution_id + 1];
 
-          steps.push(new Step(steps_key, step.description, step.outcome));
+        for (let step_id = first_step; step_id < last_step; step_id++) {
+          steps.push(new Step(step_id - first_step, strings[step_data.description[step_id]], strings[step_data.outcome[step_id]]));
         }
 
-        executions.push(new Execution(execution_key, execution.device, execution.outcome, execution.duration, steps));
+        test.executions[j].steps = steps;
       }
 
-      tests.push(new Test(test_id, test.node_id, test.name, test.description, test.self_test, executions));
-      test_id++;
+      test.loaded = true;
     }
+  }
 
-    return tests;
+  async _read() {
+    const element = document.getElementById("test_data");
+
+    if (element.dataset.encoding != "base64") {
+      return JSON.parse(element.textContent);
+    }
+
+    return this._decompress(element.textContent);
   }
 
-  _read() {
-    const json = document.getElementById("test_data").innerText;
-    return JSON.parse(json);
+  async _decode(data) {
+    // Compressed shards are passed as a base64 string
+    if (typeof data == "string") {
+      return this._decompress(data);
+    }
+
+    return data;
+  }
+
+  async _decompress(text) {
+    // Gzip compressed and base64 encoded test data
+    const binary = atob(text.trim());
+    const bytes = Uint8Array.from(binary, (c) => c.charCodeAt(0));
+    const stream = new Blob([bytes]).stream().pipeThrough(new DecompressionStream("gzip"));
+
+    return JSON.parse(await new Response(stream).text());
   }
 }
@@ -42,39 +42,65 @@ class Test {
   description = "";
   self_test = "";
   executions = [];
+  loaded = false; // The node ID, description and steps are loaded from a shard when the test is shown
+  _outcome = null;
+  _mixed = null;
 
-  constructor(id, node_id, name, description, self_test, executions) {
+  // The outcome and mixed flag are precomputed by the generator, filtered tests compute them on first use
+  constructor(id, node_id, name, description, self_test, executions, outcome = null, mixed = null) {
     this.id = id;
     this.node_id = node_id;
     this.name = name;
     this.description = description;
     this.self_test = self_test;
     this.executions = executions;
+    this._outcome = outcome;
+    this._mixed = mixed;
   }
 
   get_outcome() {
-    for (let i = 0; i < this.executions.length; i++) {
-      if (this.executions[i].outcome == "failed") {
-        return "failed";
-      } else if (this.executions[i].outcome == "passed") {
-        return "passed";
-      } else if (this.executions[i].outcome == "skipped") {
-        return "skipped";
-      }
+    if (this._outcome == null) {
+      this._aggregate();
     }
 
-    return "unknown";
+    return this._outcome;
   }
 
   has_same_outcome() {
-    const outcome = this.get_outcome();
+    if (this._mixed == null) {
+      this._aggregate();
+    }
+
+    return !this._mixed;
+  }
+
+  _aggregate() {
+    let passed = 0;
+    let failed = 0;
+    let skipped = 0;
 
     for (let i = 0; i < this.executions.length; i++) {
-      if (this.executions[i].outcome != outcome) {
-        return false;
+      if (this.executions[i].outcome == "failed") {
+        failed++;
+      } else if (this.executions[i].outcome == "passed") {
+        passed++;
+      } else if (this.executions[i].outcome == "skipped") {
+        skipped++;
       }
     }
 
-    return true;
+    if (failed > 0) {
+      this._outcome = "failed";
+      this._mixed = failed != this.executions.length;
+    } else if (passed > 0) {
+      this._outcome = "passed";
+      this._mixed = passed != this.executions.length;
+    } else if (skipped > 0) {
+      this._outcome = "skipped";
+      this._mixed = skipped != this.executions.length;
+    } else {
+      this._outcome = "unknown";
+      this._mixed = this.executions.length != 0;
+    }
   }
 }
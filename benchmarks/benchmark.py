@@ -0,0 +1,193 @@
+#!/usr/bin/python3
+# SPDX-License-Identifier: MIT
+
+'''
+@File     :  benchmark.py
+@Desc     :  Script, to benchmark the stages of the report generation on synthetic input
+@Authors  :  Nick Vissers <nick.vissers@openpixelsystems.org>
+@Date     :  18/10/2026
+@Version  :  1.0
+'''
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from typing import Any, Callable
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from synthetic import Synthetic  # noqa: E402
+
+from internal.builder import Builder  # noqa: E402
+from internal.collector import Collector  # noqa: E402
+from internal.factories.builder_factory import BuilderFactory  # noqa: E402
+from internal.factories.generator_factory import GeneratorFactory  # noqa: E402
+from internal.internal_types import ReportMode  # noqa: E402
+from internal.logger import Logger  # noqa: E402
+from internal.parser import Parser  # noqa: E402
+
+
+STAGES = ['parse', 'test_data', 'build', 'report']
+
+
+class Benchmark:
+    folder: str
+    jobs: int
+    repeat: int
+    memory: bool
+    logger: Logger
+
+    def __init__(self, folder: str, jobs: int, repeat: int, memory: bool, logger: Logger) -> None:
+        self.folder = folder
+        self.jobs = jobs
+        self.repeat = repeat
+        self.memory = memory
+        self.logger = logger
+
+    def run(self, mode: ReportMode, inputs: str) -> dict[str, dict[str, float]]:
+        results: dict[str, dict[str, float]] = {stage: {'time': float('inf')} for stage in STAGES}
+
+        # Best of the timed runs, then one extra run to trace the memory, tracing slows down every stage
+        for _ in range(0, self.repeat):
+            for stage, duration in self._run(mode, inputs, self._time).items():
+                results[stage]['time'] = min(results[stage]['time'], duration)
+
+        if self.memory:
+            for stage, peak in self._run(mode, inputs, self._peak).items():
+                results[stage]['peak'] = peak
+
+        return results
+
+    def _run(self, mode: ReportMode, inputs: str, measure: Callable[[Callable[[], Any]], tuple[Any, float]]) -> dict[str, float]:
+        assets = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'assets')
+        collector = Collector(assets, self.logger)
+
+        styles = collector.css_filenames(mode)
+        scripts = collector.js_filenames(mode)
+
+        parser = Parser(inputs, False, self.logger, self.jobs)
+        builder = BuilderFactory.create(mode, styles, scripts, self.logger)
+        generator = GeneratorFactory.create(mode, styles, scripts, self.logger)
+
+        output = tempfile.mkdtemp(dir=self.folder)
+
+        measurements: dict[str, float] = {}
+
+        tests, measurements['parse'] = measure(parser.parse)
+        test_data, measurements['test_data'] = measure(lambda: generator.test_data(tests))
+
+        data = Builder.Data(tests, test_data)
+
+        document, measurements['build'] = measure(lambda: builder.build('Benchmark', data))
+        _, measurements['report'] = measure(lambda: generator.report(document, output))
+
+        return measurements
+
+    def _time(self, stage: Callable[[], Any]) -> tuple[Any, float]:
+        start = time.perf_counter()
+        result = stage()
+
+        return result, time.perf_counter() - start
+
+    def _peak(self, stage: Callable[[], Any]) -> tuple[Any, float]:
+        tracemalloc.start()
+        result = stage()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        return result, peak / (1024 * 1024)
+
+
+def compare(results: dict, baseline: dict, threshold: float, logger: Logger) -> bool:
+    success = True
+
+    for key, stages in results.items():
+        if key not in baseline:
+            logger.warning(f'no baseline for {key}')
+            continue
+
+        for stage, metrics in stages.items():
+            for metric, value in metrics.items():
+                base = baseline[key].get(stage, {}).get(metric)
+                if base is None or base == 0:
+                    continue
+
+                change = (value - base) / base
+
+                if change > threshold:
+                    logger.error(f'{key} {stage} {metric}: {value:.3f} vs {base:.3f} (+{change * 100:.1f}%)')
+                    success = False
+                else:
+                    logger.debug(f'{key} {stage} {metric}: {value:.3f} vs {base:.3f} ({change * 100:+.1f}%)')
+
+    return success
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--scales', help='numbers of tests to benchmark (e.g., "1000,10000")', default='1000,10000,100000')
+    parser.add_argument('--modes', help='report modes to benchmark (e.g., "static,dynamic")', default='static,dynamic')
+    parser.add_argument('--devices', help='number of devices every test runs on', type=int, default=2)
+    parser.add_argument('--steps', help='number of steps per execution', type=int, default=5)
+    parser.add_argument('--description-size', help='length of the test descriptions', type=int, default=200)
+    parser.add_argument('--self-test-ratio', help='fraction of the tests which are self tests', type=float, default=0.05)
+    parser.add_argument('--output-size', help='length of the captured stdout of every test', type=int, default=0)
+    parser.add_argument('-j', '--jobs', help='number of input files parsed in parallel', type=int, default=1)
+    parser.add_argument('-r', '--repeat', help='number of timed runs, the fastest one is kept', type=int, default=1)
+    parser.add_argument('--no-memory', help='do not trace the peak memory of every stage', action='store_true')
+    parser.add_argument('-o', '--output', help='path to write the results to (JSON)', required=False)
+    parser.add_argument('-b', '--baseline', help='path to the baseline results to compare with (JSON)', required=False)
+    parser.add_argument('--threshold', help='allowed slowdown compared to the baseline (e.g., 0.1 for 10%%)', type=float,
+                        default=0.1)
+    parser.add_argument('-v', '--verbose', help='verbose output', action='store_true', required=False)
+
+    args = parser.parse_args()
+
+    logger = Logger(args.verbose)
+
+    # The stages log their own errors, keep their output out of the measurements
+    stage_logger = Logger(False)
+
+    modes = {'static': ReportMode.STATIC, 'dynamic': ReportMode.DYNAMIC}
+    results: dict[str, Any] = {}
+
+    with tempfile.TemporaryDirectory() as folder:
+        benchmark = Benchmark(folder, args.jobs, args.repeat, not args.no_memory, stage_logger)
+
+        for scale in [int(scale) for scale in args.scales.split(',')]:
+            inputs = os.path.join(folder, f'input-{scale}')
+
+            synthetic = Synthetic(scale, args.devices, args.steps, args.description_size, args.self_test_ratio,
+                                  args.output_size)
+            synthetic.generate(inputs)
+
+            for mode in args.modes.split(','):
+                key = f'{mode}-{scale}'
+                results[key] = benchmark.run(modes[mode], inputs)
+
+                for stage in STAGES:
+                    metrics = results[key][stage]
+                    peak = f'{metrics["peak"]:10.1f} MB' if 'peak' in metrics else ''
+                    logger.info(f'{key:>16} {stage:>10} {metrics["time"]:10.3f} s {peak}')
+
+    if args.output:
+        with open(args.output, 'w') as file:
+            json.dump(results, file, indent=4)
+
+    if args.baseline:
+        with open(args.baseline, 'r') as file:
+            baseline = json.load(file)
+
+        if not compare(results, baseline, args.threshold, logger):
+            sys.exit(1)
+
+        logger.success('no regressions compared to the baseline')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,134 @@
+#!/usr/bin/python3
+# SPDX-License-Identifier: MIT
+
+'''
+@File     :  synthetic.py
+@Desc     :  Script, to generate synthetic pytest-json-report files for benchmarking
+@Authors  :  Nick Vissers <nick.vissers@openpixelsystems.org>
+@Date     :  18/10/2026
+@Version  :  1.0
+'''
+
+import argparse
+import json
+import os
+import random
+
+
+OUTCOMES = ['passed', 'passed', 'passed', 'passed', 'failed', 'skipped']
+
+
+class Synthetic:
+    tests: int
+    devices: int
+    steps: int
+    description_size: int
+    self_test_ratio: float
+    output_size: int
+    seed: int
+
+    def __init__(self, tests: int, devices: int = 2, steps: int = 5, description_size: int = 200,
+                 self_test_ratio: float = 0.05, output_size: int = 0, seed: int = 0) -> None:
+        self.tests = tests
+        self.devices = devices
+        self.steps = steps
+        self.description_size = description_size
+        self.self_test_ratio = self_test_ratio
+        self.output_size = output_size
+        self.seed = seed
+
+    def generate(self, folder: str) -> list[str]:
+        # One file per device, like the CI runs produce them
+        os.makedirs(folder, exist_ok=True)
+
+        filenames: list[str] = []
+
+        for device in range(0, self.devices):
+            filename = os.path.join(folder, f'device-{device}.json')
+
+            with open(filename, 'w') as file:
+                json.dump(self._report(device), file)
+
+            filenames.append(filename)
+
+        return filenames
+
+    def _report(self, device: int) -> dict:
+        # Same seed for every device, the tests need the same descriptions and self test flags on all of them
+        test_random = random.Random(self.seed)
+        outcome_random = random.Random(f'{self.seed}-{device}')
+
+        tests = []
+
+        for test in range(0, self.tests):
+            name = f'test_{test}'
+
+            metadata = {
+                'device': f'device {device}',
+                'active_test': name,
+                'description': self._text(test_random, self.description_size),
+                'steps': self.steps
+            }
+
+            if test_random.random() < self.self_test_ratio:
+                metadata['self_test'] = True
+
+            outcome = outcome_random.choice(OUTCOMES)
+
+            for step in range(0, self.steps):
+                metadata[f'step-{step}'] = {
+                    'description': f'step {step}: {self._text(test_random, 40)}',
+                    'outcome': outcome if step == self.steps - 1 else 'passed'
+                }
+
+            tests.append({
+                'nodeid': f'tests/test_suite_{test // 100}.py::{name}[{device}]',
+                'lineno': test,
+                'outcome': outcome,
+                'keywords': [name, f'test_suite_{test // 100}.py', 'tests'],
+                'setup': {'duration': 0.001, 'outcome': 'passed'},
+                'call': {
+                    'duration': outcome_random.random() * 10,
+                    'outcome': outcome,
+                    'stdout': 'x' * self.output_size
+                },
+                'teardown': {'duration': 0.001, 'outcome': 'passed'},
+                'metadata': metadata
+            })
+
+        return {'created': 0, 'duration': 0, 'exitcode': 0, 'root': '/', 'environment': {}, 'summary': {}, 'tests': tests}
+
+    def _text(self, rng: random.Random, size: int) -> str:
+        words: list[str] = []
+        length = 0
+
+        while length < size:
+            word = rng.choice(['device', 'uart', 'boot', 'check', 'the', 'power', 'reset', 'value', 'read', 'write'])
+            words.append(word)
+            length += len(word) + 1
+
+        return ' '.join(words)[:size]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('-o', '--output', help='folder to write the JSON files to', required=True)
+    parser.add_argument('-t', '--tests', help='number of tests', type=int, default=1000)
+    parser.add_argument('-d', '--devices', help='number of devices every test runs on', type=int, default=2)
+    parser.add_argument('-s', '--steps', help='number of steps per execution', type=int, default=5)
+    parser.add_argument('--description-size', help='length of the test descriptions', type=int, default=200)
+    parser.add_argument('--self-test-ratio', help='fraction of the tests which are self tests', type=float, default=0.05)
+    parser.add_argument('--output-size', help='length of the captured stdout of every test', type=int, default=0)
+    parser.add_argument('--seed', help='random seed', type=int, default=0)
+
+    args = parser.parse_args()
+
+    synthetic = Synthetic(args.tests, args.devices, args.steps, args.description_size, args.self_test_ratio,
+                          args.output_size, args.seed)
+
+    for filename in synthetic.generate(args.output):
+        print(filename)
+
+
+if __name__ == '__main__':
+    main()
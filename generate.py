@@ -15,13 +15,21 @@ import sys
 
 from enum import Enum
 
+from internal.batch import Batch, Manifest
 from internal.builder import Builder
+from internal.cache import Cache
 from internal.collector import Collector
+from internal.comparison import Comparison
+from internal.dynamic.dynamic_generator import DynamicGenerator
 from internal.factories.builder_factory import BuilderFactory
 from internal.factories.generator_factory import GeneratorFactory
+from internal.generator import Generator
+from internal.history import History
 from internal.logger import Logger
-from internal.parser import Parser
-from internal.internal_types import ReportMode
+from internal.parser import Parser, Tests
+from internal.profiler import Profiler
+from internal.watcher import Watcher
+from internal.internal_types import OutputCompression, ReportMode
 
 
 class Error(Enum):
@@ -31,9 +39,20 @@ class Error(Enum):
     PARSE = 3
     GENERATE_JSON = 4
     GENERATE_REPORT = 5
+    TESTS_PER_PAGE = 6
+    TITLE_EMPTY = 7
+    MANIFEST = 8
+    HISTORY = 9
+    COMPRESSION_LEVEL = 10
 
 
 def validArguments(args: any, logger: Logger) -> Error:  # type: ignore
+    if args.manifest != '':  # type: ignore
+        if args.watch or args.profile != '':  # type: ignore
+            logger.warning('watch and profile are ignored for manifests')
+
+        return Error.NONE
+
     if args.input == '':  # type: ignore
         logger.error('input parameter is empty')
         return Error.INPUT_EMPTY
@@ -42,16 +61,75 @@ def validArguments(args: any, logger: Logger) -> Error:  # type: ignore
         logger.error('output parameter is empty')
         return Error.OUTPUT_EMPTY
 
+    if args.title == '':  # type: ignore
+        logger.error('title parameter is empty')
+        return Error.TITLE_EMPTY
+
+    if args.tests_per_page < 0:  # type: ignore
+        logger.error('tests per page parameter is negative')
+        return Error.TESTS_PER_PAGE
+
+    if args.history_runs < 1:  # type: ignore
+        logger.error('history runs parameter is smaller than 1')
+        return Error.HISTORY
+
+    if args.compression_level < 0 or args.compression_level > 9:  # type: ignore
+        logger.error('compression level parameter is not between 0 and 9')
+        return Error.COMPRESSION_LEVEL
+
+    if args.tests_per_page > 0 and args.dynamic:  # type: ignore
+        logger.warning('tests per page is ignored for dynamic reports')
+
+    if args.baseline != '' and (args.dynamic or args.tests_per_page > 0):  # type: ignore
+        logger.warning('dynamic and tests per page are ignored for diff reports')
+
     return Error.NONE
 
 
 def main():
     parser = argparse.ArgumentParser()
-    parser.add_argument('-i', '--input', help='path to JSON input files (e.g., "json1,json2")', required=True)
-    parser.add_argument('-o', '--output', help='path to HTML output file', required=True)
-    parser.add_argument('-t', '--title', help='title of the report', required=True)
+    parser.add_argument('-i', '--input', help='path to JSON input files, folders or patterns (e.g., "json1,folder,*.json")',
+                        default='', required=False)
+    parser.add_argument('-o', '--output', help='path to HTML output file', default='', required=False)
+    parser.add_argument('-t', '--title', help='title of the report', default='', required=False)
+    parser.add_argument('-m', '--manifest', help='path to a YAML or JSON manifest of reports to generate, instead of -i, -o and -t',
+                        default='', required=False)
     parser.add_argument('-d', '--dynamic', help='generate dynamic report', action='store_true', required=False)
     parser.add_argument('-s', '--self-test', help='include self tests', action='store_true', required=False)
+    parser.add_argument('-c', '--compress-data', help='gzip the test data of the dynamic report', action='store_true',
+                        required=False)
+    parser.add_argument('-z', '--compress-output', help='gzip the report and its assets, next to or instead of the plain files',
+                        choices=['none', 'alongside', 'only'], default='none', required=False)
+    parser.add_argument('--compression-level', help='gzip level of the compressed output (0-9)', type=int, default=9,
+                        required=False)
+    parser.add_argument('-p', '--tests-per-page', help='split the static report into pages of this many tests', type=int,
+                        default=0, required=False)
+    parser.add_argument('-j', '--jobs', help='number of processes to parse the input files and write the pages with', type=int, default=os.cpu_count() or 1,
+                        required=False)
+    parser.add_argument('--cache-dir', help='folder of the parse cache', default=Cache.default_folder(), required=False)
+    parser.add_argument('--no-cache', help='do not use the parse cache', action='store_true', required=False)
+    parser.add_argument('--clear-cache', help='clear the parse cache before parsing', action='store_true', required=False)
+    parser.add_argument('-w', '--watch', help='regenerate the report when the input files change', action='store_true',
+                        required=False)
+    parser.add_argument('--watch-interval', help='seconds between checks for changes', type=float, default=1.0, required=False)
+    parser.add_argument('--watch-debounce', help='seconds without changes before regenerating', type=float, default=2.0,
+                        required=False)
+    parser.add_argument('-b', '--baseline', help='path to the JSON input files of a previous run, generates a report of the changes only',
+                        default='', required=False)
+    parser.add_argument('--duration-threshold', help='relative increase of the duration (e.g., 0.2 for 20%%) reported as slower in a diff',
+                        type=float, default=0.2, required=False)
+    parser.add_argument('--history', help='path to the SQLite file to store the results of every run in, adds a history to the report',
+                        default='', required=False)
+    parser.add_argument('--history-runs', help='number of runs the history is computed over', type=int, default=10, required=False)
+    parser.add_argument('--history-threshold', help='relative change of the duration (e.g., 0.2 for 20%%) shown in the history',
+                        type=float, default=0.2, required=False)
+    parser.add_argument('--profile', help='path to write the time and CPU time of every stage to (JSON)', default='',
+                        required=False)
+    parser.add_argument('--profile-memory', help='trace the memory of every stage as well, which slows down every stage',
+                        action='store_true', required=False)
+    parser.add_argument('--profile-stage', help='stage to write a cProfile dump of, next to the profile',
+                        choices=['collect', 'parse', 'baseline', 'history', 'compare', 'test_data', 'build', 'report'], default='',
+                        required=False)
     parser.add_argument('-v', '--verbose', help='verbose output', action='store_true', required=False)
 
     args = parser.parse_args()
@@ -68,32 +146,133 @@ def main():
     if (args.dynamic):
         mode = ReportMode.DYNAMIC
 
+    if args.baseline != '':
+        mode = ReportMode.DIFF
+
     assets = os.path.dirname(os.path.abspath(__file__)) + '/' + 'assets'
 
+    cache = None
+
+    if not args.no_cache:
+        cache = Cache(args.cache_dir, logger)
+
+    if args.clear_cache:
+        Cache(args.cache_dir, logger).clear()
+
+    if args.manifest != '':
+        manifest = Manifest(args.manifest, logger)
+        if not manifest.load():
+            sys.exit(Error.MANIFEST.value)
+
+        if not Batch(manifest, assets, args.jobs, cache, logger).run():
+            sys.exit(Error.GENERATE_REPORT.value)
+
+        return
+
+    profiler = Profiler(args.profile != '', logger, args.profile_stage, args.profile_memory)
+
     collector = Collector(assets, logger)
 
-    styles = collector.css_filenames(mode)
-    scripts = collector.js_filenames(mode)
+    with profiler.stage('collect'):
+        styles = collector.css_filenames(mode)
+        scripts = collector.js_filenames(mode)
 
-    parser = Parser(args.input, args.self_test, logger)
+    parser = Parser(args.input, args.self_test, logger, args.jobs, cache)
     builder = BuilderFactory.create(mode, styles, scripts, logger)
-    generator = GeneratorFactory.create(mode, styles, scripts, logger)
+    generator = GeneratorFactory.create(mode, styles, scripts, logger, OutputCompression[args.compress_output.upper()],
+                                        args.compression_level, args.jobs)
 
-    tests = parser.parse()
+    with profiler.stage('parse'):
+        tests = parser.parse()
     if tests is None:
         sys.exit(Error.PARSE.value)
 
-    test_data = generator.test_data(tests)
-    if test_data == '':
-        sys.exit(Error.GENERATE_JSON.value)
+    profiler.count('files', len(parser.files))
+
+    baseline = None
+
+    if args.baseline != '':
+        with profiler.stage('baseline'):
+            baseline = Parser(args.baseline, args.self_test, logger, args.jobs, cache).parse()
+        if baseline is None:
+            sys.exit(Error.PARSE.value)
+
+    # One history for the whole invocation, a run which is regenerated in watch mode replaces its results
+    history = History(args.history, logger) if args.history != '' else None
 
-    data = Builder.Data(tests, test_data)
-    html = builder.build(args.title, data)
+    ret = generate(args, tests, baseline, history, builder, generator, profiler, logger)
 
-    if not generator.report(html, args.output):
-        sys.exit(Error.GENERATE_REPORT.value)
+    if args.watch:
+        def update() -> None:
+            with profiler.stage('parse'):
+                tests = parser.update()
+            if tests is not None:
+                profiler.count('files', len(parser.files))
+                generate(args, tests, baseline, history, builder, generator, profiler, logger)
 
-    logger.success(f'report generated: {os.path.abspath(args.output)}')
+        watcher = Watcher(args.watch_interval, args.watch_debounce, logger)
+        watcher.watch(parser.snapshot, update, dict(parser.stats))
+    elif ret != Error.NONE:
+        sys.exit(ret.value)
+
+
+def generate(args: any, tests: Tests, baseline: Tests | None, history: History | None, builder: Builder,  # type: ignore
+             generator: Generator, profiler: Profiler, logger: Logger) -> Error:
+    trends = None
+
+    if history is not None:
+        with profiler.stage('history'):
+            trends = history.record(tests, args.title, args.history_runs, args.history_threshold)  # type: ignore
+        if trends is None:
+            return Error.HISTORY
+
+    comparison = None
+    test_data = ''  # Only the dynamic report embeds the test data
+
+    if baseline is not None:
+        # Only the changes end up in the report
+        with profiler.stage('compare'):
+            comparison = Comparison(args.duration_threshold).compare(baseline, tests)  # type: ignore
+    elif args.dynamic:  # type: ignore
+        with profiler.stage('test_data'):
+            test_data = generator.test_data(tests, args.compress_data)  # type: ignore
+        if test_data == '':
+            return Error.GENERATE_JSON
+
+    data = Builder.Data(tests, test_data, args.tests_per_page, args.compress_data, trends, comparison)  # type: ignore
+
+    with profiler.stage('build'):
+        document = builder.build(args.title, data)  # type: ignore
+        pages = builder.pages(args.title, data)  # type: ignore
+
+    # The counters of the generator add up over the reports it writes, only the last report is profiled
+    generator.elements = 0
+    generator.bytes = 0
+
+    with profiler.stage('report'):
+        success = generator.report(document, args.output, pages)  # type: ignore
+    if not success:
+        return Error.GENERATE_REPORT
+
+    logger.success(f'report generated: {os.path.abspath(args.output)}')  # type: ignore
+
+    profiler.count_tests(tests)
+    profiler.count('pages', len(pages) + 1)
+    profiler.count('elements', generator.elements)
+    profiler.count('bytes', generator.bytes)
+
+    if isinstance(generator, DynamicGenerator):
+        profiler.count('search_tokens', generator.search_tokens)
+        profiler.count('search_bytes', generator.search_bytes)
+
+    mode = 'dynamic' if args.dynamic else 'static'  # type: ignore
+
+    if baseline is not None:
+        mode = 'diff'
+
+    profiler.write(args.profile, {'title': args.title, 'mode': mode})  # type: ignore
+
+    return Error.NONE
 
 
 if __name__ == '__main__':
@@ -0,0 +1,379 @@
+# SPDX-License-Identifier: MIT
+
+'''
+@File     :  batch.py
+@Desc     :  Manifest and Batch classes, to generate many reports from shared inputs in one run
+@Authors  :  Nick Vissers <nick.vissers@openpixelsystems.org>
+@Date     :  18/10/2026
+@Version  :  1.0
+'''
+
+import json
+import os
+
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Any
+
+from internal.builder import Builder
+from internal.cache import Cache
+from internal.collector import Asset, Collector
+from internal.comparison import Comparison
+from internal.factories.builder_factory import BuilderFactory
+from internal.factories.generator_factory import GeneratorFactory
+from internal.generator import Generator
+from internal.history import History
+from internal.logger import Logger
+from internal.parser import Filter, Parser, Tests
+from internal.internal_types import OutputCompression, ReportMode
+
+# YAML manifests are optional, JSON manifests work without PyYAML
+try:
+    import yaml  # type: ignore
+
+    PARSE_ERRORS: tuple = (json.JSONDecodeError, yaml.YAMLError)
+except ImportError:
+    yaml = None
+
+    PARSE_ERRORS = (json.JSONDecodeError,)
+
+
+class Report:
+    title: str
+    input: str
+    output: str
+    dynamic: bool
+    self_test: bool
+    compress_data: bool
+    compress_output: OutputCompression
+    compression_level: int
+    tests_per_page: int
+    tests: list[str]
+    devices: list[str]
+    history: str
+    history_runs: int
+    history_threshold: float
+    baseline: str
+    duration_threshold: float
+
+    def __init__(self, title: str, input: str, output: str) -> None:
+        self.title = title
+        self.input = input
+        self.output = output
+        self.dynamic = False
+        self.self_test = False
+        self.compress_data = False
+        self.compress_output = OutputCompression.NONE
+        self.compression_level = 9
+        self.tests_per_page = 0
+        self.tests = []
+        self.devices = []
+        self.history = ''
+        self.history_runs = 10
+        self.history_threshold = 0.2
+        self.baseline = ''
+        self.duration_threshold = 0.2
+
+    def mode(self) -> ReportMode:
+        if self.baseline != '':
+            return ReportMode.DIFF
+
+        return ReportMode.DYNAMIC if self.dynamic else ReportMode.STATIC
+
+
+class Manifest:
+    # Keys of a report and their types, lists are lists of strings
+    KEYS: dict[str, type] = {
+        'title': str,
+        'input': list,
+        'output': str,
+        'dynamic': bool,
+        'self_test': bool,
+        'compress_data': bool,
+        'compress_output': str,
+        'compression_level': int,
+        'tests_per_page': int,
+        'tests': list,
+        'devices': list,
+        'history': str,
+        'history_runs': int,
+        'history_threshold': float,
+        'baseline': list,
+        'duration_threshold': float
+    }
+
+    file_path: str
+    reports: list[Report]
+    logger: Logger
+
+    def __init__(self, file_path: str, logger: Logger) -> None:
+        self.file_path = file_path
+        self.reports = []
+        self.logger = logger
+
+    def load(self) -> bool:
+        data = self._read()
+        if data is None:
+            return False
+
+        if type(data) is not dict or type(data.get('reports')) is not list:
+            self.logger.error(f'no reports found in manifest: {self.file_path}')
+            return False
+
+        defaults = data.get('defaults', {})
+        if type(defaults) is not dict:
+            self.logger.error('defaults in manifest is not a mapping')
+            return False
+
+        self.reports = []
+
+        for i, entry in enumerate(data['reports']):
+            if type(entry) is not dict:
+                self.logger.error(f'report {i} in manifest is not a mapping')
+                return False
+
+            report = self._read_report(i, {**defaults, **entry})
+            if report is None:
+                return False
+
+            self.reports.append(report)
+
+        return True
+
+    def _read(self) -> Any | None:
+        yaml_file = self.file_path.endswith('.yaml') or self.file_path.endswith('.yml')
+
+        if yaml_file and yaml is None:
+            self.logger.error('PyYAML is required for YAML manifests, install it or use a JSON manifest')
+            return None
+
+        try:
+            with open(self.file_path, 'r') as file:
+                if yaml_file:
+                    return yaml.safe_load(file)
+
+                return json.load(file)
+        except IOError as e:
+            self.logger.error(f'failed to read manifest: {e}')
+        except PARSE_ERRORS as e:
+            self.logger.error(f'failed to parse manifest {self.file_path}: {e}')
+
+        return None
+
+    def _read_report(self, i: int, entry: dict) -> Report | None:
+        for key, value in entry.items():
+            if key not in Manifest.KEYS:
+                self.logger.error(f'unknown key {key} in report {i} of the manifest')
+                return None
+
+            if not self._valid_value(key, value):
+                self.logger.error(f'invalid value for {key} in report {i} of the manifest: {value}')
+                return None
+
+        for key in ['title', 'input', 'output']:
+            if key not in entry or len(entry[key]) == 0:
+                self.logger.error(f'no {key} found for report {i} of the manifest')
+                return None
+
+        # Relative paths are relative to the manifest, not to the working directory
+        folder = os.path.dirname(os.path.abspath(self.file_path))
+
+        report = Report(entry['title'], self._inputs(folder, entry['input']), os.path.join(folder, entry['output']))
+
+        report.dynamic = entry.get('dynamic', report.dynamic)
+        report.self_test = entry.get('self_test', report.self_test)
+        report.compress_data = entry.get('compress_data', report.compress_data)
+        report.compression_level = entry.get('compression_level', report.compression_level)
+        report.tests_per_page = entry.get('tests_per_page', report.tests_per_page)
+        report.tests = entry.get('tests', report.tests)
+        report.devices = entry.get('devices', report.devices)
+        report.history = os.path.join(folder, entry['history']) if entry.get('history', '') != '' else ''
+        report.history_runs = entry.get('history_runs', report.history_runs)
+        report.history_threshold = entry.get('history_threshold', report.history_threshold)
+        report.baseline = self._inputs(folder, entry['baseline']) if len(entry.get('baseline', '')) > 0 else ''
+        report.duration_threshold = entry.get('duration_threshold', report.duration_threshold)
+
+        compress_output = entry.get('compress_output', report.compress_output.name.lower())
+        if compress_output.upper() not in OutputCompression.__members__:
+            self.logger.error(f'unknown compress output of report {i} of the manifest: {compress_output}')
+            return None
+
+        report.compress_output = OutputCompression[compress_output.upper()]
+
+        if report.tests_per_page < 0:
+            self.logger.error(f'tests per page of report {i} of the manifest is negative')
+            return None
+
+        if report.compression_level < 0 or report.compression_level > 9:
+            self.logger.error(f'compression level of report {i} of the manifest is not between 0 and 9')
+            return None
+
+        if report.history_runs < 1:
+            self.logger.error(f'history runs of report {i} of the manifest is smaller than 1')
+            return None
+
+        return report
+
+    def _inputs(self, folder: str, value: str | list[str]) -> str:
+        inputs = value.split(',') if type(value) is str else value
+
+        return ','.join([os.path.join(folder, input) for input in inputs])
+
+    def _valid_value(self, key: str, value: Any) -> bool:
+        expected = Manifest.KEYS[key]
+
+        # The inputs can also be given as a comma separated string, like on the command line
+        if (key == 'input' or key == 'baseline') and type(value) is str:
+            return True
+
+        if expected is list:
+            return type(value) is list and all([type(item) is str for item in value])
+
+        if expected is float:
+            return type(value) in [int, float]
+
+        return type(value) is expected
+
+
+class Batch:
+    manifest: Manifest
+    assets: str
+    jobs: int
+    cache: Cache | None
+    logger: Logger
+
+    def __init__(self, manifest: Manifest, assets: str, jobs: int, cache: Cache | None, logger: Logger) -> None:
+        self.manifest = manifest
+        self.assets = assets
+        self.jobs = jobs
+        self.cache = cache
+        self.logger = logger
+
+    def run(self) -> bool:
+        reports = self.manifest.reports
+
+        # Self tests are read for all reports and dropped per report, so every input file is parsed only once
+        parser = Parser('', True, self.logger, self.jobs, self.cache)
+
+        inputs: list[tuple[list[str], list[str]]] = []
+
+        for report in reports:
+            report_inputs = parser.resolve(report.input)
+            baseline_inputs = parser.resolve(report.baseline)
+
+            if len(report_inputs) == 0 or (report.baseline != '' and len(baseline_inputs) == 0):
+                self.logger.error(f'no input files found for report: {report.title}')
+                return False
+
+            inputs.append((report_inputs, baseline_inputs))
+
+        if not parser.read(list(dict.fromkeys([input for files in inputs for input in files[0] + files[1]]))):
+            return False
+
+        self.logger.debug(f'{len(parser.files)} input files parsed for {len(reports)} reports')
+
+        # Assets are collected and read once per mode, all reports of that mode (and output compression) share the
+        # builder and generator
+        renderers: dict[tuple[ReportMode, OutputCompression, int], tuple[Builder, Generator]] = {}
+        report_renderers: list[tuple[Builder, Generator]] = []
+        builders: dict[ReportMode, tuple[Builder, list[Asset], list[Asset]]] = {}
+        collector = Collector(self.assets, self.logger)
+
+        for report in reports:
+            mode = report.mode()
+
+            if mode not in builders:
+                styles = collector.css_filenames(mode)
+                scripts = collector.js_filenames(mode)
+
+                builders[mode] = (BuilderFactory.create(mode, styles, scripts, self.logger), styles, scripts)
+
+            key = (mode, report.compress_output, report.compression_level)
+
+            if key not in renderers:
+                builder, styles, scripts = builders[mode]
+                # The reports are rendered in parallel already (or one job was asked for), the pages of a report are
+                # written by the process rendering it
+                renderers[key] = (builder, GeneratorFactory.create(mode, styles, scripts, self.logger, report.compress_output,
+                                                                   report.compression_level, 1))
+
+            report_renderers.append(renderers[key])
+
+        success = True
+
+        if self.jobs <= 1:
+            for report, files, renderer in zip(reports, inputs, report_renderers):
+                merged = self._merge(parser, report, files)
+                success = merged is not None and self._render(report, *merged, *renderer) and success
+
+            return success
+
+        # Reports are merged one after the other, since they share the parsed files, and rendered in parallel
+        with ProcessPoolExecutor(max_workers=min(self.jobs, len(reports))) as executor:
+            futures: list[Future] = []
+
+            for report, files, renderer in zip(reports, inputs, report_renderers):
+                merged = self._merge(parser, report, files)
+                if merged is None:
+                    success = False
+                    continue
+
+                futures.append(executor.submit(self._render, report, *merged, *renderer))
+
+            for future in futures:
+                success = future.result() and success
+
+        return success
+
+    def _merge(self, parser: Parser, report: Report,
+               inputs: tuple[list[str], list[str]]) -> tuple[Tests, History.Trends | None, Comparison.Result | None] | None:
+        filter = Filter(report.self_test, report.tests, report.devices)
+
+        tests = parser.merge(inputs[0], filter)
+        if tests is None:
+            return None
+
+        history = None
+        comparison = None
+
+        # The history is stored in the main process, reports sharing a history file never write at the same time
+        if report.history != '':
+            history = History(report.history, self.logger).record(tests, report.title, report.history_runs,
+                                                                  report.history_threshold)
+            if history is None:
+                return None
+
+        if report.baseline != '':
+            baseline = parser.merge(inputs[1], filter)
+            if baseline is None:
+                return None
+
+            comparison = Comparison(report.duration_threshold).compare(baseline, tests)
+
+        return tests, history, comparison
+
+    def _render(self, report: Report, tests: Tests, history: History.Trends | None, comparison: Comparison.Result | None,
+                builder: Builder, generator: Generator) -> bool:
+        if len(tests.tests) == 0:
+            self.logger.warning(f'no tests left after filtering for report: {report.title}')
+
+        # Only the dynamic report embeds the test data
+        test_data = ''
+
+        if report.mode() == ReportMode.DYNAMIC:
+            test_data = generator.test_data(tests, report.compress_data)
+            if test_data == '':
+                self.logger.error(f'failed to generate the test data of report: {report.title}')
+                return False
+
+        data = Builder.Data(tests, test_data, report.tests_per_page, report.compress_data, history, comparison)
+        document = builder.build(report.title, data)
+        pages = builder.pages(report.title, data)
+
+        os.makedirs(report.output, exist_ok=True)
+
+        if not generator.report(document, report.output, pages):
+            return False
+
+        self.logger.success(f'report generated: {report.output}')
+
+        return True
@@ -8,32 +8,166 @@
 @Version  :  1.0
 '''
 
-from typing import Any
+import functools
+import io
+
+from typing import Iterator, Mapping, TextIO
 
 from internal.collector import Asset
+from internal.comparison import Comparison
+from internal.history import History
 from internal.logger import Logger
-from internal.parser import Tests
+from internal.parser import Tests, Test
+from internal.template import Fragment, attributes, cell, escape
+
+
+class Attributes(Mapping[str, str]):
+    __slots__ = ('_args', 'html')
+
+    _args: dict[str, str]
+    html: str
+
+    def __init__(self, args: dict[str, str]) -> None:
+        self._args = args
+        self.html = attributes(args)  # Rendered once, for every element sharing the map
+
+    def __getitem__(self, key: str) -> str:
+        return self._args[key]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._args)
+
+    def __len__(self) -> int:
+        return len(self._args)
+
+    @staticmethod
+    def shared(args: Mapping[str, str] | None) -> 'Attributes':
+        if args is None:
+            return NO_ATTRIBUTES
+
+        if isinstance(args, Attributes):
+            return args
+
+        return Attributes._intern(tuple(args.items()))
+
+    # Interned by value, the attributes of most elements are the same few maps. Bounded, maps which are unique to an
+    # element (e.g., the id of a test) are dropped again instead of being kept for the whole process.
+    @staticmethod
+    @functools.lru_cache(maxsize=1024)
+    def _intern(items: tuple[tuple[str, str], ...]) -> 'Attributes':
+        return Attributes(dict(items))
+
+
+NO_ATTRIBUTES = Attributes({})
 
 
 class Element:
+    __slots__ = ('name', 'value', 'args', 'elements', 'raw')
+
     name: str
     value: str
-    args = dict[str, str]
-    elements: []  # type: ignore
+    args: Attributes
+    elements: list['Element | Fragment'] | None  # Allocated on the first child, most elements are leaves
+    raw: bool  # The value is HTML (or a style or script) and is written without escaping
 
-    def __init__(self, name: str, value: str = '', args: dict = {}) -> None:
+    def __init__(self, name: str, value: str = '', args: Mapping[str, str] | None = None, raw: bool = False) -> None:
         self.name = name
         self.value = value
-        self.args = args  # type: ignore
-        self.elements = []
+        self.args = Attributes.shared(args)
+        self.elements = None
+        self.raw = raw
+
+    def add(self, element: 'Element | Fragment') -> None:
+        if self.elements is None:
+            self.elements = []
 
-    def add(self, element: Any) -> None:
         self.elements.append(element)
 
-    def get(self) -> []:  # type: ignore
+    def get(self) -> list['Element | Fragment']:
+        if self.elements is None:
+            return []
+
         return self.elements
 
 
+class Serializer:
+    buffer_size: int
+    elements: int
+
+    def __init__(self, buffer_size: int = 64 * 1024) -> None:
+        self.buffer_size = buffer_size
+        self.elements = 0
+
+    def compile(self, element: Element) -> Fragment:
+        # Render a constant part of a report once, it is reused as is for every row or table
+        elements = self.elements
+        html = ''.join(self.chunks(element))
+
+        return Fragment(html, self.elements - elements)
+
+    def write(self, element: Element, sink: TextIO) -> int:
+        written = 0
+        size = 0
+        buffer: list[str] = []
+
+        for chunk in self.chunks(element):
+            buffer.append(chunk)
+            size += len(chunk)
+
+            # Flush in large blocks, a write call per tag is too slow for big reports
+            if size >= self.buffer_size:
+                sink.write(''.join(buffer))
+                written += size
+                buffer.clear()
+                size = 0
+
+        if len(buffer) > 0:
+            sink.write(''.join(buffer))
+            written += size
+
+        return written
+
+    def chunks(self, element: Element) -> Iterator[str]:
+        # Explicit stack instead of recursion, closing tags are pushed as plain strings
+        stack: list[Element | Fragment | str] = [element]
+
+        while len(stack) > 0:
+            item = stack.pop()
+
+            if isinstance(item, str):
+                yield item
+                continue
+
+            # Rendered by a template, only counted
+            if isinstance(item, Fragment):
+                self.elements += item.elements
+                yield item.html
+                continue
+
+            self.elements += 1
+
+            yield self._open(item)
+
+            if item.value == '':
+                if item.elements is None:
+                    yield '/>\n'
+                    continue
+
+                yield '>\n'
+
+                stack.append(f'</{item.name}>\n')
+
+                for e in reversed(item.elements):
+                    stack.append(e)
+            elif item.raw:
+                yield f'>{item.value}</{item.name}>\n'
+            else:
+                yield f'>{escape(str(item.value))}</{item.name}>\n'
+
+    def _open(self, element: Element) -> str:
+        return f'<{element.name}{element.args.html}'
+
+
 class Builder:
     class Error(Exception):
         def __init__(self):
@@ -42,10 +176,39 @@ class Builder:
     class Data:
         tests: Tests
         test_data: str
+        test_data_compressed: bool
+        tests_per_page: int
+        history: History.Trends | None
+        comparison: Comparison.Result | None
 
-        def __init__(self, tests: Tests, test_data: str) -> None:
+        def __init__(self, tests: Tests, test_data: str, tests_per_page: int = 0, test_data_compressed: bool = False,
+                     history: History.Trends | None = None, comparison: Comparison.Result | None = None) -> None:
             self.tests = tests
             self.test_data = test_data
+            self.test_data_compressed = test_data_compressed
+            self.tests_per_page = tests_per_page
+            self.history = history
+            self.comparison = comparison
+
+    class Page:
+        builder: 'Builder'
+        title: str
+        number: int
+        count: int
+        tests: list[Test]
+
+        def __init__(self, builder: 'Builder', title: str, number: int, count: int, tests: list[Test]) -> None:
+            self.builder = builder
+            self.title = title
+            self.number = number
+            self.count = count
+            self.tests = tests
+
+        def filename(self) -> str:
+            return Builder.page_filename(self.number)
+
+        def build(self) -> Element:
+            return self.builder.page(self)
 
     styles: list[Asset]
     scripts: list[Asset]
@@ -56,27 +219,74 @@ class Builder:
         self.scripts = scripts
         self.logger = logger
 
-    def build(self, title: str, data: Data) -> str:
+    def build(self, title: str, data: Data) -> Element:
         raise Builder.Error()  # Abstract method
 
-    def _build(self, element: Element) -> str:
-        content = f'<{element.name}'
+    def pages(self, title: str, data: Data) -> list[Page]:
+        return []  # Only the main document by default
+
+    def page(self, page: Page) -> Element:
+        raise Builder.Error()  # Abstract method
+
+    @staticmethod
+    def page_filename(number: int) -> str:
+        if number == 0:
+            return 'report.html'
 
-        for arg in element.args:  # type: ignore
-            content += f' {arg}="{element.args[arg]}"'  # type: ignore
+        return f'report-{number}.html'
 
-        if element.value == '':
-            if len(element.elements) == 0:
-                content += '/>\n'
-                return content
+    # History, the same for all report modes
 
-            content += '>\n'
+    def _history(self, trends: History.Trends) -> Element:
+        div = Element('div', '', {'class': 'history'})
 
-            for e in element.elements:
-                content += self._build(e)
-        else:
-            content += f'>{element.value}'
+        div.add(Element('h2', 'Test history'))
+
+        unstable = trends.unstable()
+
+        run_tag = 'runs' if trends.runs != 1 else 'run'
+        div.add(Element('p', f'{len(unstable)} of {len(trends.entries)} test executions changed over the last {trends.runs} {run_tag}'))
+
+        if len(unstable) == 0:
+            div.add(Element('div', 'No failing, flaky or slower tests', {'class': 'no-tests'}))
+            return div
+
+        table = Element('table', '', {'class': 'test-table history-table'})
+
+        thead = Element('thead', '')
+        thead_tr = Element('tr', '')
+
+        for header in ['Name', 'Device', 'Runs', 'Pass rate', 'Flips', 'Flakiness', 'Duration', 'Duration trend']:
+            thead_tr.add(Element('th', header))
+
+        thead.add(thead_tr)
+
+        tbody = Element('tbody', '')
+
+        for entry in unstable:
+            trend = f'{entry.duration_trend() * 100:+.0f}%' if entry.duration_average is not None else 'new'
+
+            tbody.add(Fragment(f'<tr>\n'
+                               f'{cell("td", escape(entry.name))}'
+                               f'{cell("td", escape(entry.device))}'
+                               f'<td>{entry.runs}</td>\n'
+                               f'<td>{entry.pass_rate() * 100:.0f}%</td>\n'
+                               f'<td>{entry.flips}</td>\n'
+                               f'<td>{entry.flakiness():.2f}</td>\n'
+                               f'<td>{entry.duration:.2f}s</td>\n'
+                               f'<td>{trend}</td>\n'
+                               f'</tr>\n', 9))
+
+        table.add(thead)
+        table.add(tbody)
+
+        div.add(table)
+
+        return div
+
+    def _build(self, element: Element) -> str:
+        buffer = io.StringIO()
 
-        content += f'</{element.name}>\n'
+        Serializer().write(element, buffer)
 
-        return content
+        return buffer.getvalue()
@@ -0,0 +1,127 @@
+# SPDX-License-Identifier: MIT
+
+'''
+@File     :  cache.py
+@Desc     :  Cache class, to store the parse results of input files on disk
+@Authors  :  Nick Vissers <nick.vissers@openpixelsystems.org>
+@Date     :  18/10/2026
+@Version  :  1.0
+'''
+
+import hashlib
+import marshal
+import os
+import shutil
+
+from typing import Any
+
+from internal.logger import Logger
+
+
+class Cache:
+    # Increment when the layout of the cached records changes
+    VERSION = 1
+
+    folder: str
+    logger: Logger
+
+    def __init__(self, folder: str, logger: Logger) -> None:
+        self.folder = folder
+        self.logger = logger
+
+    @staticmethod
+    def default_folder() -> str:
+        cache_home = os.environ.get('XDG_CACHE_HOME', os.path.join(os.path.expanduser('~'), '.cache'))
+        return os.path.join(cache_home, 'reportify')
+
+    def load(self, file_path: str, variant: str) -> Any | None:
+        entry_path = self._entry_path(file_path, variant)
+
+        try:
+            stat = os.stat(file_path)
+
+            with open(entry_path, 'rb') as entry:
+                header = marshal.load(entry)
+
+                if header['version'] != Cache.VERSION or header['size'] != stat.st_size:
+                    return None
+
+                # A different modification time alone does not invalidate the entry, the content is compared then
+                if header['mtime'] != stat.st_mtime_ns:
+                    if header['hash'] != self._hash(file_path):
+                        return None
+
+                    self.logger.debug(f'cache: {file_path} touched, content unchanged')
+
+                records = marshal.load(entry)
+        except FileNotFoundError:
+            return None
+        except (IOError, EOFError, ValueError, TypeError, KeyError) as e:
+            self.logger.warning(f'ignoring cache entry for {file_path}: {e}')
+            return None
+
+        self.logger.debug(f'cache: loaded {file_path}')
+
+        return records
+
+    def header(self, file_path: str) -> dict[str, Any] | None:
+        # Taken before the file is read, the entry describes the content which was parsed
+        try:
+            stat = os.stat(file_path)
+
+            return {
+                'version': Cache.VERSION,
+                'size': stat.st_size,
+                'mtime': stat.st_mtime_ns,
+                'hash': self._hash(file_path)
+            }
+        except IOError as e:
+            self.logger.warning(f'failed to cache {file_path}: {e}')
+            return None
+
+    def store(self, file_path: str, variant: str, header: dict[str, Any], records: Any) -> None:
+        entry_path = self._entry_path(file_path, variant)
+        temp_path = f'{entry_path}.{os.getpid()}.tmp'
+
+        try:
+            # The file changed while it was parsed (e.g., results still coming in), the records may not match it
+            stat = os.stat(file_path)
+
+            if stat.st_size != header['size'] or stat.st_mtime_ns != header['mtime']:
+                self.logger.debug(f'cache: {file_path} changed while parsing, not cached')
+                return
+
+            os.makedirs(self.folder, exist_ok=True)
+
+            # Write to a temporary file first, concurrent runs never see a partial entry
+            with open(temp_path, 'wb') as entry:
+                marshal.dump(header, entry)
+                marshal.dump(records, entry)
+
+            os.replace(temp_path, entry_path)
+        except (IOError, ValueError) as e:
+            self.logger.warning(f'failed to cache {file_path}: {e}')
+
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+
+    def clear(self) -> None:
+        if os.path.isdir(self.folder):
+            shutil.rmtree(self.folder)
+
+    def _entry_path(self, file_path: str, variant: str) -> str:
+        key = f'{os.path.abspath(file_path)}\n{variant}\n{marshal.version}'
+        return os.path.join(self.folder, hashlib.sha256(key.encode('utf-8')).hexdigest())
+
+    def _hash(self, file_path: str) -> str:
+        digest = hashlib.sha256()
+
+        with open(file_path, 'rb') as file:
+            while True:
+                chunk = file.read(1024 * 1024)
+                if len(chunk) == 0:
+                    break
+
+                digest.update(chunk)
+
+        return digest.hexdigest()
@@ -71,7 +71,7 @@ class Collector:
         return glob.glob(self._shared_folder() + '/js/**/*.js', recursive=True)
 
     def _mode_folder(self, mode: ReportMode) -> str:
-        if mode == ReportMode.STATIC:
+        if mode == ReportMode.STATIC or mode == ReportMode.DIFF:
             return 'static'
         elif mode == ReportMode.DYNAMIC:
             return 'dynamic'
@@ -0,0 +1,121 @@
+# SPDX-License-Identifier: MIT
+
+'''
+@File     :  comparison.py
+@Desc     :  Comparison class, to find the executions which changed compared to a baseline run
+@Authors  :  Nick Vissers <nick.vissers@openpixelsystems.org>
+@Date     :  18/10/2026
+@Version  :  1.0
+'''
+
+from internal.parser import Execution, Tests
+
+
+class Comparison:
+    # Kinds of changes, in the order in which they are reported
+    NEW_FAILURE = 'new failure'
+    FIXED = 'fixed'
+    SLOWER = 'slower'
+    NEW = 'new'
+    REMOVED = 'removed'
+
+    KINDS = [NEW_FAILURE, FIXED, SLOWER, NEW, REMOVED]
+
+    class Entry:
+        kind: str
+        name: str
+        device: str
+        baseline: Execution | None
+        current: Execution | None
+
+        def __init__(self, kind: str, name: str, device: str, baseline: Execution | None, current: Execution | None) -> None:
+            self.kind = kind
+            self.name = name
+            self.device = device
+            self.baseline = baseline
+            self.current = current
+
+        def duration_change(self) -> float | None:
+            if self.baseline is None or self.current is None or self.baseline.duration == 0:
+                return None
+
+            return (self.current.duration - self.baseline.duration) / self.baseline.duration
+
+    class Result:
+        compared: int
+        entries: list['Comparison.Entry']
+        counts: dict[str, int]
+
+        def __init__(self, compared: int, entries: list['Comparison.Entry']) -> None:
+            self.compared = compared
+            self.entries = entries
+            self.counts = {kind: 0 for kind in Comparison.KINDS}
+
+            for entry in entries:
+                self.counts[entry.kind] += 1
+
+    threshold: float
+    minimum_duration: float
+
+    def __init__(self, threshold: float, minimum_duration: float = 1.0) -> None:
+        self.threshold = threshold  # Relative increase of the duration which is reported as slower
+        self.minimum_duration = minimum_duration  # Shorter executions are too noisy to report as slower
+
+    def compare(self, baseline: Tests, current: Tests) -> 'Comparison.Result':
+        # Executions are matched by test name, device and repetition in a dictionary, the work is linear in the number of
+        # executions
+        baseline_executions = self._executions(baseline)
+        current_executions = self._executions(current)
+
+        entries: list[Comparison.Entry] = []
+        compared = 0
+
+        for key, execution in current_executions.items():
+            baseline_execution = baseline_executions.get(key)
+
+            if baseline_execution is None:
+                entries.append(Comparison.Entry(Comparison.NEW, key[0], key[1], None, execution))
+                continue
+
+            compared += 1
+
+            kind = self._kind(baseline_execution, execution)
+            if kind is not None:
+                entries.append(Comparison.Entry(kind, key[0], key[1], baseline_execution, execution))
+
+        for key, execution in baseline_executions.items():
+            if key not in current_executions:
+                entries.append(Comparison.Entry(Comparison.REMOVED, key[0], key[1], execution, None))
+
+        order = {kind: i for i, kind in enumerate(Comparison.KINDS)}
+        entries.sort(key=lambda entry: (order[entry.kind], entry.name, entry.device))
+
+        return Comparison.Result(compared, entries)
+
+    def _executions(self, tests: Tests) -> dict[tuple[str, str, int], Execution]:
+        # A test can be executed more than once on a device, the n-th execution on a device is compared with the n-th
+        # execution of the baseline on that device
+        executions: dict[tuple[str, str, int], Execution] = {}
+
+        for test in tests.tests.values():
+            repetitions: dict[str, int] = {}
+
+            for execution in test.executions:
+                repetition = repetitions.get(execution.device, 0)
+                repetitions[execution.device] = repetition + 1
+
+                executions[(test.name, execution.device, repetition)] = execution
+
+        return executions
+
+    def _kind(self, baseline: Execution, current: Execution) -> str | None:
+        if current.outcome == 'failed' and baseline.outcome != 'failed':
+            return Comparison.NEW_FAILURE
+
+        if baseline.outcome == 'failed' and current.outcome == 'passed':
+            return Comparison.FIXED
+
+        if current.duration >= self.minimum_duration and current.duration > baseline.duration * (1 + self.threshold):
+            return Comparison.SLOWER
+
+        return None
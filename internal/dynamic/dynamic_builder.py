@@ -10,20 +10,21 @@
 
 
 from internal.builder import Element, Builder
+from internal.history import History
 
 
 class DynamicBuilder(Builder):
-    def build(self, title: str, data: Builder.Data) -> str:
+    def build(self, title: str, data: Builder.Data) -> Element:
         html = Element('html')
-        head = self._head(title, data.test_data)
-        body = self._body(title)
+        head = self._head(title, data)
+        body = self._body(title, data.history)
 
         html.add(head)
         html.add(body)
 
-        return self._build(html)
+        return html
 
-    def _head(self, title: str, test_data: str) -> Element:
+    def _head(self, title: str, data: Builder.Data) -> Element:
         head = Element('head')
 
         head.add(Element('title', title))
@@ -40,7 +41,7 @@ class DynamicBuilder(Builder):
         for script in scripts:  # type: ignore
             head.add(script)
 
-        head.add(self._test_data(test_data))
+        head.add(self._test_data(data.test_data, data.test_data_compressed))
 
         return head
 
@@ -60,13 +61,19 @@ class DynamicBuilder(Builder):
 
         return scripts
 
-    def _test_data(self, test_data: str) -> Element:
-        return Element('script', f'\n{test_data}\n', {'id': 'test_data', 'type': 'application/json'})
+    def _test_data(self, test_data: str, compressed: bool) -> Element:
+        if compressed:
+            return Element('script', f'\n{test_data}\n', {'id': 'test_data', 'type': 'application/gzip', 'data-encoding': 'base64'}, True)
 
-    def _body(self, title: str) -> Element:
+        return Element('script', f'\n{test_data}\n', {'id': 'test_data', 'type': 'application/json'}, True)
+
+    def _body(self, title: str, history: History.Trends | None) -> Element:
         body = Element('body')
 
         body.add(self._title(title))
+
+        if history is not None:
+            body.add(self._history(history))
         body.add(Element('div', '', {'id': 'content'}))
 
         return body
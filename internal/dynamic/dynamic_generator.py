@@ -8,14 +8,54 @@
 @Version  :  1.0
 '''
 
+import functools
+import glob
+import itertools
+import json
 import os
-import shutil
+import re
+import sys
+import unicodedata
 
-from internal.generator import Generator
+from internal.builder import Builder, Element
+from internal.collector import Asset
+from internal.generator import Generator, StringTable
+from internal.internal_types import OutputCompression
+from internal.logger import Logger
+from internal.parser import Tests, Test
 
 
 class DynamicGenerator(Generator):
-    def report(self, html: str, output_folder: str) -> bool:
+    TESTS_PER_SHARD = 100
+
+    shards: list[str]
+    search_tokens: int
+    search_bytes: int
+
+    def __init__(self, styles: list[Asset], scripts: list[Asset], logger: Logger,
+                 compression: OutputCompression = OutputCompression.NONE, compression_level: int = 9, jobs: int = 1) -> None:
+        super().__init__(styles, scripts, logger, compression, compression_level, jobs)
+
+        self.shards = []  # Details of the tests of the last test data, written next to the report
+        self.search_tokens = 0  # Size of the search index of the last test data
+        self.search_bytes = 0
+
+    def test_data(self, tests: Tests, compress: bool = False) -> str:
+        # Only the overview is embedded in the report. The details of the tests (node IDs, descriptions and steps) are
+        # split into shards, which the report loads when a test is shown.
+        test_list = list(tests.tests.values())
+
+        self.shards = []
+
+        for start in range(0, len(test_list), DynamicGenerator.TESTS_PER_SHARD):
+            shard = self._encode(self._shard(test_list[start:start + DynamicGenerator.TESTS_PER_SHARD]), compress)
+
+            # Compressed shards are passed to the report as a base64 string
+            self.shards.append(f'"{shard}"' if compress else shard)
+
+        return self._encode(self._overview(test_list), compress)
+
+    def report(self, document: Element, output_folder: str, pages: list[Builder.Page] | None = None) -> bool:
         report_folder = os.path.join(output_folder, 'report')
 
         if not os.path.isdir(report_folder):
@@ -33,15 +73,182 @@ class DynamicGenerator(Generator):
 
         report_file_path = os.path.join(report_folder, 'report.html')
 
-        return self._write_report(html, report_file_path) and self._copy_assets(report_folder)
+        # The shards are written first, the report never references a shard which is not on disk yet. Stale shards are
+        # only removed once the new report is in place, until then the previous report can still load them.
+        shards = self._write_shards(report_folder)
+
+        return (shards is not None and self._write_report(document, report_file_path) and self._copy_assets(report_folder) and
+                self._remove_shards(report_folder, shards))
+
+    def _overview(self, tests: list[Test]) -> dict:
+        # Columnar layout, like the test data of the base class, without the details of the tests
+        strings = StringTable()
+
+        test_columns: dict[str, list] = {'name': [], 'self_test': [], 'outcome': [], 'mixed': [], 'executions': [0]}
+        execution_columns: dict[str, list] = {'device': [], 'outcome': [], 'duration': []}
+
+        for test in tests:
+            test_columns['name'].append(strings.index(test.name))
+            test_columns['self_test'].append(int(test.self_test))
+            test_columns['outcome'].append(strings.index(test.get_outcome()))
+            test_columns['mixed'].append(int(not test.has_same_outcome()))
+
+            for execution in test.executions:
+                execution_columns['device'].append(strings.index(execution.device))
+                execution_columns['outcome'].append(strings.index(execution.outcome))
+                execution_columns['duration'].append(execution.duration)
+
+            test_columns['executions'].append(len(execution_columns['outcome']))
+
+        return {
+            'strings': strings.strings(),
+            'tests': test_columns,
+            'executions': execution_columns,
+            'indexes': self._indexes(tests),
+            'search': self._search_index(tests),
+            'shards': {'count': len(self.shards), 'tests': DynamicGenerator.TESTS_PER_SHARD}
+        }
+
+    def _indexes(self, tests: list[Test]) -> dict:
+        # Posting lists of test indices, the report filters with set operations on them instead of scanning every test
+        outcomes: dict[str, list[int]] = {}
+        execution_outcomes: dict[str, list[int]] = {}
+        devices: dict[str, list[int]] = {}
+        mixed: list[int] = []
+        uniform: list[int] = []
+
+        for i, test in enumerate(tests):
+            outcomes.setdefault(test.get_outcome(), []).append(i)
+
+            if test.has_same_outcome():
+                uniform.append(i)
+            else:
+                mixed.append(i)
+
+            for outcome in dict.fromkeys([execution.outcome for execution in test.executions]):
+                execution_outcomes.setdefault(outcome, []).append(i)
+
+            for device in test.get_devices():
+                devices.setdefault(device, []).append(i)
+
+        return {
+            'outcome': outcomes,
+            'execution_outcome': execution_outcomes,
+            'device': devices,
+            'mixed': mixed,
+            'uniform': uniform
+        }
+
+    # Words of letters, marks and digits, e.g., test_uart_0 is test, uart and 0, like [\p{L}\p{M}\p{N}]+ of the report.
+    # The marks (e.g., accents or the vowel signs of Devanagari) are not word characters for re, so they are added as
+    # ranges once per process.
+    @staticmethod
+    @functools.lru_cache(maxsize=1)
+    def _search_token() -> re.Pattern[str]:
+        ranges: list[list[int]] = []
+
+        for code in range(sys.maxunicode + 1):
+            if unicodedata.category(chr(code)).startswith('M'):
+                if ranges and ranges[-1][1] == code - 1:
+                    ranges[-1][1] = code
+                else:
+                    ranges.append([code, code])
+
+        marks = ''.join(f'{re.escape(chr(first))}-{re.escape(chr(last))}' for first, last in ranges)
+
+        return re.compile(f'(?:[^\\W_]|[{marks}])+')
+
+    def _search_index(self, tests: list[Test]) -> dict:
+        # Inverted index of the lowercase words of the names, node IDs, descriptions and step descriptions. The report
+        # looks the words of a query up (as prefixes) in the sorted tokens, instead of scanning every string.
+        postings: dict[str, list[int]] = {}
+        search_token = DynamicGenerator._search_token()
+
+        for i, test in enumerate(tests):
+            # Tokenized at once, the executions of a test mostly have the same steps
+            steps = (step.description for execution in test.executions for step in execution.steps)
+            text = ' '.join(dict.fromkeys(itertools.chain([test.name, test.node_id, test.description], steps)))
+
+            for token in set(search_token.findall(text.lower())):
+                postings.setdefault(token, []).append(i)
+
+        sorted_tokens = sorted(postings)
+        deltas: list[list[int]] = []
+
+        # Delta encoded, the gaps between the test indices of a token are smaller numbers than the indices
+        for token in sorted_tokens:
+            ids = postings[token]
+            deltas.append([ids[0]] + [b - a for a, b in zip(ids, ids[1:])])
+
+        search = {'tokens': sorted_tokens, 'tests': deltas}
+
+        self.search_tokens = len(sorted_tokens)
+        self.search_bytes = len(json.dumps(search, separators=(',', ':')))
+        self.logger.debug(f'search index: {self.search_tokens} tokens, {self.search_bytes} bytes')
+
+        return search
+
+    def _shard(self, tests: list[Test]) -> dict:
+        # Offsets start at the first test of the shard, every shard has its own string table
+        strings = StringTable()
+
+        test_columns: dict[str, list] = {'node_id': [], 'description': []}
+        execution_columns: dict[str, list] = {'steps': [0]}
+        step_columns: dict[str, list] = {'description': [], 'outcome': []}
+
+        for test in tests:
+            test_columns['node_id'].append(strings.index(test.node_id))
+            test_columns['description'].append(strings.index(test.description))
+
+            for execution in test.executions:
+                for step in execution.steps:
+                    step_columns['description'].append(strings.index(step.description))
+                    step_columns['outcome'].append(strings.index(step.outcome))
+
+                execution_columns['steps'].append(len(step_columns['outcome']))
+
+        return {
+            'strings': strings.strings(),
+            'tests': test_columns,
+            'executions': execution_columns,
+            'steps': step_columns
+        }
+
+    def _write_shards(self, report_folder: str) -> list[str] | None:
+        data_folder = os.path.join(report_folder, 'data')
+
+        os.makedirs(data_folder, exist_ok=True)
+
+        # Shards are scripts instead of JSON files, browsers do not fetch files from file:// URLs
+        filenames: list[str] = []
+
+        for i, shard in enumerate(self.shards):
+            filename = os.path.join(data_folder, f'shard-{i}.js')
+
+            if not self._write_file(filename, lambda output: output.write(f'reportify_shard({i}, {shard});\n')):
+                return None
+
+            filenames += self._output_paths(filename)
+
+        return filenames
+
+    def _remove_shards(self, report_folder: str, shards: list[str]) -> bool:
+        # Shards of a previous report, with more tests or another output compression
+        try:
+            for filename in glob.glob(os.path.join(report_folder, 'data', 'shard-*.js*')):
+                if filename not in shards:
+                    os.remove(filename)
+        except OSError as e:
+            self.logger.error(f'failed to remove the shards of a previous report: {e}')
+            return False
+
+        return True
 
     def _copy_assets(self, report_folder: str) -> bool:
-        for style in self.styles:
-            os.makedirs(os.path.dirname(report_folder + style.destination), exist_ok=True)
-            shutil.copy(style.source, report_folder + style.destination)
+        for asset in self.styles + self.scripts:
+            os.makedirs(os.path.dirname(report_folder + asset.destination), exist_ok=True)
 
-        for script in self.scripts:
-            os.makedirs(os.path.dirname(report_folder + script.destination), exist_ok=True)
-            shutil.copy(script.source, report_folder + script.destination)
+            if not self._copy_file(asset.source, report_folder + asset.destination):
+                return False
 
         return True
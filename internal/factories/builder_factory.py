@@ -12,6 +12,7 @@ from internal.builder import Builder
 from internal.collector import Asset
 from internal.dynamic.dynamic_builder import DynamicBuilder
 from internal.logger import Logger
+from internal.static.diff_builder import DiffBuilder
 from internal.static.static_builder import StaticBuilder
 from internal.internal_types import ReportMode
 
@@ -27,5 +28,7 @@ class BuilderFactory:
             return StaticBuilder(styles, scripts, logger)
         elif mode == ReportMode.DYNAMIC:
             return DynamicBuilder(styles, scripts, logger)
+        elif mode == ReportMode.DIFF:
+            return DiffBuilder(styles, scripts, logger)
 
         raise BuilderFactory.Error()
@@ -14,7 +14,7 @@ from internal.generator import Generator
 from internal.logger import Logger
 from internal.static.static_generator import StaticGenerator
 
-from internal.internal_types import ReportMode
+from internal.internal_types import OutputCompression, ReportMode
 
 
 class GeneratorFactory:
@@ -23,10 +23,11 @@ class GeneratorFactory:
             super().__init__("Unknown report mode")
 
     @staticmethod
-    def create(mode: ReportMode, styles: list[Asset], scripts: list[Asset], logger: Logger) -> Generator:
-        if mode == ReportMode.STATIC:
-            return StaticGenerator(styles, scripts, logger)
+    def create(mode: ReportMode, styles: list[Asset], scripts: list[Asset], logger: Logger,
+               compression: OutputCompression = OutputCompression.NONE, compression_level: int = 9, jobs: int = 1) -> Generator:
+        if mode == ReportMode.STATIC or mode == ReportMode.DIFF:
+            return StaticGenerator(styles, scripts, logger, compression, compression_level, jobs)
         elif mode == ReportMode.DYNAMIC:
-            return DynamicGenerator(styles, scripts, logger)
+            return DynamicGenerator(styles, scripts, logger, compression, compression_level, jobs)
 
         raise GeneratorFactory.Error()
@@ -8,13 +8,55 @@
 @Version  :  1.0
 '''
 
+import base64
+import contextlib
+import gzip
+import io
 import json
+import os
+import shutil
 
+from typing import Any, Callable, IO
+
+from internal.builder import Builder, Element, Serializer
 from internal.collector import Asset
+from internal.internal_types import OutputCompression
 from internal.logger import Logger
 from internal.parser import Tests
 
 
+class StringTable:
+    indexes: dict[str, int]
+
+    def __init__(self) -> None:
+        self.indexes = {}
+
+    def index(self, value: str) -> int:
+        index = self.indexes.get(value)
+
+        if index is None:
+            index = len(self.indexes)
+            self.indexes[value] = index
+
+        return index
+
+    def strings(self) -> list[str]:
+        return list(self.indexes)
+
+
+class Tee:
+    sinks: list[IO | gzip.GzipFile]
+
+    def __init__(self, sinks: list[IO | gzip.GzipFile]) -> None:
+        self.sinks = sinks
+
+    def write(self, data: Any) -> int:
+        for sink in self.sinks:
+            sink.write(data)
+
+        return len(data)
+
+
 class Generator:
     class Error(Exception):
         def __init__(self):
@@ -22,58 +64,141 @@ class Generator:
 
     styles: list[Asset]
     scripts: list[Asset]
+    compression: OutputCompression
+    compression_level: int
+    jobs: int
+    elements: int
+    bytes: int
     logger: Logger
 
-    def __init__(self, styles: list[Asset], scripts: list[Asset], logger: Logger) -> None:
+    def __init__(self, styles: list[Asset], scripts: list[Asset], logger: Logger,
+                 compression: OutputCompression = OutputCompression.NONE, compression_level: int = 9, jobs: int = 1) -> None:
         self.styles = styles
         self.scripts = scripts
+        self.compression = compression
+        self.compression_level = compression_level
+        self.jobs = jobs  # Processes the pages of a report are written with
+        self.elements = 0  # Elements written, over all reports
+        self.bytes = 0  # Bytes written, over all reports
         self.logger = logger
 
-    def test_data(self, tests: Tests) -> str:
-        data = {}
+    def test_data(self, tests: Tests, compress: bool = False) -> str:
+        # Columnar layout, strings are stored once in a table and referenced by index. The executions and steps of
+        # test i (execution j) are found between offsets i and i + 1 (j and j + 1) of their parent column.
+        strings = StringTable()
+
+        test_columns: dict[str, list] = {
+            'node_id': [], 'name': [], 'description': [], 'self_test': [], 'outcome': [], 'mixed': [], 'executions': [0]
+        }
+        execution_columns: dict[str, list] = {'device': [], 'outcome': [], 'duration': [], 'steps': [0]}
+        step_columns: dict[str, list] = {'description': [], 'outcome': []}
 
         for test in tests.tests.values():
-            executions = {}
+            test_columns['node_id'].append(strings.index(test.node_id))
+            test_columns['name'].append(strings.index(test.name))
+            test_columns['description'].append(strings.index(test.description))
+            test_columns['self_test'].append(int(test.self_test))
+            test_columns['outcome'].append(strings.index(test.get_outcome()))
+            test_columns['mixed'].append(int(not test.has_same_outcome()))
 
             for execution in test.executions:
-                steps = {}
+                execution_columns['device'].append(strings.index(execution.device))
+                execution_columns['outcome'].append(strings.index(execution.outcome))
+                execution_columns['duration'].append(execution.duration)
 
                 for step in execution.steps:
-                    steps[step.id] = {
-                        'description': step.description,
-                        'outcome': step.outcome
-                    }
-
-                executions[execution.id] = {
-                    'device': execution.device,
-                    'outcome': execution.outcome,
-                    'duration': execution.duration,
-                    'steps': steps
-                }
-
-            data[test.name] = {
-                'node_id': test.node_id,
-                'name': test.name,
-                'description': test.description,
-                'self_test': test.self_test,
-                'executions': executions
-            }
-
-        tests = {}  # type: ignore
-        tests['tests'] = data  # type: ignore
-
-        return json.dumps(tests, indent=4)
-
-    def report(self, html: str, file_path: str) -> bool:
+                    step_columns['description'].append(strings.index(step.description))
+                    step_columns['outcome'].append(strings.index(step.outcome))
+
+                execution_columns['steps'].append(len(step_columns['outcome']))
+
+            test_columns['executions'].append(len(execution_columns['outcome']))
+
+        data = {
+            'strings': strings.strings(),
+            'tests': test_columns,
+            'executions': execution_columns,
+            'steps': step_columns
+        }
+
+        return self._encode(data, compress)
+
+    def _encode(self, data: dict, compress: bool) -> str:
+        # Escape closing tags, the data is embedded in a script element
+        test_data = json.dumps(data, separators=(',', ':')).replace('</', '<\\/')
+
+        if compress:
+            return base64.b64encode(gzip.compress(test_data.encode('utf-8'))).decode('ascii')
+
+        return test_data
+
+    def report(self, document: Element, file_path: str, pages: list[Builder.Page] | None = None) -> bool:
         raise Generator.Error()  # Abstract method
 
-    def _write_report(self, html: str, file_path: str) -> bool:
+    def _write_report(self, document: Element, file_path: str) -> bool:
+        serializer = Serializer()
+
+        if not self._write_file(file_path, lambda output: serializer.write(document, output)):
+            return False
+
+        self.elements += serializer.elements
+
+        return True
+
+    def _copy_file(self, source: str, file_path: str) -> bool:
+        def copy(output: IO) -> None:
+            with open(source, 'rb') as file:
+                shutil.copyfileobj(file, output)
+
+        return self._write_file(file_path, copy, True)
+
+    def _output_paths(self, file_path: str) -> list[str]:
+        paths: list[str] = []
+
+        if self.compression != OutputCompression.ONLY:
+            paths.append(file_path)
+        if self.compression != OutputCompression.NONE:
+            paths.append(f'{file_path}.gz')
+
+        return paths
+
+    def _write_file(self, file_path: str, write: Callable[[Any], Any], binary: bool = False) -> bool:
+        paths = self._output_paths(file_path)
+
+        # Write to temporary files first, readers (or a server) never see a partially written file. The plain and the
+        # compressed file are written in a single pass.
         try:
-            output = open(file_path, 'w')
-            output.write(html)
-            output.close()
-        except IOError as e:
-            self.logger.error(f'failed to write report to disk: {e}')
+            with contextlib.ExitStack() as stack:
+                sinks: list[IO | gzip.GzipFile] = []
+
+                for path in paths:
+                    # Text is written as UTF-8 in both files, the decompressed file is the same as the plain one
+                    if not path.endswith('.gz'):
+                        if binary:
+                            sinks.append(stack.enter_context(open(f'{path}.tmp', 'wb')))
+                        else:
+                            sinks.append(stack.enter_context(open(f'{path}.tmp', 'w', encoding='utf-8')))
+                        continue
+
+                    # No timestamp in the header, the same report compresses to the same file
+                    compressed = gzip.GzipFile(os.path.basename(file_path), 'wb', self.compression_level,
+                                               stack.enter_context(open(f'{path}.tmp', 'wb')), 0)
+                    stack.enter_context(compressed)
+
+                    sinks.append(compressed if binary else stack.enter_context(io.TextIOWrapper(compressed, 'utf-8')))
+
+                write(sinks[0] if len(sinks) == 1 else Tee(sinks))
+
+            for path in paths:
+                os.replace(f'{path}.tmp', path)
+                self.bytes += os.path.getsize(path)
+        except (IOError, ValueError) as e:  # ValueError for text which cannot be encoded
+            self.logger.error(f'failed to write {file_path} to disk: {e}')
+
+            for path in paths:
+                if os.path.exists(f'{path}.tmp'):
+                    os.remove(f'{path}.tmp')
+
             return False
 
         return True
@@ -0,0 +1,257 @@
+# SPDX-License-Identifier: MIT
+
+'''
+@File     :  history.py
+@Desc     :  History class, to store the results of every run and compute the trends of the tests over runs
+@Authors  :  Nick Vissers <nick.vissers@openpixelsystems.org>
+@Date     :  18/10/2026
+@Version  :  1.0
+'''
+
+import hashlib
+import sqlite3
+import time
+
+from contextlib import contextmanager
+from typing import Iterator
+
+from internal.logger import Logger
+from internal.parser import Tests
+
+
+class History:
+    # Increment when the schema changes
+    VERSION = 2
+
+    # Names per query, below the limit of SQLite on the number of parameters
+    CHUNK_SIZE = 500
+
+    SCHEMA = [
+        'CREATE TABLE IF NOT EXISTS runs (id INTEGER PRIMARY KEY, title TEXT NOT NULL, created REAL NOT NULL, '
+        'digest TEXT NOT NULL)',
+        'CREATE TABLE IF NOT EXISTS tests (id INTEGER PRIMARY KEY, name TEXT NOT NULL UNIQUE)',
+        'CREATE TABLE IF NOT EXISTS devices (id INTEGER PRIMARY KEY, name TEXT NOT NULL UNIQUE)',
+        # Keyed by test and device first, the runs of one test on one device are next to each other
+        'CREATE TABLE IF NOT EXISTS executions (run INTEGER NOT NULL, test INTEGER NOT NULL, device INTEGER NOT NULL, '
+        'outcome TEXT NOT NULL, duration REAL NOT NULL, PRIMARY KEY (test, device, run)) WITHOUT ROWID',
+        # Ordered by test and device within a run as well, the primary key is part of the index
+        'CREATE INDEX IF NOT EXISTS executions_run ON executions (run)',
+        'CREATE INDEX IF NOT EXISTS runs_title ON runs (title, id)'
+    ]
+
+    # Version 1 stored the same results of a title once, runs were unique by title and digest
+    MIGRATION_1 = '''
+        BEGIN;
+        CREATE TABLE runs_2 (id INTEGER PRIMARY KEY, title TEXT NOT NULL, created REAL NOT NULL, digest TEXT NOT NULL);
+        INSERT INTO runs_2 SELECT id, title, created, digest FROM runs;
+        DROP TABLE runs;
+        ALTER TABLE runs_2 RENAME TO runs;
+        CREATE INDEX runs_title ON runs (title, id);
+        PRAGMA user_version = 2;
+        COMMIT;
+    '''
+
+    # Every execution of the current run, with the executions of the same test and device in the last runs. Rows are
+    # grouped in the order of the run index, a window function to count the flips needs an extra sort of all rows.
+    TRENDS = '''
+        WITH recent AS (
+            SELECT id FROM runs WHERE title = :title AND id <= :run ORDER BY id DESC LIMIT :runs
+        )
+        SELECT t.name, d.name, GROUP_CONCAT(e.run || ' ' || e.outcome),
+               AVG(CASE WHEN e.run != :run THEN e.duration END),
+               MAX(CASE WHEN e.run = :run THEN e.duration END)
+        FROM executions c
+        JOIN executions e ON e.test = c.test AND e.device = c.device
+        JOIN tests t ON t.id = c.test
+        JOIN devices d ON d.id = c.device
+        WHERE c.run = :run AND e.run IN recent
+        GROUP BY c.test, c.device
+    '''
+
+    class Entry:
+        name: str
+        device: str
+        runs: int
+        passed: int
+        flips: int
+        duration_average: float | None  # Over the previous runs, None for new tests
+        duration: float
+
+        def __init__(self, name: str, device: str, runs: int, passed: int, flips: int, duration_average: float | None,
+                     duration: float) -> None:
+            self.name = name
+            self.device = device
+            self.runs = runs
+            self.passed = passed
+            self.flips = flips
+            self.duration_average = duration_average
+            self.duration = duration
+
+        def pass_rate(self) -> float:
+            return self.passed / self.runs
+
+        def flakiness(self) -> float:
+            # Fraction of the consecutive runs in which the outcome changed
+            return self.flips / (self.runs - 1) if self.runs > 1 else 0.0
+
+        def duration_trend(self) -> float:
+            # Relative change of the duration of the current run, compared to the average of the previous runs
+            if self.duration_average is None or self.duration_average == 0:
+                return 0.0
+
+            return (self.duration - self.duration_average) / self.duration_average
+
+        def is_stable(self, threshold: float) -> bool:
+            return self.passed == self.runs and self.flips == 0 and abs(self.duration_trend()) <= threshold
+
+    class Trends:
+        runs: int
+        entries: list['History.Entry']
+        threshold: float
+
+        def __init__(self, runs: int, entries: list['History.Entry'], threshold: float) -> None:
+            self.runs = runs
+            self.entries = entries
+            self.threshold = threshold
+
+        def unstable(self) -> list['History.Entry']:
+            entries = [entry for entry in self.entries if not entry.is_stable(self.threshold)]
+
+            return sorted(entries, key=lambda entry: (-entry.flakiness(), entry.pass_rate(), -entry.duration_trend()))
+
+    file_path: str
+    run: int | None
+    logger: Logger
+
+    def __init__(self, file_path: str, logger: Logger) -> None:
+        self.file_path = file_path
+        self.run = None  # Run stored by this instance, replaced when it stores other results (e.g., in watch mode)
+        self.logger = logger
+
+    def record(self, tests: Tests, title: str, runs: int, threshold: float) -> 'History.Trends | None':
+        run = self.add(tests, title)
+        if run is None:
+            return None
+
+        return self.trends(title, run, runs, threshold)
+
+    def add(self, tests: Tests, title: str) -> int | None:
+        # An instance stores one run, when it is called again (e.g., when the report is regenerated in watch mode while
+        # the results come in) the results of its run are replaced. Results which are the same as those of the latest
+        # run (e.g., a report generated again from the same files) add no run.
+        digest = self._digest(tests)
+
+        try:
+            with self._connect() as connection:
+                run = None
+
+                if self.run is not None:
+                    row = connection.execute('SELECT digest FROM runs WHERE id = ?', (self.run,)).fetchone()
+
+                    if row is not None:
+                        if row[0] == digest:
+                            self.logger.debug(f'history: run {self.run} unchanged')
+                            return self.run
+
+                        connection.execute('DELETE FROM executions WHERE run = ?', (self.run,))
+                        connection.execute('UPDATE runs SET created = ?, digest = ? WHERE id = ?', (time.time(), digest, self.run))
+                        run = self.run
+                else:
+                    row = connection.execute('SELECT id, digest FROM runs WHERE title = ? ORDER BY id DESC LIMIT 1',
+                                             (title,)).fetchone()
+
+                    if row is not None and row[1] == digest:
+                        self.logger.debug(f'history: run {row[0]} already stored')
+                        return row[0]
+
+                if run is None:
+                    run = connection.execute('INSERT INTO runs (title, created, digest) VALUES (?, ?, ?)',
+                                             (title, time.time(), digest)).lastrowid
+
+                test_ids = self._ids(connection, 'tests', [test.name for test in tests.tests.values()])
+                device_ids = self._ids(connection, 'devices', list(tests.devices))
+
+                # The last execution of a test on a device wins, if a test ran more than once on the same device
+                connection.executemany(
+                    'INSERT OR REPLACE INTO executions (run, test, device, outcome, duration) VALUES (?, ?, ?, ?, ?)',
+                    ((run, test_ids[test.name], device_ids[execution.device], execution.outcome, execution.duration)
+                     for test in tests.tests.values() for execution in test.executions))
+        except sqlite3.Error as e:
+            self.logger.error(f'failed to store the run in the history {self.file_path}: {e}')
+            return None
+
+        self.logger.debug(f'history: stored run {run}')
+        self.run = run
+
+        return run
+
+    def trends(self, title: str, run: int, runs: int, threshold: float) -> 'History.Trends | None':
+        try:
+            with self._connect() as connection:
+                count = connection.execute('SELECT COUNT(*) FROM (SELECT id FROM runs WHERE title = ? AND id <= ? ORDER BY id DESC LIMIT ?)',
+                                           (title, run, runs)).fetchone()[0]
+
+                rows = connection.execute(History.TRENDS, {'title': title, 'run': run, 'runs': runs}).fetchall()
+        except sqlite3.Error as e:
+            self.logger.error(f'failed to read the history {self.file_path}: {e}')
+            return None
+
+        return History.Trends(count, [self._entry(*row) for row in rows], threshold)
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        # Other processes (e.g., reports of a manifest) can write at the same time, wait for their transactions
+        connection = sqlite3.connect(self.file_path, timeout=60)
+
+        try:
+            version = connection.execute('PRAGMA user_version').fetchone()[0]
+
+            if version == 0:
+                connection.execute('PRAGMA journal_mode = WAL')
+
+                for statement in History.SCHEMA:
+                    connection.execute(statement)
+
+                connection.execute(f'PRAGMA user_version = {History.VERSION}')
+            elif version == 1:
+                connection.executescript(History.MIGRATION_1)
+            elif version != History.VERSION:
+                raise sqlite3.DatabaseError(f'unsupported history version {version}, expected {History.VERSION}')
+
+            # One transaction, committed when the block succeeds
+            with connection:
+                yield connection
+        finally:
+            connection.close()
+
+    def _entry(self, name: str, device: str, executions: str, duration_average: float | None, duration: float) -> 'History.Entry':
+        # Outcomes of the runs, from old to new
+        outcomes = [outcome for _, outcome in sorted([(int(run), outcome) for run, outcome in
+                                                      [execution.split(' ', 1) for execution in executions.split(',')]])]
+
+        flips = sum([previous != outcome for previous, outcome in zip(outcomes, outcomes[1:])])
+
+        return History.Entry(name, device, len(outcomes), outcomes.count('passed'), flips, duration_average, duration)
+
+    def _ids(self, connection: sqlite3.Connection, table: str, names: list[str]) -> dict[str, int]:
+        connection.executemany(f'INSERT OR IGNORE INTO {table} (name) VALUES (?)', ((name,) for name in names))
+
+        # Only the names of the run are read, a query per name is too slow for large suites
+        ids: dict[str, int] = {}
+
+        for start in range(0, len(names), History.CHUNK_SIZE):
+            chunk = names[start:start + History.CHUNK_SIZE]
+            placeholders = ','.join(['?'] * len(chunk))
+
+            ids.update(connection.execute(f'SELECT name, id FROM {table} WHERE name IN ({placeholders})', chunk))
+
+        return ids
+
+    def _digest(self, tests: Tests) -> str:
+        digest = hashlib.sha256()
+
+        for test in tests.tests.values():
+            for execution in test.executions:
+                digest.update(f'{test.name}\0{execution.device}\0{execution.outcome}\0{execution.duration!r}\n'.encode('utf-8'))
+
+        return digest.hexdigest()
@@ -14,3 +14,10 @@ from enum import Enum
 class ReportMode(Enum):
     STATIC = 0
     DYNAMIC = 1
+    DIFF = 2
+
+
+class OutputCompression(Enum):
+    NONE = 0
+    ALONGSIDE = 1  # report.html and report.html.gz
+    ONLY = 2  # report.html.gz only, for servers which serve precompressed files
@@ -8,13 +8,70 @@
 @Version  :  1.0
 '''
 
+import fnmatch
+import glob
 import json
+import os
 import re
+import sys
 
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from typing import Iterator
+
+from internal.cache import Cache
 from internal.logger import Logger
+from internal.reader import NDJSONReader, Reader
+
+
+class Summary:
+    __slots__ = ('total', 'passed', 'failed', 'skipped')
+
+    total: int
+    passed: int
+    failed: int
+    skipped: int
+
+    def __init__(self) -> None:
+        self.total = 0
+        self.passed = 0
+        self.failed = 0
+        self.skipped = 0
+
+    def add(self, outcome: str) -> None:
+        self.total += 1
+
+        if outcome == 'passed':
+            self.passed += 1
+        elif outcome == 'failed':
+            self.failed += 1
+        elif outcome == 'skipped':
+            self.skipped += 1
+
+    def count(self, outcome: str) -> int:
+        if outcome == 'passed':
+            return self.passed
+        elif outcome == 'failed':
+            return self.failed
+        elif outcome == 'skipped':
+            return self.skipped
+
+        return 0
+
+    def get_outcome(self) -> str:
+        if self.failed > 0:
+            return 'failed'
+        elif self.passed > 0:
+            return 'passed'
+        elif self.skipped > 0:
+            return 'skipped'
+
+        return 'unknown'
 
 
 class Step:
+    __slots__ = ('id', 'description', 'outcome')
+
     id: int
     description: str
     outcome: str
@@ -26,11 +83,14 @@ class Step:
 
 
 class Execution:
+    __slots__ = ('id', 'device', 'outcome', 'duration', 'steps', '_summary')
+
     id: int
     device: str
     outcome: str
     duration: float
     steps: list[Step]
+    _summary: Summary | None
 
     def __init__(self) -> None:
         self.id = 0
@@ -38,15 +98,35 @@ class Execution:
         self.outcome = ''
         self.duration = 0.0
         self.steps = []
+        self._summary = None
+
+    def get_summary(self) -> Summary:
+        if self._summary is None:
+            self.aggregate()
+
+        return self._summary  # type: ignore
+
+    def aggregate(self) -> None:
+        summary = Summary()
+
+        for step in self.steps:
+            summary.add(step.outcome)
+
+        self._summary = summary
 
 
 class Test:
+    __slots__ = ('id', 'node_id', 'name', 'description', 'self_test', 'executions', '_summary', '_devices', '_duration')
+
     id: int
     node_id: str
     name: str
     description: str
     self_test: bool
     executions: list[Execution]
+    _summary: Summary | None
+    _devices: list[str]
+    _duration: float
 
     def __init__(self) -> None:
         self.id = 0
@@ -55,54 +135,111 @@ class Test:
         self.description = ''
         self.self_test = False
         self.executions = []
+        self.reset()
 
     def get_devices(self) -> list[str]:
-        devices: list[str] = []
-
-        for execution in self.executions:
-            if execution.device not in devices:
-                devices.append(execution.device)
+        if self._summary is None:
+            self.aggregate()
 
-        return devices
+        return self._devices
 
     def get_outcome(self) -> str:
-        outcomes: list[str] = []
+        return self.get_summary().get_outcome()
 
-        for execution in self.executions:
-            outcomes.append(execution.outcome)
+    def has_same_outcome(self) -> bool:
+        summary = self.get_summary()
 
-        if 'failed' in outcomes:
-            return 'failed'
-        elif 'passed' in outcomes:
-            return 'passed'
-        elif 'skipped' in outcomes:
-            return 'skipped'
+        return summary.count(summary.get_outcome()) == summary.total
 
-        return 'unknown'
+    def get_duration(self) -> float:
+        if self._summary is None:
+            self.aggregate()
 
-    def has_same_outcome(self) -> bool:
-        outcome = self.get_outcome()
+        return self._duration
 
-        for execution in self.executions:
-            if execution.outcome != outcome:
-                return False
+    def get_summary(self) -> Summary:
+        if self._summary is None:
+            self.aggregate()
 
-        return True
+        return self._summary  # type: ignore
 
-    def get_duration(self) -> float:
+    def aggregate(self) -> None:
+        summary = Summary()
+        devices: dict[str, None] = {}
         duration = 0.0
 
         for execution in self.executions:
+            summary.add(execution.outcome)
+            devices[execution.device] = None
             duration += execution.duration
 
-        return duration
+            execution.aggregate()
+
+        self._summary = summary
+        self._devices = list(devices)
+        self._duration = duration
+
+    def reset(self) -> None:
+        self._summary = None
+        self._devices = []
+        self._duration = 0.0
 
 
 class Tests:
     tests: dict[str, Test]
+    node_ids: dict[str, list[Test]]
+    devices: dict[str, dict[str, Test]]
+    _summary: Summary | None
 
     def __init__(self) -> None:
         self.tests = {}
+        self.node_ids = {}
+        self.devices = {}
+        self._summary = None
+
+    def add(self, test: Test) -> None:
+        self.tests[test.name] = test
+        self.node_ids.setdefault(test.node_id, []).append(test)
+
+        for execution in test.executions:
+            self._index_device(test, execution.device)
+
+        test.reset()
+        self._summary = None
+
+    def add_execution(self, test: Test, execution: Execution) -> None:
+        test.executions.append(execution)
+        self._index_device(test, execution.device)
+
+        test.reset()
+        self._summary = None
+
+    def get_summary(self) -> Summary:
+        if self._summary is None:
+            self.aggregate()
+
+        return self._summary  # type: ignore
+
+    def aggregate(self) -> None:
+        summary = Summary()
+
+        for test in self.tests.values():
+            test.aggregate()
+            summary.add(test.get_outcome())
+
+        self._summary = summary
+
+    def get(self, name: str) -> Test | None:
+        return self.tests.get(name)
+
+    def get_by_node_id(self, node_id: str) -> list[Test]:
+        return self.node_ids.get(node_id, [])
+
+    def get_by_device(self, device: str) -> list[Test]:
+        return list(self.devices.get(device, {}).values())
+
+    def _index_device(self, test: Test, device: str) -> None:
+        self.devices.setdefault(device, {})[test.name] = test
 
     def __str__(self):
         s = ''
@@ -151,100 +288,426 @@ class Tests:
         return s
 
 
+class Filter:
+    include_self_tests: bool
+    names: list[str]
+    devices: list[str]
+
+    def __init__(self, include_self_tests: bool, names: list[str], devices: list[str]) -> None:
+        self.include_self_tests = include_self_tests
+        self.names = names  # Patterns of the test names to keep (e.g., "test_uart_*"), all tests if empty
+        self.devices = devices  # Devices to keep the executions of, all devices if empty
+
+    def test(self, test: Test) -> bool:
+        if test.self_test and not self.include_self_tests:
+            return False
+
+        if len(self.names) == 0:
+            return True
+
+        return any([fnmatch.fnmatchcase(test.name, name) for name in self.names])
+
+    def execution(self, execution: Execution) -> bool:
+        return len(self.devices) == 0 or execution.device in self.devices
+
+
+def merge_tests(tests: Tests, file_tests: list[Test], id: int, logger: Logger, filter: Filter | None = None) -> int:
+    # The tests of the file are left untouched, they are merged again when another file changes or for another report
+    for file_test in file_tests:
+        if filter is not None and not filter.test(file_test):
+            continue
+
+        executions = file_test.executions
+        if filter is not None:
+            executions = [execution for execution in executions if filter.execution(execution)]
+            if len(executions) == 0:
+                continue
+
+        test = tests.get(file_test.name)
+        if test is not None:
+            if not verify_test(file_test, test, logger):
+                return -1
+        else:
+            test = Test()
+
+            test.id = id
+            test.name = file_test.name
+            test.node_id = file_test.node_id
+            test.description = file_test.description
+            test.self_test = file_test.self_test
+
+            tests.add(test)
+
+            id += 1  # Only increment the id if the test is new
+
+        # Add the device to the existing test
+        for file_execution in executions:
+            execution = Execution()
+
+            execution.id = len(test.executions)
+            execution.device = file_execution.device
+            execution.outcome = file_execution.outcome
+            execution.duration = file_execution.duration
+            execution.steps = file_execution.steps
+
+            tests.add_execution(test, execution)
+
+    return id
+
+
+def intern_execution(execution: Execution) -> None:
+    # Devices, outcomes and step descriptions repeat for every device, keep a single copy of each
+    execution.device = _intern_str(execution.device)
+    execution.outcome = _intern_str(execution.outcome)
+
+    for step in execution.steps:
+        step.description = _intern_str(step.description)
+        step.outcome = _intern_str(step.outcome)
+
+
+def _intern_str(value: str) -> str:
+    return sys.intern(value) if type(value) is str else value
+
+
+def verify_test(test: Test, existing_test: Test, logger: Logger) -> bool:
+    if test.name != existing_test.name:
+        logger.error(f'name mismatch for {test.name}: {test.name} != {existing_test.name}')
+        return False
+
+    if test.node_id != existing_test.node_id:
+        logger.error(f'node id mismatch for {test.name}: {test.node_id} != {existing_test.node_id}')
+        return False
+
+    if test.description != existing_test.description:
+        logger.error(
+            f'description mismatch for {test.name}: {test.description} != {existing_test.description}')
+        return False
+
+    if test.self_test != existing_test.self_test:
+        logger.error(f'self test mismatch for {test.name}: {test.self_test} != {existing_test.self_test}')
+        return False
+
+    return True
+
+
 class Parser:
+    input: str
     inputs: list[str]
+    include_self_tests: bool
+    jobs: int
+    cache: Cache | None
+    files: dict[str, list[Test]]
+    stats: dict[str, tuple[int, int, int] | None]
+    offsets: dict[str, int]
     logger: Logger
 
-    def __init__(self, input: str, include_self_tests: bool, logger: Logger) -> None:
+    def __init__(self, input: str, include_self_tests: bool, logger: Logger, jobs: int = 1, cache: Cache | None = None) -> None:
+        self.logger = logger
+        self.input = input
         self.inputs = self._toList(input)
         self.include_self_tests = include_self_tests
-        self.logger = logger
+        self.jobs = jobs
+        self.cache = cache
+        self.files = {}
+        self.stats = {}
+        self.offsets = {}
 
     def parse(self) -> Tests | None:
+        self.files = {}
+        self.stats = {}
+        self.offsets = {}
+
+        return self._parse()
+
+    def update(self) -> Tests | None:
+        # Only files which are new or changed since they were last read are parsed again
+        self.inputs = self._toList(self.input, True)
+
+        return self._parse()
+
+    def snapshot(self) -> dict[str, tuple[int, int, int] | None]:
+        return {input: self._stat(input) for input in self._toList(self.input, True)}
+
+    def resolve(self, input: str) -> list[str]:
+        return self._toList(input)
+
+    def read(self, inputs: list[str]) -> bool:
+        # Only files which are new or changed since they were last read are parsed, files not in the inputs are dropped
+        stats = {input: self._stat(input) for input in inputs}
+        changed = [input for input in inputs if input not in self.files or stats[input] != self.stats.get(input)]
+
+        streams = [input for input in changed if self._is_stream(input)]
+        changed = [input for input in changed if not self._is_stream(input)]
+
+        for input in streams:
+            if not self._tail_file(input, stats[input]):
+                return False
+
+        for input, file_tests in zip(changed, self._read_files(changed)):
+            if file_tests is None:
+                return False
+
+            for test in file_tests:
+                for execution in test.executions:
+                    intern_execution(execution)
+
+            self.files[input] = file_tests
+            self.stats[input] = stats[input]
+
+        for input in list(self.files):
+            if input not in stats:
+                del self.files[input]
+                del self.stats[input]
+                self.offsets.pop(input, None)
+
+        return True
+
+    def merge(self, inputs: list[str], filter: 'Filter | None' = None) -> Tests | None:
         all_tests = Tests()
 
         id = 0
 
-        for input in self.inputs:
-            try:
-                with open(input, 'r') as file:
-                    try:
-                        json_data = json.load(file)
-                    except json.JSONDecodeError as e:
-                        self.logger.error(f'failed to parse input file: {e}')
-                        return None
-            except IOError as e:
-                self.logger.error(f'failed to read input file: {e}')
+        # Files are read in parallel, but merged in input order to keep the ids deterministic
+        for input in inputs:
+            id = merge_tests(all_tests, self.files[input], id, self.logger, filter)
+            if id < 0:
                 return None
 
-            for test in json_data['tests']:
-                tests, id = self._read_test(all_tests, test, id)
-                if tests is None:
-                    return None
-
-                all_tests.tests = all_tests.tests | tests.tests
+        # Outcomes, devices, durations and step counts are computed once for all consumers
+        all_tests.aggregate()
 
         self.logger.debug(all_tests)  # type: ignore
 
         return all_tests
 
-    def _toList(self, files: str) -> list[str]:
-        return files.split(',') if ',' in files else [files]
+    def _parse(self) -> Tests | None:
+        if len(self.inputs) == 0:
+            self.logger.error('no input files found')
+            return None
 
-    def _read_test(self, tests: Tests, json_data: dict, id: int) -> [Tests, int]:  # type: ignore
-        test = Test()
+        if not self.read(self.inputs):
+            return None
+
+        return self.merge(self.inputs)
+
+    def _stat(self, input: str) -> tuple[int, int, int] | None:
+        try:
+            stat = os.stat(input)
+        except OSError:
+            return None
+
+        # The inode tells a file which was replaced (e.g., by a new test run) apart from one which was appended to
+        return stat.st_size, stat.st_mtime_ns, stat.st_ino
+
+    def _toList(self, files: str, quiet: bool = False) -> list[str]:
+        inputs: list[str] = []
+
+        for entry in files.split(','):
+            if entry == '':
+                continue
+
+            if os.path.isdir(entry):
+                inputs += self._scan_folder(entry)
+            elif glob.has_magic(entry):
+                matches = sorted(glob.glob(entry, recursive=True))
+                if len(matches) == 0 and not quiet:
+                    self.logger.warning(f'no input files found for pattern: {entry}')
+
+                inputs += matches
+            else:
+                inputs.append(entry)
+
+        # Remove duplicates, but keep the order in which the inputs were given
+        return list(dict.fromkeys(inputs))
+
+    def _scan_folder(self, folder: str) -> list[str]:
+        filenames: list[str] = []
+        folders = [folder]
+
+        while len(folders) > 0:
+            with os.scandir(folders.pop()) as entries:
+                for entry in entries:
+                    if entry.is_dir():
+                        folders.append(entry.path)
+                    elif entry.is_file() and (entry.name.endswith('.json') or self._is_stream(entry.name)):
+                        filenames.append(entry.path)
+
+        return sorted(filenames)
+
+    def _read_files(self, inputs: list[str]) -> Iterator[list[Test] | None]:
+        jobs = min(self.jobs, len(inputs))
+
+        if jobs <= 1:
+            for input in inputs:
+                yield self._load_file(input)
+        else:
+            # Only the settings are sent to the processes, not the parser with the tests of all files read so far
+            with ProcessPoolExecutor(max_workers=jobs) as executor:
+                yield from executor.map(load_file, inputs, repeat(self.include_self_tests), repeat(self.logger),
+                                        repeat(self.cache))
+
+    def _load_file(self, input: str) -> list[Test] | None:
+        if self.cache is None:
+            return self._read_file(input)
+
+        # Self tests are dropped while reading, so both variants are cached separately
+        variant = 'self-tests' if self.include_self_tests else 'no-self-tests'
+
+        records = self.cache.load(input, variant)
+        if records is not None:
+            return self._from_records(records)
+
+        header = self.cache.header(input)
+
+        tests = self._read_file(input)
+        if tests is not None and header is not None:
+            self.cache.store(input, variant, header, self._to_records(tests))
+
+        return tests
+
+    def _to_records(self, tests: list[Test]) -> list[tuple]:
+        records: list[tuple] = []
+
+        for test in tests:
+            executions = []
+
+            for execution in test.executions:
+                steps = [(step.description, step.outcome) for step in execution.steps]
+                executions.append((execution.device, execution.outcome, execution.duration, steps))
+
+            records.append((test.name, test.node_id, test.description, test.self_test, executions))
+
+        return records
+
+    def _from_records(self, records: list[tuple]) -> list[Test]:
+        tests: list[Test] = []
+
+        for name, node_id, description, self_test, executions in records:
+            test = Test()
+
+            test.name = name
+            test.node_id = node_id
+            test.description = description
+            test.self_test = self_test
+
+            for device, outcome, duration, steps in executions:
+                execution = Execution()
+
+                execution.device = device
+                execution.outcome = outcome
+                execution.duration = duration
+
+                for step_description, step_outcome in steps:
+                    step = Step()
+
+                    step.id = len(execution.steps)
+                    step.description = step_description
+                    step.outcome = step_outcome
+
+                    execution.steps.append(step)
 
-        test.id = id
+                test.executions.append(execution)
+
+            tests.append(test)
+
+        return tests
+
+    def _is_stream(self, input: str) -> bool:
+        return input.endswith('.ndjson')
+
+    def _tail_file(self, input: str, stat: tuple[int, int, int] | None) -> bool:
+        # Records are only appended to streams, so only the records after the previous read are parsed
+        offset = self.offsets.get(input, 0)
+        previous = self.stats.get(input)
+
+        # A stream which became smaller or was replaced by another file was started over
+        if input not in self.files or stat is None or previous is None or stat[0] < offset or stat[2] != previous[2]:
+            self.files[input] = []
+            offset = 0
+
+        reader = NDJSONReader(input, offset=offset)
+
+        tests = self._read_tests(input, reader)
+        if tests is None:
+            return False
+
+        for test in tests:
+            for execution in test.executions:
+                intern_execution(execution)
+
+        self.files[input] += tests
+        self.stats[input] = stat
+        self.offsets[input] = reader.offset
+
+        return True
+
+    def _read_file(self, input: str) -> list[Test] | None:
+        return self._read_tests(input, Reader(input))
+
+    def _read_tests(self, input: str, reader: Reader) -> list[Test] | None:
+        tests: list[Test] = []
+
+        # Test records are read one at a time, the file itself is never loaded as a whole
+        try:
+            for json_test in reader.tests():
+                test = self._read_test(json_test)
+                if test is None:
+                    return None
+
+                # Skip self tests if not requested
+                if test.self_test and not self.include_self_tests:
+                    continue
+
+                tests.append(test)
+        except (Reader.Error, json.JSONDecodeError) as e:
+            self.logger.error(f'failed to parse input file {input}: {e}')
+            return None
+        except IOError as e:
+            self.logger.error(f'failed to read input file: {e}')
+            return None
+
+        return tests
+
+    def _read_test(self, json_data: dict) -> Test | None:
+        test = Test()
 
         if not self._hasKey('metadata', json_data, test.node_id):
             self.logger.error(f'no metadata found for test: {test.node_id}')
-            return None, -1
+            return None
 
         test.name = self._readKey('active_test', json_data['metadata'], test.node_id)  # type: ignore
         if test.name is None:
-            return None, -1
+            return None
 
         test.node_id = self._readKey('nodeid', json_data)
         if test.node_id is None:
-            return None, -1
+            return None
 
         # Remove helper postfix from node id
         test.node_id = re.sub('\\[(.*)]', '', test.node_id)
 
         if test.name not in test.node_id:
             self.logger.error(f'name {test.name} not found in node id {test.node_id}')
-            return None, -1
+            return None
 
         test.description = self._readKey('description', json_data['metadata'], test.node_id)  # type: ignore
         if test.description is None:
-            return None, -1
+            return None
 
         if self._hasOptionalKey('self_test', json_data['metadata']):
             test.self_test = json_data['metadata']['self_test']
 
-        # Skip self tests if not requested
+        # Executions of skipped self tests are never read
         if test.self_test and not self.include_self_tests:
-            return tests, id
-
-        existing_test = self._get_test(test.name, tests)
-        if existing_test is not None:
-            if not self._verify_test(test, existing_test):
-                return None, -1
+            return test
 
-            # Add the device to the existing test
-            test = existing_test
-        else:
-            id += 1  # Only increment the id if the test is new
-
-        execution = self._read_execution(json_data, len(test.executions), test.node_id)
+        execution = self._read_execution(json_data, 0, test.node_id)
         if execution is None:
             return None
 
         test.executions.append(execution)
 
-        tests.tests[test.name] = test
-
-        return tests, id
+        return test
 
     def _read_execution(self, json_data: dict, id: int, node_id: str) -> Execution | None:
         execution = Execution()
@@ -306,33 +769,6 @@ class Parser:
 
         return steps
 
-    def _get_test(self, name: str, tests: Tests) -> Test | None:
-        for key, value in tests.tests.items():
-            if key == name:
-                return value
-
-        return None
-
-    def _verify_test(self, test: Test, existing_test: Test) -> bool:
-        if test.name != existing_test.name:
-            self.logger.error(f'name mismatch for {test.name}: {test.name} != {existing_test.name}')
-            return False
-
-        if test.node_id != existing_test.node_id:
-            self.logger.error(f'node id mismatch for {test.name}: {test.node_id} != {existing_test.node_id}')
-            return False
-
-        if test.description != existing_test.description:
-            self.logger.error(
-                f'description mismatch for {test.name}: {test.description} != {existing_test.description}')
-            return False
-
-        if test.self_test != existing_test.self_test:
-            self.logger.error(f'self test mismatch for {test.name}: {test.self_test} != {existing_test.self_test}')
-            return False
-
-        return True
-
     def _readKey(self, key: str, data: dict, node_id: str = '', step_key: str = '') -> str:
         if not self._hasKey(key, data, node_id):
             return None  # type: ignore
@@ -354,3 +790,8 @@ class Parser:
 
     def _hasOptionalKey(self, key: str, data: dict) -> bool:
         return key in data
+
+
+def load_file(input: str, include_self_tests: bool, logger: Logger, cache: Cache | None) -> list[Test] | None:
+    # Worker of the parse processes, reads a file with a parser of its own
+    return Parser(input, include_self_tests, logger, 1, cache)._load_file(input)
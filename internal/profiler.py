@@ -0,0 +1,143 @@
+# SPDX-License-Identifier: MIT
+
+'''
+@File     :  profiler.py
+@Desc     :  Profiler class, to measure the cost of the stages of the report generation
+@Authors  :  Nick Vissers <nick.vissers@openpixelsystems.org>
+@Date     :  18/10/2026
+@Version  :  1.0
+'''
+
+import cProfile
+import json
+import os
+import time
+import tracemalloc
+
+from contextlib import contextmanager
+from typing import Any, Iterator
+
+from internal.logger import Logger
+from internal.parser import Tests
+
+
+class Profiler:
+    enabled: bool
+    memory: bool
+    cprofile_stage: str
+    stages: dict[str, dict[str, float]]
+    counts: dict[str, int]
+    logger: Logger
+
+    def __init__(self, enabled: bool, logger: Logger, cprofile_stage: str = '', memory: bool = False) -> None:
+        self.enabled = enabled
+        self.memory = enabled and memory  # Tracing slows down every stage, the times are only comparable without it
+        self.cprofile_stage = cprofile_stage
+        self.stages = {}
+        self.counts = {}
+        self.logger = logger
+        self._cprofile: cProfile.Profile | None = None
+
+        if self.memory:
+            tracemalloc.start()
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        if not self.enabled:
+            yield
+            return
+
+        cprofile = None
+
+        if name == self.cprofile_stage:
+            cprofile = cProfile.Profile()
+            self._cprofile = cprofile
+
+        memory = 0
+
+        if self.memory:
+            tracemalloc.reset_peak()
+            memory, _ = tracemalloc.get_traced_memory()
+
+        wall = time.perf_counter()
+        cpu = self._cpu_time()
+
+        if cprofile is not None:
+            cprofile.enable()
+
+        try:
+            yield
+        finally:
+            if cprofile is not None:
+                cprofile.disable()
+
+            wall = time.perf_counter() - wall
+            cpu = self._cpu_time() - cpu
+
+            self.stages[name] = {'wall_time': wall, 'cpu_time': cpu}
+
+            if self.memory:
+                current, peak = tracemalloc.get_traced_memory()
+
+                self.stages[name].update({'memory_start': memory, 'memory_end': current, 'memory_peak': peak})
+
+    def count(self, name: str, value: int) -> None:
+        self.counts[name] = value
+
+    def count_tests(self, tests: Tests) -> None:
+        executions = 0
+        steps = 0
+
+        for test in tests.tests.values():
+            executions += len(test.executions)
+
+            for execution in test.executions:
+                steps += len(execution.steps)
+
+        self.count('tests', len(tests.tests))
+        self.count('executions', executions)
+        self.count('steps', steps)
+
+    def write(self, file_path: str, details: dict[str, Any]) -> bool:
+        if not self.enabled:
+            return True
+
+        total = {
+            'wall_time': sum([stage['wall_time'] for stage in self.stages.values()]),
+            'cpu_time': sum([stage['cpu_time'] for stage in self.stages.values()])
+        }
+
+        if self.memory:
+            total['memory_peak'] = max([stage['memory_peak'] for stage in self.stages.values()], default=0)
+
+        profile = {
+            'details': details,
+            'stages': self.stages,
+            'counts': self.counts,
+            'total': total
+        }
+
+        try:
+            with open(file_path, 'w') as output:
+                json.dump(profile, output, indent=4)
+
+            if self._cprofile is not None:
+                self._cprofile.dump_stats(self.cprofile_path(file_path))
+        except IOError as e:
+            self.logger.error(f'failed to write profile to disk: {e}')
+            return False
+
+        self.logger.info(f'profile written: {os.path.abspath(file_path)}')
+
+        if self._cprofile is not None:
+            self.logger.info(f'{self.cprofile_stage} stage profile written: {os.path.abspath(self.cprofile_path(file_path))}')
+
+        return True
+
+    def cprofile_path(self, file_path: str) -> str:
+        return f'{os.path.splitext(file_path)[0]}.{self.cprofile_stage}.prof'
+
+    def _cpu_time(self) -> float:
+        # Worker processes are included once they are joined, which happens at the end of the stage that started them
+        times = os.times()
+        return times.user + times.system + times.children_user + times.children_system
@@ -0,0 +1,335 @@
+# SPDX-License-Identifier: MIT
+
+'''
+@File     :  reader.py
+@Desc     :  Reader class, to incrementally read the test records from (large) JSON report files
+@Authors  :  Nick Vissers <nick.vissers@openpixelsystems.org>
+@Date     :  18/10/2026
+@Version  :  1.0
+'''
+
+import codecs
+import json
+import mmap
+import re
+
+from typing import Any, Iterator
+
+
+# Fields of a test record used by the parser, None means the value is read as a whole
+TEST_FIELDS: dict[str, Any] = {
+    'nodeid': None,
+    'outcome': None,
+    'metadata': None,
+    'call': {
+        'duration': None
+    }
+}
+
+
+class Window:
+    _WHITESPACE = re.compile(r'[ \t\n\r]*')
+
+    data: mmap.mmap
+    size: int
+    text: str
+    index: int
+    start: int
+    end: int
+    _ascii: bool
+    _counted: int  # Index up to which the bytes of the text are counted
+    _counted_bytes: int
+
+    def __init__(self, data: mmap.mmap, pos: int, size: int) -> None:
+        self.data = data
+        self.size = size
+        self._decoder = json.JSONDecoder()
+        self.seek(pos)
+
+    def seek(self, pos: int) -> None:
+        # Text of the bytes from start to end, index is the current position in the text
+        self._utf8 = codecs.getincrementaldecoder('utf-8')()
+        self.text = ''
+        self.index = 0
+        self.start = pos
+        self.end = pos
+        self._reset()
+
+    def position(self) -> int:
+        if self._ascii:
+            return self.start + self.index
+
+        # The index only moves forward, only the text read since the previous call is encoded
+        self._counted_bytes += len(self.text[self._counted:self.index].encode('utf-8'))
+        self._counted = self.index
+
+        return self.start + self._counted_bytes
+
+    def _reset(self) -> None:
+        # Checked once per window, the byte offset of ASCII text is its index
+        self._ascii = self.text.isascii()
+        self._counted = 0
+        self._counted_bytes = 0
+
+    def decode(self) -> Any:
+        if len(self.text) - self.index < self.size // 2:
+            self._fill()
+
+        value, self.index = self._decoder.raw_decode(self.text, self.index)
+
+        return value
+
+    def next(self, close: bytes) -> bool:
+        self.index = self._WHITESPACE.match(self.text, self.index).end()  # type: ignore
+
+        while self.index == len(self.text) and self.end < len(self.data):
+            self._fill()
+            self.index = self._WHITESPACE.match(self.text, self.index).end()  # type: ignore
+
+        separator = self.text[self.index:self.index + 1]
+
+        if separator == close.decode():
+            self.index += 1
+            return False
+
+        if separator != ',':
+            raise Reader.Error(f'expected , or {close.decode()}', self.position())
+
+        self.index = self._WHITESPACE.match(self.text, self.index + 1).end()  # type: ignore
+
+        return True
+
+    def _fill(self) -> None:
+        # Drop the text which is already read and decode the next block of the file
+        self.start = self.position()
+        self.text = self.text[self.index:]
+        self.index = 0
+
+        end = min(self.end + self.size, len(self.data))
+        self.text += self._utf8.decode(self.data[self.end:end], end == len(self.data))
+        self.end = end
+
+        self._reset()
+
+
+class Reader:
+    class Error(Exception):
+        def __init__(self, message: str, position: int) -> None:
+            super().__init__(f'{message} (at byte {position})')
+
+    _WHITESPACE = re.compile(rb'[ \t\n\r]*')
+    _STRING = re.compile(rb'"[^"\\]*(?:\\.[^"\\]*)*"')
+    _SCALAR = re.compile(rb'[^,:}\] \t\n\r]+')
+    _STRUCTURE = re.compile(rb'["{}\[\]]')
+
+    file_path: str
+    fields: dict[str, Any]
+    window_size: int
+
+    def __init__(self, file_path: str, fields: dict[str, Any] = TEST_FIELDS, window_size: int = 1024 * 1024) -> None:
+        self.file_path = file_path
+        self.fields = fields
+        self.window_size = window_size
+
+    def tests(self) -> Iterator[dict]:
+        with open(self.file_path, 'rb') as file:
+            try:
+                data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                raise Reader.Error('file is empty', 0)
+
+            with data:
+                # Pages are only read once, from start to end
+                if hasattr(mmap, 'MADV_SEQUENTIAL'):
+                    data.madvise(mmap.MADV_SEQUENTIAL)
+
+                yield from self._tests(data)
+
+    def _tests(self, data: mmap.mmap) -> Iterator[dict]:
+        pos = self._expect(data, self._skip(data, 0), b'{')
+        more, pos = self._first(data, pos, b'}')
+
+        while more:
+            key, pos = self._key(data, pos)
+
+            if key == 'tests':
+                yield from self._array(data, pos)
+                return
+
+            pos = self._skip_value(data, pos)
+            more, pos = self._next(data, pos, b'}')
+
+        raise Reader.Error('no tests found', pos)
+
+    def _array(self, data: mmap.mmap, pos: int) -> Iterator[dict]:
+        pos = self._expect(data, pos, b'[')
+        more, pos = self._first(data, pos, b']')
+
+        window = Window(data, pos, self.window_size)
+
+        while more:
+            # Records are decoded from the window by the C decoder, records which do not fit in the window (or which
+            # are malformed) are read field by field from the mapped file, without decoding the unused fields
+            try:
+                test = window.decode()
+            except json.JSONDecodeError:
+                test = None
+
+            if type(test) is dict:
+                yield self._select(test, self.fields)
+            else:
+                test, pos = self._read_object(data, window.position(), self.fields)
+                yield test
+
+                window.seek(pos)
+
+            more = window.next(b']')
+
+    def _select(self, data: dict, fields: dict[str, Any]) -> dict:
+        result: dict = {}
+
+        for key, value in fields.items():
+            if key not in data:
+                continue
+
+            if value is not None and type(data[key]) is dict:
+                result[key] = self._select(data[key], value)
+            else:
+                result[key] = data[key]
+
+        return result
+
+    def _read_object(self, data: mmap.mmap, pos: int, fields: dict[str, Any]) -> tuple[dict, int]:
+        result: dict = {}
+
+        pos = self._expect(data, pos, b'{')
+        more, pos = self._first(data, pos, b'}')
+
+        while more:
+            key, pos = self._key(data, pos)
+
+            if key not in fields:
+                pos = self._skip_value(data, pos)
+            elif fields[key] is not None and data[pos:pos + 1] == b'{':
+                result[key], pos = self._read_object(data, pos, fields[key])
+            else:
+                end = self._skip_value(data, pos)
+                result[key] = json.loads(data[pos:end])
+                pos = end
+
+            more, pos = self._next(data, pos, b'}')
+
+        return result, pos
+
+    def _key(self, data: mmap.mmap, pos: int) -> tuple[str, int]:
+        end = self._string_end(data, pos)
+        key = json.loads(data[pos:end])
+
+        pos = self._expect(data, self._skip(data, end), b':')
+
+        return key, self._skip(data, pos)
+
+    def _first(self, data: mmap.mmap, pos: int, close: bytes) -> tuple[bool, int]:
+        pos = self._skip(data, pos)
+
+        if data[pos:pos + 1] == close:
+            return False, pos + 1
+
+        return True, pos
+
+    def _next(self, data: mmap.mmap, pos: int, close: bytes) -> tuple[bool, int]:
+        pos = self._skip(data, pos)
+        separator = data[pos:pos + 1]
+
+        if separator == close:
+            return False, pos + 1
+
+        if separator != b',':
+            raise Reader.Error(f'expected , or {close.decode()}', pos)
+
+        return True, self._skip(data, pos + 1)
+
+    def _skip_value(self, data: mmap.mmap, pos: int) -> int:
+        first = data[pos:pos + 1]
+
+        if first == b'"':
+            return self._string_end(data, pos)
+
+        if first != b'{' and first != b'[':
+            match = self._SCALAR.match(data, pos)
+            if match is None:
+                raise Reader.Error('expected a value', pos)
+
+            return match.end()
+
+        # Skip nested objects and arrays without decoding them
+        depth = 0
+
+        while True:
+            match = self._STRUCTURE.search(data, pos)
+            if match is None:
+                raise Reader.Error('unterminated object or array', pos)
+
+            token = match.group()
+            pos = match.start()
+
+            if token == b'"':
+                pos = self._string_end(data, pos)
+                continue
+
+            pos += 1
+
+            if token == b'{' or token == b'[':
+                depth += 1
+            else:
+                depth -= 1
+
+                if depth == 0:
+                    return pos
+
+    def _string_end(self, data: mmap.mmap, pos: int) -> int:
+        match = self._STRING.match(data, pos)
+        if match is None:
+            raise Reader.Error('expected a string', pos)
+
+        return match.end()
+
+    def _skip(self, data: mmap.mmap, pos: int) -> int:
+        return self._WHITESPACE.match(data, pos).end()  # type: ignore
+
+    def _expect(self, data: mmap.mmap, pos: int, token: bytes) -> int:
+        if data[pos:pos + 1] != token:
+            raise Reader.Error(f'expected {token.decode()}', pos)
+
+        return pos + 1
+
+
+class NDJSONReader(Reader):
+    offset: int
+
+    def __init__(self, file_path: str, fields: dict[str, Any] = TEST_FIELDS, offset: int = 0) -> None:
+        super().__init__(file_path, fields)
+        self.offset = offset
+
+    def tests(self) -> Iterator[dict]:
+        # One test record per line, the offset is moved past every complete line which is read
+        with open(self.file_path, 'rb') as file:
+            file.seek(self.offset)
+
+            for line in file:
+                # The last line can still be being written, it is read again once it is complete
+                if not line.endswith(b'\n'):
+                    return
+
+                if line.strip() != b'':
+                    try:
+                        test = json.loads(line)
+                    except json.JSONDecodeError as e:
+                        raise Reader.Error(f'invalid record: {e}', self.offset)
+
+                    if type(test) is not dict:
+                        raise Reader.Error('expected {', self.offset)
+
+                    yield self._select(test, self.fields)
+
+                self.offset += len(line)
@@ -0,0 +1,123 @@
+# SPDX-License-Identifier: MIT
+
+'''
+@File     :  diff_builder.py
+@Desc     :  Diff builder class, to generate HTML content for the reports of the changes compared to a baseline
+@Authors  :  Nick Vissers <nick.vissers@openpixelsystems.org>
+@Date     :  18/10/2026
+@Version  :  1.0
+'''
+
+from internal.builder import Element, Builder
+from internal.comparison import Comparison
+from internal.static.static_builder import StaticBuilder
+from internal.template import Fragment, cell, escape
+
+
+class DiffBuilder(StaticBuilder):
+    # Classes of the rows of every kind of change, the colors of the static report
+    CLASSES = {
+        Comparison.NEW_FAILURE: 'failed',
+        Comparison.FIXED: 'passed',
+        Comparison.SLOWER: 'skipped',
+        Comparison.NEW: 'mixed',
+        Comparison.REMOVED: 'mixed'
+    }
+
+    def build(self, title: str, data: Builder.Data) -> Element:
+        if data.comparison is None:
+            raise Builder.Error()  # A comparison is required
+
+        html = Element('html')
+        head = self._head(title)
+        body = self._diff_body(title, data.comparison)
+
+        html.add(head)
+        html.add(body)
+
+        return html
+
+    def pages(self, title: str, data: Builder.Data) -> list[Builder.Page]:
+        return []  # The changes are always on a single page
+
+    def _diff_body(self, title: str, comparison: Comparison.Result) -> Element:
+        body = Element('body')
+
+        body.add(self._title(title))
+
+        div = Element('div', '')
+
+        div.add(Element('h2', 'Changes compared to the baseline'))
+        div.add(self._diff_action_bar(comparison))
+        div.add(self._diff_table_container(comparison))
+
+        body.add(div)
+
+        return body
+
+    def _diff_action_bar(self, comparison: Comparison.Result) -> Element:
+        div = Element('div', '', {'class': 'action-bar'})
+
+        summary = Element('span', '', {'class': 'summary'})
+
+        execution_tag = 'executions' if comparison.compared != 1 else 'execution'
+        summary.add(Element('span', f'{comparison.compared} {execution_tag} compared', {'class': 'tile total active'}))
+
+        for kind in Comparison.KINDS:
+            count = comparison.counts[kind]
+            if count == 0:
+                continue
+
+            label = f'{kind}s' if kind == Comparison.NEW_FAILURE and count != 1 else kind
+            summary.add(Element('span', f'{count} {label}', {'class': f'tile {DiffBuilder.CLASSES[kind]} active'}))
+
+        div.add(summary)
+
+        return div
+
+    def _diff_table_container(self, comparison: Comparison.Result) -> Element:
+        div = Element('div', '', {'class': 'individual-test-execution-table-container'})
+
+        if len(comparison.entries) == 0:
+            div.add(Element('div', 'No changes compared to the baseline', {'class': 'no-tests'}))
+            return div
+
+        table = Element('table', '', {'class': 'test-table'})
+
+        thead = Element('thead', '')
+        thead_tr = Element('tr', '')
+
+        for header in ['Change', 'Name', 'Device', 'Baseline', 'Current', 'Baseline duration', 'Duration']:
+            thead_tr.add(Element('th', header))
+
+        thead.add(thead_tr)
+
+        tbody = Element('tbody', '')
+
+        for entry in comparison.entries:
+            duration = f'{entry.current.duration:.2f}s' if entry.current is not None else '-'
+
+            change = entry.duration_change()
+            if change is not None:
+                duration += f' ({change * 100:+.0f}%)'
+
+            baseline_outcome = entry.baseline.outcome if entry.baseline is not None else '-'
+            current_outcome = entry.current.outcome if entry.current is not None else '-'
+            baseline_duration = f'{entry.baseline.duration:.2f}s' if entry.baseline is not None else '-'
+
+            tbody.add(Fragment(f'<tr class="{DiffBuilder.CLASSES[entry.kind]}">\n'
+                               f'<td>{entry.kind}</td>\n'
+                               f'{cell("td", escape(entry.name))}'
+                               f'{cell("td", escape(entry.device))}'
+                               f'{cell("td", escape(baseline_outcome))}'
+                               f'{cell("td", escape(current_outcome))}'
+                               f'<td>{baseline_duration}</td>\n'
+                               f'<td>{duration}</td>\n'
+                               f'</tr>\n', 8))
+
+        table.add(thead)
+        table.add(tbody)
+
+        div.add(table)
+
+        return div
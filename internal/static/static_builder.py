@@ -8,20 +8,59 @@
 @Version  :  1.0
 '''
 
-from internal.builder import Element, Builder
-from internal.parser import Tests, Test, Execution
+from internal.builder import Element, Builder, Serializer
+from internal.collector import Asset
+from internal.history import History
+from internal.logger import Logger
+from internal.parser import Tests, Test, Execution, Summary
+from internal.template import Fragment, cell, escape, escape_attribute
 
 
 class StaticBuilder(Builder):
-    def build(self, title: str, data: Builder.Data) -> str:
+    style: str
+    step_header: Fragment
+
+    def __init__(self, styles: list[Asset], scripts: list[Asset], logger: Logger) -> None:
+        super().__init__(styles, scripts, logger)
+
+        # Read once, shared by all reports and pages built by this builder
+        self.style = self._read_styles()
+        self.step_header = self._step_header()
+
+    def build(self, title: str, data: Builder.Data) -> Element:
         html = Element('html')
         head = self._head(title)
-        body = self._body(title, data.tests)
+        body = self._body(title, data.tests, data.tests_per_page, data.history)
 
         html.add(head)
         html.add(body)
 
-        return self._build(html)
+        return html
+
+    def pages(self, title: str, data: Builder.Data) -> list[Builder.Page]:
+        pages: list[Builder.Page] = []
+
+        if data.tests_per_page <= 0:
+            return pages
+
+        tests = list(data.tests.tests.values())
+        count = (len(tests) + data.tests_per_page - 1) // data.tests_per_page
+
+        for i in range(0, count):
+            start = i * data.tests_per_page
+            pages.append(Builder.Page(self, title, i + 1, count, tests[start:start + data.tests_per_page]))
+
+        return pages
+
+    def page(self, page: Builder.Page) -> Element:
+        html = Element('html')
+        head = self._head(page.title)
+        body = self._page_body(page)
+
+        html.add(head)
+        html.add(body)
+
+        return html
 
     def _head(self, title: str) -> Element:
         head = Element('head')
@@ -37,6 +76,9 @@ class StaticBuilder(Builder):
         return head
 
     def _style(self) -> Element:
+        return Element('style', self.style, {'type': 'text/css'}, True)
+
+    def _read_styles(self) -> str:
         styles: list[str] = []
 
         for style in self.styles:
@@ -46,16 +88,36 @@ class StaticBuilder(Builder):
             except IOError as e:
                 self.logger.warning(f'style file {style.source} not found: {e}')
 
-        return Element('style', '\n'.join(styles), {'type': 'text/css'})
+        return '\n'.join(styles)
 
-    def _body(self, title: str, tests: Tests) -> Element:
+    def _body(self, title: str, tests: Tests, tests_per_page: int, history: History.Trends | None) -> Element:
         body = Element('body')
 
         body.add(self._title(title))
-        body.add(self._overview(tests.tests))
 
-        for test in tests.tests.values():
-            body.add(self._individual_test(test))
+        if history is not None:
+            body.add(self._history(history))
+
+        body.add(self._overview(tests, tests_per_page))
+
+        if tests_per_page > 0:
+            body.add(self._pages(len(tests.tests), tests_per_page))
+        else:
+            for test in tests.tests.values():
+                body.add(self._individual_test(test))
+
+        return body
+
+    def _page_body(self, page: Builder.Page) -> Element:
+        body = Element('body')
+
+        body.add(self._title(page.title))
+        body.add(self._page_navigation(page))
+
+        for test in page.tests:
+            body.add(self._individual_test(test, True))
+
+        body.add(self._page_navigation(page))
 
         return body
 
@@ -66,57 +128,49 @@ class StaticBuilder(Builder):
 
     # Overview
 
-    def _overview(self, tests: dict[str, Test]) -> Element:
+    def _overview(self, tests: Tests, tests_per_page: int) -> Element:
         div = Element('div', '')
 
         div.add(Element('h2', 'Test overview'))
         div.add(self._overview_action_bar(tests))
-        div.add(self._overview_table_container(tests))
+        div.add(self._overview_table_container(tests.tests, tests_per_page))
 
         return div
 
-    def _overview_action_bar(self, tests: dict[str, Test]) -> Element:
+    def _overview_action_bar(self, tests: Tests) -> Element:
         div = Element('div', '', {'class': 'action-bar'})
 
-        passed = 0
-        failed = 0
-        skipped = 0
-
-        for _, test in tests.items():
-            outcome = test.get_outcome()
+        counts = tests.get_summary()
 
-            if outcome == 'passed':
-                passed += 1
-            elif outcome == 'failed':
-                failed += 1
-            elif outcome == 'skipped':
-                skipped += 1
-            else:
-                self.logger.warning(f'unknown outcome for test: {test.name}')
+        if counts.passed + counts.failed + counts.skipped != counts.total:
+            for test in tests.tests.values():
+                if test.get_outcome() == 'unknown':
+                    self.logger.warning(f'unknown outcome for test: {test.name}')
 
         total_tag = 'tests'
 
-        if len(tests) == 1:
+        if counts.total == 1:
             total_tag = 'test'
 
-        summary = Element('span', '', {'class': 'summary'})
+        div.add(self._summary_tiles(f'{counts.total} {total_tag}', counts))
 
-        summary.add(Element('span', f'{len(tests)} {total_tag}', {'class': 'tile total active'}))
-
-        if passed > 0:
-            summary.add(Element('span', f'{passed} passed', {'class': 'tile passed active'}))
+        return div
 
-        if failed > 0:
-            summary.add(Element('span', f'{failed} failed', {'class': 'tile failed active'}))
+    def _summary_tiles(self, total: str, counts: Summary) -> Fragment:
+        tiles = [f'<span class="summary">\n<span class="tile total active">{total}</span>\n']
 
-        if skipped > 0:
-            summary.add(Element('span', f'{skipped} skipped', {'class': 'tile skipped active'}))
+        if counts.passed > 0:
+            tiles.append(f'<span class="tile passed active">{counts.passed} passed</span>\n')
+        if counts.failed > 0:
+            tiles.append(f'<span class="tile failed active">{counts.failed} failed</span>\n')
+        if counts.skipped > 0:
+            tiles.append(f'<span class="tile skipped active">{counts.skipped} skipped</span>\n')
 
-        div.add(summary)
+        tiles.append('</span>\n')
 
-        return div
+        return Fragment(''.join(tiles), len(tiles))  # The summary, the total and the outcome tiles
 
-    def _overview_table_container(self, tests: dict[str, Test]) -> Element:
+    def _overview_table_container(self, tests: dict[str, Test], tests_per_page: int) -> Element:
         div = Element('div', '', {'class': 'individual-test-execution-table-container'})
 
         if len(tests) > 0:
@@ -137,38 +191,15 @@ class StaticBuilder(Builder):
 
             tbody = Element('tbody', '')
 
-            for test in tests.values():
-                execution_count = len(test.executions)
-
-                for execution in test.executions:
-                    execution_outcome_class = {'class': f'{execution.outcome}'}
-                    tr_classes = ''
-
-                    if test.has_same_outcome():
-                        tr_classes += f' {test.get_outcome()}'
-                    else:
-                        tr_classes += ' mixed'
+            for position, test in enumerate(tests.values()):
+                name = escape(test.name)
 
-                    if execution_count > 1 and execution.id != len(test.executions) - 1:
-                        tr_classes += ' no-border'
+                # Link to the page holding the details of the test
+                if tests_per_page > 0:
+                    filename = Builder.page_filename(position // tests_per_page + 1)
+                    name = f'<a href="{filename}#test-{test.id}">{name}</a>'
 
-                    tbody_tr = Element('tr', '', {'class': tr_classes})
-
-                    if execution.id == 0:
-                        rowspan = {'rowspan': f'{execution_count}'}
-
-                        tbody_tr.add(Element('td', str(test.id), rowspan))
-                        tbody_tr.add(Element('td', execution.outcome, execution_outcome_class))
-                        tbody_tr.add(Element('td', execution.device, execution_outcome_class))
-                        tbody_tr.add(Element('td', test.name, rowspan))
-                        tbody_tr.add(Element('td', f'{execution.duration:.2f}s', execution_outcome_class))
-                        tbody_tr.add(Element('td', str(len(test.executions)), {'align': 'center'} | rowspan))
-                    else:
-                        tbody_tr.add(Element('td', execution.outcome, execution_outcome_class))
-                        tbody_tr.add(Element('td', execution.device, execution_outcome_class))
-                        tbody_tr.add(Element('td', f'{execution.duration:.2f}s', execution_outcome_class))
-
-                    tbody.add(tbody_tr)
+                tbody.add(self._overview_rows(test, name))
 
             table.add(thead)
             table.add(tbody)
@@ -179,13 +210,91 @@ class StaticBuilder(Builder):
 
         return div
 
+    def _overview_rows(self, test: Test, name: str) -> Fragment:
+        rows: list[str] = []
+
+        execution_count = len(test.executions)
+        test_classes = f' {escape_attribute(test.get_outcome())}' if test.has_same_outcome() else ' mixed'
+        rowspan = f' rowspan="{execution_count}"'
+        elements = 0
+
+        for execution in test.executions:
+            outcome = f' class="{escape_attribute(execution.outcome)}"'
+            outcome_text = escape(execution.outcome)
+            device = escape(execution.device)
+            tr_classes = test_classes
+
+            if execution_count > 1 and execution.id != execution_count - 1:
+                tr_classes += ' no-border'
+
+            rows.append(f'<tr class="{tr_classes}">\n')
+
+            if execution.id == 0:
+                rows.append(cell('td', str(test.id), rowspan))
+                rows.append(cell('td', outcome_text, outcome))
+                rows.append(cell('td', device, outcome))
+                rows.append(cell('td', name, rowspan))
+                rows.append(cell('td', f'{execution.duration:.2f}s', outcome))
+                rows.append(cell('td', str(execution_count), f' align="center"{rowspan}'))
+                elements += 7
+            else:
+                rows.append(cell('td', outcome_text, outcome))
+                rows.append(cell('td', device, outcome))
+                rows.append(cell('td', f'{execution.duration:.2f}s', outcome))
+                elements += 4
+
+            rows.append('</tr>\n')
+
+        return Fragment(''.join(rows), elements)
+
     def _overview_table_placeholder_no_tests(self) -> Element:
         return Element('div', 'No tests found', {'class': 'no-tests'})
 
+    # Pages
+
+    def _pages(self, test_count: int, tests_per_page: int) -> Element:
+        div = Element('div', '', {'class': 'pages'})
+
+        div.add(Element('h2', 'Test details'))
+
+        ul = Element('ul', '')
+
+        for start in range(0, test_count, tests_per_page):
+            end = min(start + tests_per_page, test_count)
+            filename = Builder.page_filename(start // tests_per_page + 1)
+
+            li = Element('li', '')
+            li.add(Element('a', f'Tests {start + 1} - {end}', {'href': filename}))
+            ul.add(li)
+
+        div.add(ul)
+
+        return div
+
+    def _page_navigation(self, page: Builder.Page) -> Element:
+        div = Element('div', '', {'class': 'page-navigation'})
+
+        div.add(Element('a', 'Overview', {'href': Builder.page_filename(0)}))
+
+        if page.number > 1:
+            div.add(Element('a', 'Previous', {'href': Builder.page_filename(page.number - 1)}))
+
+        if page.number < page.count:
+            div.add(Element('a', 'Next', {'href': Builder.page_filename(page.number + 1)}))
+
+        div.add(Element('span', f'Page {page.number} of {page.count}'))
+
+        return div
+
     # Individual tests
 
-    def _individual_test(self, test: Test) -> Element:
-        div = Element('div', '', {'class': 'individual-test'})
+    def _individual_test(self, test: Test, anchor: bool = False) -> Element:
+        args = {'class': 'individual-test'}
+
+        if anchor:
+            args['id'] = f'test-{test.id}'
+
+        div = Element('div', '', args)
 
         div.add(Element('h2', f'Test: {test.name}'))
         div.add(self._individual_test_description(test))
@@ -198,7 +307,7 @@ class StaticBuilder(Builder):
         div = Element('div', '', {'class': 'test-description'})
 
         div.add(Element('h3', 'Test description:'))
-        div.add(Element('p', test.description.replace('\n', '', 1).replace('\n', '<br/>\n') + '<br/>'))
+        div.add(Element('p', escape(test.description).replace('\n', '', 1).replace('\n', '<br/>\n') + '<br/>', raw=True))
 
         return div
 
@@ -231,99 +340,72 @@ class StaticBuilder(Builder):
         div = Element('div', '', {'class': 'individual-test-executions'})
 
         for execution in test.executions:
-            classes = 'individual-test-execution'
-
-            div_execution = Element('div', '', {'class': classes})
-
-            div_execution.add(Element('h3', f'Device: {execution.device}'))
-            div_execution.add(self._individual_test_action_bar(test, execution))
-            div_execution.add(self._individual_test_table_container(test, execution))
-
-            div.add(div_execution)
+            div.add(self._individual_test_execution(test, execution))
 
         return div
 
-    def _individual_test_action_bar(self, test: Test, execution: Execution) -> Element:
-        div = Element('div', '', {'class': 'action-bar'})
+    def _individual_test_execution(self, test: Test, execution: Execution) -> Fragment:
+        action_bar = self._individual_test_action_bar(test, execution)
+        table_container = self._individual_test_table_container(test, execution)
+
+        html = (f'<div class="individual-test-execution">\n'
+                f'{cell("h3", f"Device: {escape(execution.device)}")}'
+                f'{action_bar.html}{table_container.html}'
+                f'</div>\n')
 
-        passed = 0
-        failed = 0
-        skipped = 0
+        return Fragment(html, 2 + action_bar.elements + table_container.elements)
 
-        for step in execution.steps:
-            if step.outcome == 'passed':
-                passed += 1
-            elif step.outcome == 'failed':
-                failed += 1
-            elif step.outcome == 'skipped':
-                skipped += 1
+    def _individual_test_action_bar(self, test: Test, execution: Execution) -> Fragment:
+        counts = execution.get_summary()
+        total = test.executions[0].get_summary().total
 
         total_tag = 'steps'
 
-        if len(test.executions[0].steps) == 1:
+        if total == 1:
             total_tag = 'step'
 
-        summary = Element('span', '', {'class': 'summary'})
+        summary = self._summary_tiles(f'{total} {total_tag}', counts)
 
-        summary.add(Element('span', f'{len(test.executions[0].steps)} {total_tag}', {'class': 'tile total active'}))
+        return Fragment(f'<div class="action-bar">\n{summary.html}</div>\n', 1 + summary.elements)
 
-        if passed > 0:
-            summary.add(Element('span', f'{passed} passed', {'class': 'tile passed active'}))
-        if failed > 0:
-            summary.add(Element('span', f'{failed} failed', {'class': 'tile failed active'}))
-        if skipped > 0:
-            summary.add(Element('span', f'{skipped} skipped', {'class': 'tile skipped active'}))
+    def _individual_test_table_container(self, test: Test, execution: Execution) -> Fragment:
+        if len(execution.steps) == 0:
+            placeholder = self._individual_test_table_placeholder_no_steps(test)
 
-        div.add(summary)
+            return Fragment(f'<div class="individual-test-execution-table-container">\n{placeholder.html}</div>\n',
+                            1 + placeholder.elements)
 
-        return div
+        rows: list[str] = []
+        count = len(execution.steps)
 
-    def _individual_test_table_container(self, test: Test, execution: Execution) -> Element:
-        div = Element('div', '', {'class': 'individual-test-execution-table-container'})
+        for i, step in enumerate(execution.steps, 1):
+            rows.append(f'<tr class="{escape_attribute(step.outcome)}">\n<td>{i}/{count}</td>\n'
+                        f'{cell("td", escape(step.description))}{cell("td", escape(step.outcome))}</tr>\n')
 
-        if len(execution.steps) > 0:
-            table = Element('table', '', {'class': 'test-table individual-test-table'})
-            thead = Element('thead', '')
+        footer = f'Test on {escape(execution.device)} {escape(execution.outcome)} in {execution.duration:.2f}s'
 
-            thead_tr = Element('tr', '')
+        html = (f'<div class="individual-test-execution-table-container">\n'
+                f'<table class="test-table individual-test-table">\n'
+                f'{self.step_header.html}'
+                f'<tbody>\n{"".join(rows)}</tbody>\n'
+                f'<tfoot class="{escape_attribute(execution.outcome)}">\n<tr>\n<td colspan="3">{footer}</td>\n</tr>\n</tfoot>\n'
+                f'</table>\n'
+                f'</div>\n')
 
-            thead_tr.add(Element('th', 'Step'))
-            thead_tr.add(Element('th', 'Description', {'width': '100%'}))
-            thead_tr.add(Element('th', 'Status'))
-
-            thead.add(thead_tr)
-
-            tbody = Element('tbody', '')
+        return Fragment(html, 6 + self.step_header.elements + 4 * count)
 
-            i = 1
+    def _individual_test_table_placeholder_no_steps(self, test: Test) -> Fragment:
+        return Fragment(cell('div', 'No individual steps found', ' class="no-steps"'), 1)
 
-            for step in execution.steps:
-                tbody_tr = Element('tr', '', {'class': f'{step.outcome}'})
-                tbody_tr.add(Element('td', f'{i}/{len(execution.steps)}'))
-                tbody_tr.add(Element('td', step.description))
-                tbody_tr.add(Element('td', step.outcome))
-                tbody.add(tbody_tr)
+    def _step_header(self) -> Fragment:
+        thead = Element('thead', '')
 
-                i += 1
+        thead_tr = Element('tr', '')
 
-            tfoot = Element('tfoot', '', {'class': execution.outcome})
+        thead_tr.add(Element('th', 'Step'))
+        thead_tr.add(Element('th', 'Description', {'width': '100%'}))
+        thead_tr.add(Element('th', 'Status'))
 
-            tfoot_tr = Element('tr', '')
-
-            footer = f'Test on {execution.device} {execution.outcome} in {execution.duration:.2f}s'
-            tfoot_tr.add(Element('td', footer, {'colspan': '3'}))
-
-            tfoot.add(tfoot_tr)
-
-            table.add(thead)
-            table.add(tbody)
-            table.add(tfoot)
-
-            div.add(table)
-        else:
-            div.add(self._individual_test_table_placeholder_no_steps(test))
-
-        return div
+        thead.add(thead_tr)
 
-    def _individual_test_table_placeholder_no_steps(self, test: Test) -> Element:
-        return Element('div', 'No individual steps found', {'class': 'no-steps'})
+        return Serializer().compile(thead)
@@ -8,12 +8,88 @@
 @Version  :  1.0
 '''
 
+import glob
 import os
+import re
 
+from concurrent.futures import ProcessPoolExecutor
+
+from internal.builder import Builder, Element
 from internal.generator import Generator
 
 
 class StaticGenerator(Generator):
-    def report(self, html: str, output_folder: str) -> bool:
-        file_path = os.path.join(output_folder, 'report.html')
-        return self._write_report(html, file_path)
+    def report(self, document: Element, output_folder: str, pages: list[Builder.Page] | None = None) -> bool:
+        file_path = os.path.join(output_folder, Builder.page_filename(0))
+
+        if pages is None or len(pages) == 0:
+            return self._write_report(document, file_path) and self._remove_pages(output_folder, [])
+
+        if self.jobs <= 1:
+            success = self._write_report(document, file_path)
+
+            for page in pages:
+                success = self._write_report(page.build(), os.path.join(output_folder, page.filename())) and success
+
+            return success and self._remove_pages(output_folder, pages)
+
+        # The pages are built and written in parallel, while the main document is written here. The generator and the
+        # pages are handed to every worker once by the initializer (inherited when forked, pickled once per worker
+        # otherwise), only the indices of the pages are sent for each page.
+        with ProcessPoolExecutor(max_workers=min(self.jobs, len(pages)), initializer=init_worker,
+                                 initargs=(self, pages, output_folder)) as executor:
+            futures = [executor.submit(write_page, index) for index in range(len(pages))]
+
+            success = self._write_report(document, file_path)
+
+            for future in futures:
+                page_success, elements, written = future.result()
+
+                success = page_success and success
+                self.elements += elements
+                self.bytes += written
+
+        return success and self._remove_pages(output_folder, pages)
+
+    def _remove_pages(self, output_folder: str, pages: list[Builder.Page]) -> bool:
+        # Pages of a previous report, with more tests, a smaller page size or another output compression
+        filenames: list[str] = []
+
+        for page in pages:
+            filenames += self._output_paths(os.path.join(output_folder, page.filename()))
+
+        try:
+            for filename in glob.glob(os.path.join(output_folder, 'report-*.html*')):
+                if filename not in filenames and re.fullmatch(r'report-\d+\.html(\.gz)?', os.path.basename(filename)):
+                    os.remove(filename)
+        except OSError as e:
+            self.logger.error(f'failed to remove the pages of a previous report: {e}')
+            return False
+
+        return True
+
+    def _write_page(self, page: Builder.Page, output_folder: str) -> tuple[bool, int, int]:
+        # Runs in a worker process, the statistics are returned to be added to those of the main process
+        elements = self.elements
+        written = self.bytes
+
+        success = self._write_report(page.build(), os.path.join(output_folder, page.filename()))
+
+        return success, self.elements - elements, self.bytes - written
+
+
+# Generator, pages and output folder of the report written by a worker process, set by the initializer of the pool
+worker: tuple[StaticGenerator, list[Builder.Page], str] | None = None
+
+
+def init_worker(generator: StaticGenerator, pages: list[Builder.Page], output_folder: str) -> None:
+    global worker
+    worker = (generator, pages, output_folder)
+
+
+def write_page(index: int) -> tuple[bool, int, int]:
+    # Worker of the write processes, writes a page of the report of the initializer
+    assert worker is not None
+    generator, pages, output_folder = worker
+
+    return generator._write_page(pages[index], output_folder)
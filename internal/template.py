@@ -0,0 +1,47 @@
+# SPDX-License-Identifier: MIT
+
+'''
+@File     :  template.py
+@Desc     :  Template helpers, to render the repeated fragments of the reports without building elements
+@Authors  :  Nick Vissers <nick.vissers@openpixelsystems.org>
+@Date     :  18/10/2026
+@Version  :  1.0
+'''
+
+import functools
+import html
+
+
+class Fragment:
+    __slots__ = ('html', 'elements')
+
+    html: str
+    elements: int
+
+    def __init__(self, html: str, elements: int) -> None:
+        self.html = html
+        self.elements = elements  # Number of elements the HTML stands for, for the statistics of the serializer
+
+
+# Memoized, the same device names, outcomes and step descriptions are escaped for every row of a report
+@functools.lru_cache(maxsize=16 * 1024)
+def escape(value: str) -> str:
+    return html.escape(value, quote=False)
+
+
+@functools.lru_cache(maxsize=16 * 1024)
+def escape_attribute(value: str) -> str:
+    return html.escape(value, quote=True)
+
+
+def attributes(args: dict[str, str]) -> str:
+    return ''.join([f' {arg}="{escape_attribute(str(value))}"' for arg, value in args.items()])
+
+
+def cell(name: str, value: str, args: str = '') -> str:
+    # Same output as a leaf element, which is written as an empty tag without a value. The value is HTML, user
+    # provided strings are escaped by the caller.
+    if value == '':
+        return f'<{name}{args}/>\n'
+
+    return f'<{name}{args}>{value}</{name}>\n'
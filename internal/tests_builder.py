@@ -0,0 +1,151 @@
+# SPDX-License-Identifier: MIT
+
+'''
+@File     :  tests_builder.py
+@Desc     :  TestsBuilder class, to build the tests from Python objects instead of JSON files
+@Authors  :  Nick Vissers <nick.vissers@openpixelsystems.org>
+@Date     :  18/10/2026
+@Version  :  1.0
+'''
+
+import re
+
+from typing import Any, Iterable
+
+from internal.logger import Logger
+from internal.parser import Execution, Step, Test, Tests, intern_execution, merge_tests
+
+
+class TestsBuilder:
+    include_self_tests: bool
+    tests: list[Test]
+    logger: Logger
+
+    def __init__(self, include_self_tests: bool, logger: Logger) -> None:
+        self.logger = logger
+        self.include_self_tests = include_self_tests
+        self.tests = []  # One test per execution, merged like the tests of a single input file
+
+    def add(self, name: str, description: str, device: str, outcome: str, duration: float = 0.0,
+            steps: Iterable[Any] = (), node_id: str = '', self_test: bool = False) -> bool:
+        # One execution of a test, executions of the same test on other devices are added with the same name
+        test = Test()
+
+        test.name = name
+        test.node_id = re.sub('\\[(.*)]', '', node_id) if node_id != '' else name
+        test.description = description
+        test.self_test = self_test
+
+        if not self._verify_fields(test):
+            return False
+
+        # Skip self tests if not requested
+        if test.self_test and not self.include_self_tests:
+            return True
+
+        execution = Execution()
+
+        execution.device = device
+        execution.outcome = outcome
+        execution.duration = duration
+
+        for step in steps:
+            s = Step()
+
+            s.id = len(execution.steps)
+            s.description = self._field(step, 'description', 0)
+            s.outcome = self._field(step, 'outcome', 1)
+
+            execution.steps.append(s)
+
+        if not self._verify_execution(execution, test.node_id):
+            return False
+
+        intern_execution(execution)
+
+        test.executions.append(execution)
+        self.tests.append(test)
+
+        return True
+
+    def add_record(self, record: Any) -> bool:
+        # Records are mappings or objects with the arguments of add() as keys or attributes
+        fields: dict[str, Any] = {}
+
+        for key in ['name', 'description', 'device', 'outcome', 'duration', 'steps', 'node_id', 'self_test']:
+            value = record.get(key) if isinstance(record, dict) else getattr(record, key, None)
+            if value is not None:
+                fields[key] = value
+
+        for key in ['name', 'description', 'device', 'outcome']:
+            if key not in fields:
+                self.logger.error(f'no {key} found for test: {fields.get("name", record)}')
+                return False
+
+        return self.add(**fields)
+
+    def extend(self, records: Iterable[Any]) -> bool:
+        for record in records:
+            if not self.add_record(record):
+                return False
+
+        return True
+
+    def build(self) -> Tests | None:
+        # Without tests the reports show that no tests were found, like a run in which every test is filtered out
+        tests = Tests()
+
+        if merge_tests(tests, self.tests, 0, self.logger) < 0:
+            return None
+
+        tests.aggregate()
+
+        self.logger.debug(tests)  # type: ignore
+
+        return tests
+
+    def _field(self, step: Any, key: str, index: int) -> Any:
+        # Steps are (description, outcome) tuples, mappings or objects
+        if isinstance(step, (tuple, list)):
+            return step[index] if index < len(step) else None
+
+        if isinstance(step, dict):
+            return step.get(key)
+
+        return getattr(step, key, None)
+
+    def _verify_fields(self, test: Test) -> bool:
+        for key, value in [('name', test.name), ('node id', test.node_id), ('description', test.description)]:
+            if type(value) is not str or (key != 'description' and value == ''):
+                self.logger.error(f'invalid {key} for test {test.name}: {value}')
+                return False
+
+        if type(test.self_test) is not bool:
+            self.logger.error(f'invalid self test for test {test.name}: {test.self_test}')
+            return False
+
+        if test.name not in test.node_id:
+            self.logger.error(f'name {test.name} not found in node id {test.node_id}')
+            return False
+
+        return True
+
+    def _verify_execution(self, execution: Execution, node_id: str) -> bool:
+        if type(execution.device) is not str or execution.device == '':
+            self.logger.error(f'invalid device for test {node_id}: {execution.device}')
+            return False
+
+        if type(execution.outcome) is not str or execution.outcome == '':
+            self.logger.error(f'invalid outcome for test {node_id}: {execution.outcome}')
+            return False
+
+        if type(execution.duration) not in [int, float]:
+            self.logger.error(f'invalid duration for test {node_id}: {execution.duration}')
+            return False
+
+        for step in execution.steps:
+            if type(step.description) is not str or type(step.outcome) is not str:
+                self.logger.error(f'invalid step-{step.id} for test {node_id}: {step.description}, {step.outcome}')
+                return False
+
+        return True
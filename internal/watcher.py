@@ -0,0 +1,53 @@
+# SPDX-License-Identifier: MIT
+
+'''
+@File     :  watcher.py
+@Desc     :  Watcher class, to regenerate the reports when the input files change
+@Authors  :  Nick Vissers <nick.vissers@openpixelsystems.org>
+@Date     :  18/10/2026
+@Version  :  1.0
+'''
+
+import time
+
+from typing import Callable
+
+from internal.logger import Logger
+
+
+class Watcher:
+    interval: float
+    debounce: float
+    logger: Logger
+
+    def __init__(self, interval: float, debounce: float, logger: Logger) -> None:
+        self.interval = interval
+        self.debounce = debounce
+        self.logger = logger
+
+    def watch(self, snapshot: Callable[[], dict], update: Callable[[], None], initial: dict | None = None) -> None:
+        self.logger.info('watching for changes, press Ctrl+C to stop')
+
+        # The state of the files when they were read, files which changed while the first report was generated are
+        # picked up by the first check
+        previous = initial if initial is not None else snapshot()
+        last_change = None
+
+        try:
+            while True:
+                time.sleep(self.interval)
+
+                current = snapshot()
+
+                # Keep waiting while files are still being written, only update once they are quiet
+                if current != previous:
+                    if last_change is None:
+                        self.logger.debug('change detected')
+
+                    previous = current
+                    last_change = time.monotonic()
+                elif last_change is not None and time.monotonic() - last_change >= self.debounce:
+                    last_change = None
+                    update()
+        except KeyboardInterrupt:
+            self.logger.info('stopped watching')
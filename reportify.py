@@ -0,0 +1,97 @@
+# SPDX-License-Identifier: MIT
+
+'''
+@File     :  reportify.py
+@Desc     :  Library API, to generate QA test reports from tests held in memory
+@Authors  :  Nick Vissers <nick.vissers@openpixelsystems.org>
+@Date     :  18/10/2026
+@Version  :  1.0
+'''
+
+import os
+
+from typing import Any, Iterable
+
+from internal.builder import Builder
+from internal.collector import Collector
+from internal.comparison import Comparison
+from internal.factories.builder_factory import BuilderFactory
+from internal.factories.generator_factory import GeneratorFactory
+from internal.logger import Logger
+from internal.parser import Execution, Step, Test, Tests
+from internal.tests_builder import TestsBuilder
+from internal.internal_types import OutputCompression, ReportMode
+
+__all__ = ['build_report', 'build_tests', 'Execution', 'Logger', 'OutputCompression', 'ReportMode', 'Step', 'Test', 'Tests', 'TestsBuilder']
+
+
+def build_tests(records: Iterable[Any], include_self_tests: bool = False, logger: Logger | None = None) -> Tests | None:
+    builder = TestsBuilder(include_self_tests, logger or Logger(False))
+
+    if not builder.extend(records):
+        return None
+
+    return builder.build()
+
+
+def build_report(tests: Tests | Iterable[Any], title: str, mode: ReportMode | str, output: str, tests_per_page: int = 0,
+                 compress_data: bool = False, logger: Logger | None = None, baseline: Tests | Iterable[Any] | None = None,
+                 duration_threshold: float = 0.2, compress_output: OutputCompression | str = OutputCompression.NONE,
+                 compression_level: int = 9, jobs: int = 1, include_self_tests: bool = False) -> bool:
+    logger = logger or Logger(False)
+
+    if not isinstance(tests, Tests):
+        built = build_tests(tests, include_self_tests, logger)
+        if built is None:
+            return False
+
+        tests = built
+
+    if baseline is not None and not isinstance(baseline, Tests):
+        baseline = build_tests(baseline, include_self_tests, logger)
+        if baseline is None:
+            return False
+
+    if isinstance(mode, str):
+        if mode.upper() not in ReportMode.__members__:
+            logger.error(f'unknown report mode: {mode}')
+            return False
+
+        mode = ReportMode[mode.upper()]
+
+    if isinstance(compress_output, str):
+        if compress_output.upper() not in OutputCompression.__members__:
+            logger.error(f'unknown output compression: {compress_output}')
+            return False
+
+        compress_output = OutputCompression[compress_output.upper()]
+
+    if (mode == ReportMode.DIFF) != (baseline is not None):
+        logger.error('a baseline is required for diff reports, and only used by them')
+        return False
+
+    collector = Collector(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'assets'), logger)
+
+    styles = collector.css_filenames(mode)
+    scripts = collector.js_filenames(mode)
+
+    builder = BuilderFactory.create(mode, styles, scripts, logger)
+    generator = GeneratorFactory.create(mode, styles, scripts, logger, compress_output, compression_level, jobs)
+
+    comparison = None
+    test_data = ''  # Only the dynamic report embeds the test data
+
+    if baseline is not None:
+        comparison = Comparison(duration_threshold).compare(baseline, tests)
+    elif mode == ReportMode.DYNAMIC:
+        test_data = generator.test_data(tests, compress_data)
+        if test_data == '':
+            return False
+
+    data = Builder.Data(tests, test_data, tests_per_page, compress_data, comparison=comparison)
+    document = builder.build(title, data)
+    pages = builder.pages(title, data)
+
+    os.makedirs(output, exist_ok=True)
+
+    return generator.report(document, output, pages)
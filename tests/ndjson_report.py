@@ -0,0 +1,87 @@
+# SPDX-License-Identifier: MIT
+# type: ignore
+
+import json
+import os
+
+import pytest
+
+
+# Appends one record per finished test to an NDJSON file, so a report can be generated while the tests are still
+# running. The records have the fields of the pytest-json-report tests which are read by the report generator.
+#
+# Usage: python3 -m pytest -p tests.ndjson_report --ndjson-report results.ndjson ./tests/report_test.py
+#
+# The metadata is read from item._json_report_extra, where the json_metadata fixture of pytest-json-report (1.5) stores
+# it. The attribute is private to pytest-json-report, it has no public way to read the metadata of a running test.
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup('ndjsonreport', 'reporting test results as NDJSON while the tests run')
+    group.addoption('--ndjson-report', default=None, metavar='PATH', help='append one JSON record per finished test to PATH')
+
+
+def pytest_configure(config):
+    path = config.getoption('ndjson_report')
+
+    if path is not None and not hasattr(config, 'workerinput'):
+        config._ndjson_report = NDJSONReport(config, path)
+        config.pluginmanager.register(config._ndjson_report)
+
+
+def pytest_unconfigure(config):
+    report = getattr(config, '_ndjson_report', None)
+
+    if report is not None:
+        report.close()
+        config.pluginmanager.unregister(report)
+        del config._ndjson_report
+
+
+class NDJSONReport:
+    def __init__(self, config, path: str) -> None:
+        self._config = config
+        self._tests = {}
+
+        # The results of a previous run are replaced by a new file instead of being truncated, a report which is still
+        # reading them (e.g., in watch mode) reads the old file to its end, and starts over on the new file
+        self._file = open(f'{path}.tmp', 'w')
+        os.replace(f'{path}.tmp', path)
+
+    def close(self) -> None:
+        self._file.close()
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_protocol(self, item, nextitem):
+        # The json_metadata fixture of pytest-json-report stores the metadata here, pytest-json-report only creates it with
+        # --json-report
+        if not hasattr(item, '_json_report_extra'):
+            item._json_report_extra = {}
+
+        yield
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_makereport(self, item, call):
+        report = (yield).get_result()
+
+        test = self._tests.setdefault(report.nodeid, {'nodeid': report.nodeid, 'outcome': 'passed'})
+
+        # Same outcome as pytest-json-report, the first stage which did not pass decides
+        outcome = self._config.hook.pytest_report_teststatus(report=report, config=self._config)[0]
+        if outcome not in ['passed', ''] and test['outcome'] == 'passed':
+            test['outcome'] = outcome
+
+        if report.when == 'call':
+            test['call'] = {'duration': report.duration, 'outcome': report.outcome}
+
+        if report.when == 'teardown':
+            metadata = getattr(item, '_json_report_extra', {}).get('metadata')
+            if metadata:
+                test['metadata'] = metadata
+
+            self._write(self._tests.pop(report.nodeid))
+
+    def _write(self, test: dict) -> None:
+        # Every record is flushed, a crash never loses the tests which already finished
+        self._file.write(json.dumps(test, default=str) + '\n')
+        self._file.flush()
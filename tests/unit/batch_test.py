@@ -0,0 +1,136 @@
+# SPDX-License-Identifier: MIT
+# type: ignore
+
+import json
+import os
+
+import pytest
+
+from internal.batch import Batch, Manifest
+from internal.generator import Generator
+from internal.logger import Logger
+
+ASSETS = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', 'assets'))
+
+
+def manifest(tmp_path, data) -> Manifest:
+    path = tmp_path / 'manifest.json'
+    path.write_text(json.dumps(data))
+
+    return Manifest(str(path), Logger(False))
+
+
+def test_defaults_and_relative_paths(tmp_path):
+    m = manifest(tmp_path, {
+        'defaults': {'self_test': True, 'tests_per_page': 10},
+        'reports': [
+            {'title': 'A', 'input': 'results/a,results/*.json', 'output': 'reports/a'},
+            {'title': 'B', 'input': ['results/b'], 'output': 'reports/b', 'dynamic': True, 'tests_per_page': 0,
+             'tests': ['test_uart_*'], 'devices': ['board-a']},
+        ]
+    })
+
+    assert m.load()
+
+    a, b = m.reports
+
+    assert a.input == f'{tmp_path}/results/a,{tmp_path}/results/*.json'
+    assert a.output == f'{tmp_path}/reports/a'
+    assert (a.dynamic, a.self_test, a.tests_per_page, a.tests, a.devices) == (False, True, 10, [], [])
+    assert (b.dynamic, b.self_test, b.tests_per_page, b.tests, b.devices) == (True, True, 0, ['test_uart_*'], ['board-a'])
+
+
+@pytest.mark.parametrize('data', [
+    [],
+    {'reports': {}},
+    {'defaults': [], 'reports': []},
+    {'reports': ['report']},
+    {'reports': [{'title': 'A', 'input': 'a', 'output': 'a', 'colour': 'red'}]},
+    {'reports': [{'title': 'A', 'input': 'a', 'output': 'a', 'dynamic': 'yes'}]},
+    {'reports': [{'title': 'A', 'input': 'a', 'output': 'a', 'tests': 'test_a'}]},
+    {'reports': [{'title': 'A', 'input': [1], 'output': 'a'}]},
+    {'reports': [{'title': 'A', 'input': 'a', 'output': 'a', 'tests_per_page': -1}]},
+    {'reports': [{'title': 'A', 'input': 'a'}]},
+    {'reports': [{'title': '', 'input': 'a', 'output': 'a'}]},
+])
+def test_invalid_manifests(tmp_path, data):
+    assert not manifest(tmp_path, data).load()
+
+
+def test_unreadable_manifests(tmp_path):
+    (tmp_path / 'manifest.json').write_text('{"reports": [')
+
+    assert not Manifest(str(tmp_path / 'manifest.json'), Logger(False)).load()
+    assert not Manifest(str(tmp_path / 'missing.json'), Logger(False)).load()
+
+
+def test_yaml_manifest(tmp_path):
+    pytest.importorskip('yaml')
+
+    (tmp_path / 'manifest.yaml').write_text('reports:\n  - title: A\n    input: [results]\n    output: reports/a\n')
+    m = Manifest(str(tmp_path / 'manifest.yaml'), Logger(False))
+
+    assert m.load()
+    assert m.reports[0].input == f'{tmp_path}/results'
+
+
+def results(tmp_path) -> None:
+    (tmp_path / 'results').mkdir()
+
+    for device in ['board-a', 'board-b']:
+        tests = [{
+            'nodeid': f'tests/test.py::{name}', 'outcome': 'passed', 'call': {'duration': 1.0},
+            'metadata': {'device': device, 'description': f'Description of {name}', 'active_test': name, 'steps': 0,
+                         'self_test': name == 'test_self'}
+        } for name in ['test_uart_a', 'test_uart_b', 'test_i2c', 'test_self']]
+
+        (tmp_path / 'results' / f'{device}.json').write_text(json.dumps({'tests': tests}))
+
+
+@pytest.mark.parametrize('jobs', [1, 2])
+def test_batch(tmp_path, jobs):
+    results(tmp_path)
+
+    m = manifest(tmp_path, {'reports': [
+        {'title': 'All', 'input': 'results', 'output': 'reports/all', 'self_test': True},
+        {'title': 'UART', 'input': 'results/*.json', 'output': 'reports/uart', 'tests': ['test_uart_*'],
+         'devices': ['board-b']},
+        {'title': 'Dynamic', 'input': 'results/board-a.json', 'output': 'reports/dynamic', 'dynamic': True},
+    ]})
+
+    assert m.load()
+    assert Batch(m, ASSETS, jobs, None, Logger(False)).run()
+
+    everything = (tmp_path / 'reports' / 'all' / 'report.html').read_text()
+    uart = (tmp_path / 'reports' / 'uart' / 'report.html').read_text()
+
+    assert all([f'Description of {name}' in everything for name in ['test_uart_a', 'test_uart_b', 'test_i2c', 'test_self']])
+    assert 'Description of test_uart_a' in uart and 'Description of test_uart_b' in uart
+    assert 'test_i2c' not in uart and 'test_self' not in uart
+    assert 'board-b' in uart and 'board-a' not in uart
+    assert os.path.exists(tmp_path / 'reports' / 'dynamic' / 'report' / 'report.html')
+
+
+def test_static_reports_have_no_test_data(tmp_path, monkeypatch):
+    results(tmp_path)
+
+    def test_data(generator, tests, compress=False):
+        raise AssertionError('test data of a static report')
+
+    # Only the dynamic generator overrides it
+    monkeypatch.setattr(Generator, 'test_data', test_data)
+
+    m = manifest(tmp_path, {'reports': [
+        {'title': 'Static', 'input': 'results', 'output': 'reports/static'},
+        {'title': 'Dynamic', 'input': 'results', 'output': 'reports/dynamic', 'dynamic': True},
+    ]})
+
+    assert m.load()
+    assert Batch(m, ASSETS, 1, None, Logger(False)).run()
+
+
+def test_batch_without_inputs(tmp_path):
+    m = manifest(tmp_path, {'reports': [{'title': 'All', 'input': 'results', 'output': 'reports/all'}]})
+
+    assert m.load()
+    assert not Batch(m, ASSETS, 1, None, Logger(False)).run()
@@ -0,0 +1,50 @@
+# SPDX-License-Identifier: MIT
+# type: ignore
+
+import os
+import sys
+
+from internal.logger import Logger
+from internal.parser import Parser
+
+# The benchmark scripts import each other from their own folder
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', 'benchmarks')))
+
+from benchmark import compare  # noqa: E402
+from synthetic import Synthetic  # noqa: E402
+
+
+def test_synthetic_reports_parse(tmp_path):
+    filenames = Synthetic(50, devices=3, steps=4, self_test_ratio=0.2).generate(str(tmp_path))
+
+    assert len(filenames) == 3
+
+    all_tests = Parser(str(tmp_path), True, Logger(False)).parse()
+    tests = Parser(str(tmp_path), False, Logger(False)).parse()
+
+    assert len(all_tests.tests) == 50
+    assert 0 < len(tests.tests) < 50
+    assert all([test.get_devices() == ['device 0', 'device 1', 'device 2'] for test in tests.tests.values()])
+    assert all([len(execution.steps) == 4 for test in tests.tests.values() for execution in test.executions])
+
+
+def test_synthetic_reports_are_reproducible(tmp_path):
+    first = [open(filename).read() for filename in Synthetic(20, seed=1).generate(str(tmp_path / 'first'))]
+    second = [open(filename).read() for filename in Synthetic(20, seed=1).generate(str(tmp_path / 'second'))]
+    other = [open(filename).read() for filename in Synthetic(20, seed=2).generate(str(tmp_path / 'other'))]
+
+    assert first == second
+    assert first != other
+
+
+def test_compare():
+    baseline = {'static-1000': {'parse': {'time': 1.0, 'peak': 10.0}, 'build': {'time': 0.0}}}
+
+    def passes(parse: dict) -> bool:
+        return compare({'static-1000': {'parse': parse, 'build': {'time': 5.0}}, 'dynamic-1000': {}}, baseline, 0.1,
+                       Logger(False))
+
+    assert passes({'time': 1.05, 'peak': 10.0})
+    assert passes({'time': 0.5, 'peak': 5.0})
+    assert not passes({'time': 1.2, 'peak': 10.0})
+    assert not passes({'time': 1.0, 'peak': 12.0})
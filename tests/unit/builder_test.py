@@ -0,0 +1,170 @@
+# SPDX-License-Identifier: MIT
+# type: ignore
+
+import io
+import sys
+
+from internal.builder import Attributes, Element, Serializer
+from internal.logger import Logger
+from internal.static.static_generator import StaticGenerator
+from internal.template import Fragment, attributes, cell
+
+
+def recursive(element: Element) -> str:
+    # The recursive concatenation the serializer replaces
+    content = f'<{element.name}'
+
+    for arg in element.args:
+        content += f' {arg}="{element.args[arg]}"'
+
+    if element.value == '':
+        if len(element.get()) == 0:
+            return content + '/>\n'
+
+        content += '>\n'
+
+        for e in element.get():
+            content += recursive(e)
+    else:
+        content += f'>{element.value}'
+
+    return content + f'</{element.name}>\n'
+
+
+def document() -> Element:
+    html = Element('html')
+    body = Element('body', args={'class': 'report'})
+
+    for i in range(50):
+        row = Element('tr', args={'id': f'row-{i}', 'class': 'row'})
+        row.add(Element('td', f'cell {i}'))
+        row.add(Element('td'))
+        body.add(row)
+
+    html.add(Element('head'))
+    html.add(body)
+
+    return html
+
+
+def serialize(element: Element, buffer_size: int = 64 * 1024) -> tuple[str, int]:
+    buffer = io.StringIO()
+    written = Serializer(buffer_size).write(element, buffer)
+
+    return buffer.getvalue(), written
+
+
+def test_same_as_recursive_concatenation():
+    text, written = serialize(document())
+
+    assert text == recursive(document())
+    assert written == len(text)
+
+
+def test_flushes_in_blocks():
+    text, written = serialize(document(), buffer_size=16)
+
+    assert text == recursive(document())
+    assert written == len(text)
+
+
+def test_deep_tree():
+    # Deeper than the recursion limit
+    root = Element('div')
+    element = root
+
+    for _ in range(sys.getrecursionlimit() * 2):
+        child = Element('div')
+        element.add(child)
+        element = child
+
+    text, _ = serialize(root)
+
+    assert text.count('<div') == sys.getrecursionlimit() * 2 + 1
+    assert text.endswith('</div>\n')
+
+
+def test_generator_writes_the_document(tmp_path):
+    assert StaticGenerator([], [], Logger(False)).report(document(), str(tmp_path))
+    assert (tmp_path / 'report.html').read_text() == recursive(document())
+
+
+def test_cells_are_the_same_as_elements():
+    args = {'id': 'row-1', 'class': 'row'}
+
+    assert cell('td', 'value', attributes(args)) == serialize(Element('td', 'value', args))[0]
+    assert cell('td', '', attributes(args)) == serialize(Element('td', '', args))[0]
+    assert cell('td', 'value') == serialize(Element('td', 'value'))[0]
+
+
+def test_fragments_are_counted_as_their_elements():
+    serializer = Serializer(64 * 1024)
+
+    row = serializer.compile(document().get()[1].get()[0])
+
+    assert row.html == recursive(document().get()[1].get()[0])
+    assert row.elements == 3
+
+    body = Element('body')
+    body.add(row)
+    body.add(Fragment(cell('p', 'text'), 1))
+
+    buffer = io.StringIO()
+    serializer = Serializer(64 * 1024)
+    serializer.write(body, buffer)
+
+    assert buffer.getvalue() == '<body>\n' + row.html + '<p>text</p>\n</body>\n'
+    assert serializer.elements == 5
+
+
+def test_elements_share_attribute_maps():
+    first = Element('tr', args={'class': 'row'})
+    second = Element('tr', args={'class': 'row'})
+
+    assert first.args is second.args
+    assert first.args is not Element('tr', args={'class': 'other'}).args
+    assert dict(first.args) == {'class': 'row'}
+    assert first.args.html == ' class="row"'
+    assert Attributes.shared(first.args) is first.args
+
+    # Still a Mapping
+    assert first.args.get('class') == 'row'
+    assert first.args.get('id', 'none') == 'none'
+
+
+def test_unique_attribute_maps_are_not_kept():
+    for i in range(4096):
+        Element('div', args={'id': f'test-{i}'})
+
+    assert Attributes._intern.cache_info().currsize <= 1024
+
+
+def test_elements_are_slotted():
+    element = Element('td', 'value')
+
+    assert not hasattr(element, '__dict__')
+    assert element.elements is None
+    assert element.get() == []
+
+    # No mutable default shared between the elements without attributes
+    assert len(Element('td').args) == 0
+
+
+def test_values_and_attributes_are_escaped():
+    element = Element('div', args={'title': '"quoted" & <tag>'})
+    element.add(Element('p', '<b>bold</b> & more'))
+    element.add(Element('p', '<b>bold</b>', raw=True))
+
+    assert serialize(element)[0] == ('<div title="&quot;quoted&quot; &amp; &lt;tag&gt;">\n'
+                                     '<p>&lt;b&gt;bold&lt;/b&gt; &amp; more</p>\n'
+                                     '<p><b>bold</b></p>\n'
+                                     '</div>\n')
+
+
+def test_non_string_values():
+    assert serialize(Element('td', 3))[0] == '<td>3</td>\n'
+
+
+def test_non_string_attributes():
+    assert serialize(Element('td', 'value', {'colspan': 3}))[0] == '<td colspan="3">value</td>\n'
+    assert attributes({'rowspan': 2, 'title': 'a "b"'}) == ' rowspan="2" title="a &quot;b&quot;"'
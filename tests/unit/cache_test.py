@@ -0,0 +1,124 @@
+# SPDX-License-Identifier: MIT
+# type: ignore
+
+import json
+import os
+
+from internal.cache import Cache
+from internal.logger import Logger
+from internal.parser import Parser
+
+
+def report(outcome: str, device: str = 'device') -> str:
+    test = {
+        'nodeid': 'tests/test_a.py::test_a',
+        'outcome': outcome,
+        'call': {'duration': 1.0},
+        'metadata': {'device': device, 'description': 'a', 'active_test': 'test_a', 'steps': 0, 'self_test': False}
+    }
+
+    return json.dumps({'tests': [test]})
+
+
+def write(path, text: str, mtime_ns: int | None = None) -> None:
+    path.write_text(text)
+
+    if mtime_ns is not None:
+        os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+def store(cache: Cache, path, records) -> None:
+    cache.store(str(path), 'variant', cache.header(str(path)), records)
+
+
+def test_unchanged_file_is_loaded(tmp_path):
+    cache = Cache(str(tmp_path / 'cache'), Logger(False))
+    path = tmp_path / 'report.json'
+    write(path, report('passed'))
+
+    assert cache.load(str(path), 'variant') is None
+
+    store(cache, path, ['records'])
+
+    assert cache.load(str(path), 'variant') == ['records']
+    assert cache.load(str(path), 'other variant') is None
+
+
+def test_changed_size_invalidates(tmp_path):
+    cache = Cache(str(tmp_path / 'cache'), Logger(False))
+    path = tmp_path / 'report.json'
+    write(path, report('passed'))
+    store(cache, path, ['records'])
+
+    write(path, report('passed', 'another device'))
+
+    assert cache.load(str(path), 'variant') is None
+
+
+def test_changed_content_of_same_size_invalidates(tmp_path):
+    cache = Cache(str(tmp_path / 'cache'), Logger(False))
+    path = tmp_path / 'report.json'
+    write(path, report('passed'), 1_000_000_000)
+    store(cache, path, ['records'])
+
+    # Same size, only the hash of the content tells the files apart
+    changed = report('passed').replace('passed', 'failed')
+    assert len(changed) == len(report('passed'))
+
+    write(path, changed, 2_000_000_000)
+
+    assert cache.load(str(path), 'variant') is None
+
+
+def test_touched_file_is_loaded(tmp_path):
+    cache = Cache(str(tmp_path / 'cache'), Logger(False))
+    path = tmp_path / 'report.json'
+    write(path, report('passed'), 1_000_000_000)
+    store(cache, path, ['records'])
+
+    write(path, report('passed'), 2_000_000_000)
+
+    assert cache.load(str(path), 'variant') == ['records']
+
+
+def test_parser_reads_changed_file(tmp_path):
+    cache = Cache(str(tmp_path / 'cache'), Logger(False))
+    path = tmp_path / 'report.json'
+    write(path, report('passed'))
+
+    assert Parser(str(path), False, Logger(False), 1, cache).parse().tests['test_a'].get_outcome() == 'passed'
+    assert len(os.listdir(tmp_path / 'cache')) == 1
+
+    write(path, report('failed', 'another device'))
+
+    assert Parser(str(path), False, Logger(False), 1, cache).parse().tests['test_a'].get_outcome() == 'failed'
+
+
+def test_cached_parse_matches_cold_parse(tmp_path):
+    cache = Cache(str(tmp_path / 'cache'), Logger(False))
+
+    for i, device in enumerate(['board-b', 'board-a']):
+        write(tmp_path / f'report-{i}.json', report('passed' if i == 0 else 'failed', device))
+
+    def outcomes(cache: Cache | None) -> list[tuple]:
+        tests = Parser(f'{tmp_path}/report-*.json', False, Logger(False), 1, cache).parse()
+        return [(test.id, test.name, [(e.id, e.device, e.outcome, e.duration) for e in test.executions])
+                for test in tests.tests.values()]
+
+    cold = outcomes(None)
+
+    assert outcomes(cache) == cold
+    assert len(os.listdir(tmp_path / 'cache')) == 2
+    assert outcomes(cache) == cold
+
+
+def test_file_changed_while_parsing_is_not_stored(tmp_path):
+    cache = Cache(str(tmp_path / 'cache'), Logger(False))
+    path = tmp_path / 'report.json'
+    write(path, report('passed'), 1_000_000_000)
+
+    header = cache.header(str(path))
+    write(path, report('failed'), 2_000_000_000)
+    cache.store(str(path), 'variant', header, ['stale records'])
+
+    assert cache.load(str(path), 'variant') is None
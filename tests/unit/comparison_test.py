@@ -0,0 +1,89 @@
+# SPDX-License-Identifier: MIT
+# type: ignore
+
+import os
+
+from internal.comparison import Comparison
+from reportify import build_report, build_tests
+
+
+def suite(executions: list[tuple[str, str, str, float]]):
+    return build_tests([{'name': name, 'description': '', 'device': device, 'outcome': outcome, 'duration': duration}
+                        for name, device, outcome, duration in executions])
+
+
+def changes(result: Comparison.Result) -> list[tuple[str, str, str]]:
+    return [(entry.kind, entry.name, entry.device) for entry in result.entries]
+
+
+def test_kinds_of_changes():
+    baseline = suite([('test_a', 'board-a', 'passed', 2.0), ('test_b', 'board-a', 'failed', 2.0),
+                      ('test_c', 'board-a', 'passed', 2.0), ('test_d', 'board-a', 'passed', 2.0),
+                      ('test_e', 'board-a', 'passed', 2.0)])
+    current = suite([('test_a', 'board-a', 'failed', 2.0), ('test_b', 'board-a', 'passed', 2.0),
+                     ('test_c', 'board-a', 'passed', 3.0), ('test_d', 'board-a', 'passed', 2.1),
+                     ('test_f', 'board-a', 'passed', 2.0)])
+
+    result = Comparison(0.2).compare(baseline, current)
+
+    assert changes(result) == [(Comparison.NEW_FAILURE, 'test_a', 'board-a'), (Comparison.FIXED, 'test_b', 'board-a'),
+                               (Comparison.SLOWER, 'test_c', 'board-a'), (Comparison.NEW, 'test_f', 'board-a'),
+                               (Comparison.REMOVED, 'test_e', 'board-a')]
+    assert result.compared == 4
+    assert result.counts == {Comparison.NEW_FAILURE: 1, Comparison.FIXED: 1, Comparison.SLOWER: 1, Comparison.NEW: 1,
+                             Comparison.REMOVED: 1}
+    assert result.entries[2].duration_change() == 0.5
+    assert result.entries[3].duration_change() is None
+
+
+def test_executions_are_matched_per_device():
+    baseline = suite([('test_a', 'board-a', 'passed', 2.0), ('test_a', 'board-b', 'passed', 2.0)])
+    current = suite([('test_a', 'board-a', 'passed', 2.0), ('test_a', 'board-c', 'passed', 2.0)])
+
+    result = Comparison(0.2).compare(baseline, current)
+
+    assert changes(result) == [(Comparison.NEW, 'test_a', 'board-c'), (Comparison.REMOVED, 'test_a', 'board-b')]
+
+
+def test_short_executions_are_not_slower():
+    baseline = suite([('test_a', 'board-a', 'passed', 0.1)])
+    current = suite([('test_a', 'board-a', 'passed', 0.5)])
+
+    assert Comparison(0.2).compare(baseline, current).entries == []
+    assert changes(Comparison(0.2, 0.0).compare(baseline, current)) == [(Comparison.SLOWER, 'test_a', 'board-a')]
+
+
+def test_diff_report(tmp_path):
+    baseline = [{'name': 'test_a', 'description': '', 'device': 'board-a', 'outcome': 'passed'}]
+    current = [{'name': 'test_a', 'description': '', 'device': 'board-a', 'outcome': 'failed'}]
+
+    assert build_report(current, 'Diff', 'diff', str(tmp_path), baseline=baseline)
+    assert os.listdir(tmp_path) == ['report.html']
+
+    with open(tmp_path / 'report.html') as file:
+        html = file.read()
+
+    assert 'Changes compared to the baseline' in html
+    assert '1 new failure' in html
+
+    assert build_report(current, 'Diff', 'diff', str(tmp_path / 'same'), baseline=current)
+
+    with open(tmp_path / 'same' / 'report.html') as file:
+        assert 'No changes compared to the baseline' in file.read()
+
+
+def test_repeated_executions_on_a_device():
+    baseline = suite([('test_a', 'board-a', 'passed', 2.0), ('test_a', 'board-a', 'failed', 2.0)])
+    current = suite([('test_a', 'board-a', 'passed', 2.0), ('test_a', 'board-a', 'passed', 2.0),
+                     ('test_a', 'board-a', 'passed', 2.0)])
+
+    result = Comparison(0.2).compare(baseline, current)
+
+    # Every execution is compared with the execution of the baseline of the same repetition
+    assert changes(result) == [(Comparison.FIXED, 'test_a', 'board-a'), (Comparison.NEW, 'test_a', 'board-a')]
+    assert result.compared == 2
+    assert result.entries[0].baseline is baseline.tests['test_a'].executions[1]
+    assert result.entries[1].current is current.tests['test_a'].executions[2]
+
+    # The same executions in the same order are no change, whichever outcome comes last
+    assert Comparison(0.2).compare(baseline, baseline).entries == []
@@ -0,0 +1,8 @@
+# SPDX-License-Identifier: MIT
+# type: ignore
+
+import os
+import sys
+
+# The unit tests import the internal package from the root of the repository
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
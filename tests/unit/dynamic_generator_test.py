@@ -0,0 +1,220 @@
+# SPDX-License-Identifier: MIT
+# type: ignore
+
+import json
+import os
+import re
+
+from internal.builder import Element
+from internal.dynamic.dynamic_generator import DynamicGenerator
+from internal.generator import Generator
+from internal.logger import Logger
+from reportify import build_report, build_tests
+
+
+RECORDS = [
+    {'name': 'test_uart_loopback', 'description': 'Loop the UART back', 'device': 'board-a', 'outcome': 'passed',
+     'steps': [('Open /dev/ttyS0', 'passed'), ('Write 0x55', 'passed')]},
+    {'name': 'test_uart_loopback', 'description': 'Loop the UART back', 'device': 'board-b', 'outcome': 'failed',
+     'steps': [('Open /dev/ttyS0', 'passed'), ('Write 0x55', 'failed')]},
+    {'name': 'test_i2c_scan', 'description': 'Scan the I²C bus', 'device': 'board-a', 'outcome': 'passed'},
+    {'name': 'test_i2c_scan', 'description': 'Scan the I²C bus', 'device': 'board-b', 'outcome': 'passed'},
+    {'name': 'test_spi_flash', 'description': 'Read the SPI flash', 'device': 'board-b', 'outcome': 'skipped'},
+    {'name': 'test_gpio', 'description': '', 'device': 'board-a', 'outcome': 'failed'},
+]
+
+
+def overview():
+    tests = build_tests(RECORDS)
+    generator = DynamicGenerator([], [], Logger(False))
+
+    return tests, generator, json.loads(generator.test_data(tests))
+
+
+def shards(tmp_path) -> list[str]:
+    return sorted(os.listdir(tmp_path / 'report' / 'data'))
+
+
+def test_overview_without_details():
+    tests, generator, data = overview()
+
+    assert len(data['tests']['name']) == len(tests.tests)
+    assert 'description' not in data['tests']
+    assert 'steps' not in data
+    assert data['shards'] == {'count': 1, 'tests': DynamicGenerator.TESTS_PER_SHARD}
+    assert len(generator.shards) == 1
+
+
+def test_shards_hold_the_details(tmp_path, monkeypatch):
+    monkeypatch.setattr(DynamicGenerator, 'TESTS_PER_SHARD', 3)
+
+    tests, generator, data = overview()
+
+    assert data['shards']['count'] == 2
+    assert generator.report(Element('html'), str(tmp_path))
+    assert shards(tmp_path) == ['shard-0.js', 'shard-1.js']
+
+    shard = (tmp_path / 'report' / 'data' / 'shard-0.js').read_text()
+    match = re.fullmatch(r'reportify_shard\(0, (.*)\);\n', shard, re.DOTALL)
+    details = json.loads(match.group(1))
+    strings = details['strings']
+
+    test_list = list(tests.tests.values())[:3]
+
+    assert [strings[i] for i in details['tests']['description']] == [test.description for test in test_list]
+    assert [strings[i] for i in details['tests']['node_id']] == [test.node_id for test in test_list]
+    assert [strings[i] for i in details['steps']['description']] == ['Open /dev/ttyS0', 'Write 0x55'] * 2
+    assert details['executions']['steps'] == [0, 2, 4, 4, 4, 4]
+
+
+def test_stale_shards_are_removed(tmp_path, monkeypatch):
+    monkeypatch.setattr(DynamicGenerator, 'TESTS_PER_SHARD', 1)
+
+    _, generator, _ = overview()
+    assert generator.report(Element('html'), str(tmp_path))
+    assert len(shards(tmp_path)) == 4
+
+    monkeypatch.setattr(DynamicGenerator, 'TESTS_PER_SHARD', 3)
+
+    _, generator, _ = overview()
+    assert generator.report(Element('html'), str(tmp_path))
+    assert shards(tmp_path) == ['shard-0.js', 'shard-1.js']
+
+
+def test_stale_shards_are_kept_until_the_report_is_replaced(tmp_path, monkeypatch):
+    monkeypatch.setattr(DynamicGenerator, 'TESTS_PER_SHARD', 1)
+
+    _, generator, _ = overview()
+    assert generator.report(Element('html'), str(tmp_path))
+
+    monkeypatch.setattr(DynamicGenerator, 'TESTS_PER_SHARD', 3)
+
+    _, generator, _ = overview()
+    write_report = generator._write_report
+
+    def failing_write(document, file_path):
+        # The previous report still references its shards
+        assert len(shards(tmp_path)) == 4
+        return False
+
+    generator._write_report = failing_write
+
+    assert not generator.report(Element('html'), str(tmp_path))
+    assert len(shards(tmp_path)) == 4
+
+    generator._write_report = write_report
+
+    assert generator.report(Element('html'), str(tmp_path))
+    assert shards(tmp_path) == ['shard-0.js', 'shard-1.js']
+
+
+def test_report_includes_the_virtual_table(tmp_path):
+    assert build_report(RECORDS, 'Nightly', 'dynamic', str(tmp_path))
+
+    html = (tmp_path / 'report' / 'report.html').read_text()
+
+    assert '<link rel="stylesheet" href="./css/virtual-table.css"/>' in html
+    assert '<script src="./js/builders/virtual-table.js"> </script>' in html
+    assert (tmp_path / 'report' / 'css' / 'virtual-table.css').is_file()
+    assert (tmp_path / 'report' / 'js' / 'builders' / 'virtual-table.js').is_file()
+
+
+def test_indexes_match_the_tests():
+    tests, _, data = overview()
+    test_list = list(tests.tests.values())
+    indexes = data['indexes']
+
+    def ids(condition) -> list[int]:
+        return [i for i, test in enumerate(test_list) if condition(test)]
+
+    for outcome, posting_list in indexes['outcome'].items():
+        assert posting_list == ids(lambda test: test.get_outcome() == outcome)
+
+    for outcome, posting_list in indexes['execution_outcome'].items():
+        assert posting_list == ids(lambda test: outcome in [execution.outcome for execution in test.executions])
+
+    for device, posting_list in indexes['device'].items():
+        assert posting_list == ids(lambda test: device in [execution.device for execution in test.executions])
+
+    assert sorted(indexes['device']) == ['board-a', 'board-b']
+    assert indexes['mixed'] == ids(lambda test: not test.has_same_outcome())
+    assert indexes['uniform'] == ids(lambda test: test.has_same_outcome())
+    assert sorted(indexes['mixed'] + indexes['uniform']) == list(range(len(test_list)))
+
+
+def test_indexes_only_in_the_dynamic_test_data():
+    tests = build_tests(RECORDS)
+
+    assert 'indexes' not in json.loads(Generator([], [], Logger(False)).test_data(tests))
+
+
+def search(data: dict, word: str) -> list[int]:
+    # Test indices of the tokens starting with the word, like the search of the report
+    search_index = data['search']
+    ids: set[int] = set()
+
+    for token, deltas in zip(search_index['tokens'], search_index['tests']):
+        if token.startswith(word):
+            id = 0
+
+            for delta in deltas:
+                id += delta
+                ids.add(id)
+
+    return sorted(ids)
+
+
+def test_search_index_tokens():
+    _, _, data = overview()
+    tokens = data['search']['tokens']
+
+    assert tokens == sorted(tokens)
+    assert len(tokens) == len(set(tokens))
+
+    # Lowercase words of letters and digits, underscores and punctuation split words
+    for word in ['test', 'uart', 'loopback', 'dev', 'ttys0', '0x55', 'i²c', 'spi', 'gpio']:
+        assert word in tokens
+
+    assert all([token == token.lower() and '_' not in token and '/' not in token for token in tokens])
+
+
+def test_search_index_words_with_marks():
+    records = [{'name': 'test_display', 'description': 'Show हिंदी and cafe\u0301 on the 𝒜 panel', 'device': 'board-a',
+                'outcome': 'passed'}]
+    data = json.loads(DynamicGenerator([], [], Logger(False)).test_data(build_tests(records)))
+    tokens = data['search']['tokens']
+
+    # Combining marks are part of the words, like \p{M} of the report, and the tokens are in code point order
+    assert 'हिंदी' in tokens
+    assert 'cafe\u0301' in tokens
+    assert tokens == sorted(tokens, key=lambda token: [ord(c) for c in token])
+    assert search(data, 'हिं') == [0]
+
+
+def test_search_index_matches_the_tests():
+    tests, _, data = overview()
+    test_list = list(tests.tests.values())
+
+    def texts(test) -> str:
+        steps = [step.description for execution in test.executions for step in execution.steps]
+        return ' '.join([test.name, test.node_id, test.description] + steps).lower()
+
+    assert search(data, 'uart') == [0]
+    assert search(data, 'ttys') == [0]
+    assert search(data, 'i²c') == [1]
+    assert search(data, 'test') == list(range(len(test_list)))
+    assert search(data, 'flash') == [i for i, test in enumerate(test_list) if 'flash' in texts(test)]
+    assert search(data, 'missing') == []
+
+
+def test_search_index_size_is_reported():
+    _, generator, data = overview()
+
+    assert generator.search_tokens == len(data['search']['tokens'])
+    assert generator.search_bytes == len(json.dumps(data['search'], separators=(',', ':')))
+
+
+def test_search_index_only_in_the_dynamic_test_data():
+    tests = build_tests(RECORDS)
+
+    assert 'search' not in json.loads(Generator([], [], Logger(False)).test_data(tests))
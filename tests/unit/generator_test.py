@@ -0,0 +1,198 @@
+# SPDX-License-Identifier: MIT
+# type: ignore
+
+import base64
+import gzip
+import json
+import os
+
+import pytest
+
+from internal import parser
+from internal.builder import Builder
+from internal.dynamic.dynamic_builder import DynamicBuilder
+from internal.generator import Generator
+from internal.internal_types import OutputCompression
+from internal.logger import Logger
+from reportify import build_report
+
+
+def suite() -> parser.Tests:
+    tests = parser.Tests()
+
+    for i, (description, outcomes) in enumerate([('UART </script> loopback', ['passed', 'failed']),
+                                                 ('I²C scan', ['passed', 'passed']), ('', ['skipped'])]):
+        test = parser.Test()
+
+        test.id = i
+        test.name = f'test_{i}'
+        test.node_id = f'tests/test.py::test_{i}'
+        test.description = description
+        test.self_test = i == 2
+
+        for j, outcome in enumerate(outcomes):
+            execution = parser.Execution()
+
+            execution.id = j
+            execution.device = f'board-{j}'
+            execution.outcome = outcome
+            execution.duration = i + j / 4
+
+            for k in range(j + 1):
+                step = parser.Step()
+
+                step.id = k
+                step.description = f'step {k}'
+                step.outcome = outcome
+
+                execution.steps.append(step)
+
+            test.executions.append(execution)
+
+        tests.add(test)
+
+    tests.aggregate()
+
+    return tests
+
+
+def expected(tests: parser.Tests) -> list[dict]:
+    return [{
+        'node_id': test.node_id, 'name': test.name, 'description': test.description, 'self_test': test.self_test,
+        'outcome': test.get_outcome(), 'mixed': not test.has_same_outcome(),
+        'executions': [{
+            'device': execution.device, 'outcome': execution.outcome, 'duration': execution.duration,
+            'steps': [(step.description, step.outcome) for step in execution.steps]
+        } for execution in test.executions]
+    } for test in tests.tests.values()]
+
+
+def decode(data: dict) -> list[dict]:
+    # Same decoding as parser.js: strings by index, children between the offsets of their parent
+    strings = data['strings']
+    tests, executions, steps = data['tests'], data['executions'], data['steps']
+
+    return [{
+        'node_id': strings[tests['node_id'][i]], 'name': strings[tests['name'][i]],
+        'description': strings[tests['description'][i]], 'self_test': bool(tests['self_test'][i]),
+        'outcome': strings[tests['outcome'][i]], 'mixed': bool(tests['mixed'][i]),
+        'executions': [{
+            'device': strings[executions['device'][j]], 'outcome': strings[executions['outcome'][j]],
+            'duration': executions['duration'][j],
+            'steps': [(strings[steps['description'][k]], strings[steps['outcome'][k]])
+                      for k in range(executions['steps'][j], executions['steps'][j + 1])]
+        } for j in range(tests['executions'][i], tests['executions'][i + 1])]
+    } for i in range(len(tests['name']))]
+
+
+def test_columnar_test_data():
+    tests = suite()
+    test_data = Generator([], [], Logger(False)).test_data(tests)
+
+    assert decode(json.loads(test_data)) == expected(tests)
+
+    # Every string is stored once, and the data can be embedded in a script element
+    assert len(json.loads(test_data)['strings']) == len(set(json.loads(test_data)['strings']))
+    assert '</' not in test_data
+    assert '\n' not in test_data
+
+
+def test_compressed_test_data():
+    tests = suite()
+    generator = Generator([], [], Logger(False))
+
+    compressed = generator.test_data(tests, True)
+
+    assert gzip.decompress(base64.b64decode(compressed)).decode('utf-8') == generator.test_data(tests)
+
+
+def test_embedded_test_data():
+    tests = suite()
+    generator = Generator([], [], Logger(False))
+    builder = DynamicBuilder([], [], Logger(False))
+
+    for compress, script in [(False, '<script id="test_data" type="application/json">'),
+                             (True, '<script id="test_data" type="application/gzip" data-encoding="base64">')]:
+        test_data = generator.test_data(tests, compress)
+        html = builder._build(builder.build('Nightly', Builder.Data(tests, test_data, 0, compress)))
+
+        assert f'{script}\n{test_data}\n</script>' in html
+
+
+TEXT = 'report <title> é ✓ 😀\n' * 1000
+
+
+def write(tmp_path, compression: OutputCompression, text: str = TEXT) -> Generator:
+    generator = Generator([], [], Logger(False), compression)
+
+    assert generator._write_file(str(tmp_path / 'report.html'), lambda output: output.write(text))
+
+    return generator
+
+
+def test_uncompressed(tmp_path):
+    write(tmp_path, OutputCompression.NONE)
+
+    assert os.listdir(tmp_path) == ['report.html']
+    assert (tmp_path / 'report.html').read_bytes() == TEXT.encode('utf-8')
+
+
+def test_alongside_round_trip(tmp_path):
+    generator = write(tmp_path, OutputCompression.ALONGSIDE)
+
+    assert sorted(os.listdir(tmp_path)) == ['report.html', 'report.html.gz']
+    assert gzip.decompress((tmp_path / 'report.html.gz').read_bytes()) == (tmp_path / 'report.html').read_bytes()
+    assert generator.bytes == sum([os.path.getsize(tmp_path / name) for name in os.listdir(tmp_path)])
+
+
+def test_only_round_trip(tmp_path):
+    write(tmp_path, OutputCompression.ONLY)
+
+    assert os.listdir(tmp_path) == ['report.html.gz']
+    assert gzip.decompress((tmp_path / 'report.html.gz').read_bytes()) == TEXT.encode('utf-8')
+
+
+def test_compressed_output_is_reproducible(tmp_path):
+    write(tmp_path, OutputCompression.ONLY)
+    first = (tmp_path / 'report.html.gz').read_bytes()
+
+    write(tmp_path, OutputCompression.ONLY)
+
+    assert (tmp_path / 'report.html.gz').read_bytes() == first
+
+
+def test_failed_write_leaves_no_files(tmp_path):
+    generator = Generator([], [], Logger(False), OutputCompression.ALONGSIDE)
+
+    def fail(output):
+        output.write(TEXT)
+        raise IOError('disk full')
+
+    assert not generator._write_file(str(tmp_path / 'report.html'), fail)
+    assert os.listdir(tmp_path) == []
+
+    # Text which cannot be encoded as UTF-8
+    assert not generator._write_file(str(tmp_path / 'report.html'), lambda output: output.write('\udcff'))
+    assert os.listdir(tmp_path) == []
+
+
+@pytest.mark.parametrize('mode, tests_per_page', [('static', 0), ('static', 1), ('dynamic', 0)])
+def test_report_round_trip(tmp_path, mode, tests_per_page):
+    records = [{'name': f'test_{i}', 'description': f'<b>{i}</b> é', 'device': 'device', 'outcome': 'passed',
+                'steps': [('step', 'passed')]} for i in range(3)]
+
+    plain = tmp_path / 'plain'
+    compressed = tmp_path / 'compressed'
+
+    assert build_report(records, 'Nightly', mode, str(plain), tests_per_page)
+    assert build_report(records, 'Nightly', mode, str(compressed), tests_per_page, compress_output='only')
+
+    plain_files = sorted([os.path.relpath(os.path.join(root, name), plain)
+                          for root, _, names in os.walk(plain) for name in names])
+    compressed_files = sorted([os.path.relpath(os.path.join(root, name), compressed)
+                               for root, _, names in os.walk(compressed) for name in names])
+
+    assert compressed_files == [f'{name}.gz' for name in plain_files]
+
+    for name in plain_files:
+        assert gzip.decompress((compressed / f'{name}.gz').read_bytes()) == (plain / name).read_bytes()
@@ -0,0 +1,173 @@
+# SPDX-License-Identifier: MIT
+# type: ignore
+
+import sqlite3
+
+from internal.history import History
+from internal.logger import Logger
+from reportify import build_tests
+
+
+def outcomes_of(outcomes: dict[str, str], durations: dict[str, float] = {}):
+    return build_tests([{'name': name, 'description': '', 'device': 'device', 'outcome': outcome,
+                         'duration': durations.get(name, 1.0)} for name, outcome in outcomes.items()])
+
+
+def runs(path) -> list[tuple[int, int]]:
+    # Stored runs, with their number of executions
+    with sqlite3.connect(path) as connection:
+        return connection.execute('SELECT r.id, COUNT(e.run) FROM runs r LEFT JOIN executions e ON e.run = r.id '
+                                  'GROUP BY r.id ORDER BY r.id').fetchall()
+
+
+def test_watch_mode_stores_one_run(tmp_path):
+    path = str(tmp_path / 'history.db')
+    history = History(path, Logger(False))
+
+    # The results of a campaign come in while the report is regenerated
+    for count in [1, 2, 4]:
+        results = outcomes_of({f'test_{i}': 'passed' for i in range(count)})
+        trends = history.record(results, 'Nightly', 10, 0.2)
+
+        assert trends.runs == 1
+        assert len(trends.entries) == count
+
+    assert runs(path) == [(1, 4)]
+
+
+def test_invocations_store_a_run_each(tmp_path):
+    path = str(tmp_path / 'history.db')
+
+    History(path, Logger(False)).add(outcomes_of({'test_a': 'passed', 'test_b': 'passed'}), 'Nightly')
+    trends = History(path, Logger(False)).record(outcomes_of({'test_a': 'failed', 'test_b': 'passed'}), 'Nightly', 10, 0.2)
+
+    assert runs(path) == [(1, 2), (2, 2)]
+
+    entries = {entry.name: entry for entry in trends.entries}
+
+    assert trends.runs == 2
+    assert entries['test_a'].pass_rate() == 0.5
+    assert entries['test_a'].flakiness() == 1.0
+    assert entries['test_b'].is_stable(0.2)
+    assert [entry.name for entry in trends.unstable()] == ['test_a']
+
+
+def test_trends_over_the_last_runs(tmp_path):
+    path = str(tmp_path / 'history.db')
+
+    for outcome, duration in [('failed', 1.0), ('passed', 3.0), ('failed', 1.5), ('passed', 2.0), ('passed', 4.0)]:
+        trends = History(path, Logger(False)).record(outcomes_of({'test_a': outcome}, {'test_a': duration}), 'Nightly', 3, 0.2)
+
+    entry = trends.entries[0]
+
+    # Only the last three runs: failed (1.5 s), passed (2 s) and passed (4 s)
+    assert trends.runs == 3
+    assert (entry.runs, entry.passed, entry.flips) == (3, 2, 1)
+    assert entry.duration_average == 1.75
+    assert entry.duration_trend() == (4.0 - 1.75) / 1.75
+    assert not entry.is_stable(0.2)
+
+
+def test_new_tests_have_no_duration_trend(tmp_path):
+    path = str(tmp_path / 'history.db')
+
+    History(path, Logger(False)).add(outcomes_of({'test_a': 'passed'}), 'Nightly')
+    trends = History(path, Logger(False)).record(outcomes_of({'test_a': 'passed', 'test_b': 'passed'}), 'Nightly', 10, 0.2)
+
+    entries = {entry.name: entry for entry in trends.entries}
+
+    assert entries['test_b'].runs == 1
+    assert entries['test_b'].duration_average is None
+    assert entries['test_b'].duration_trend() == 0.0
+    assert entries['test_a'].runs == 2
+
+
+def test_same_results_are_stored_once(tmp_path):
+    path = str(tmp_path / 'history.db')
+    results = {'test_a': 'passed', 'test_b': 'failed'}
+
+    first = History(path, Logger(False)).add(outcomes_of(results), 'Nightly')
+    second = History(path, Logger(False)).add(outcomes_of(results), 'Nightly')
+
+    assert first == second
+    assert runs(path) == [(1, 2)]
+
+    # Other titles have runs of their own
+    History(path, Logger(False)).add(outcomes_of(results), 'Weekly')
+
+    assert runs(path) == [(1, 2), (2, 2)]
+
+
+def test_same_results_as_an_older_run_are_a_new_run(tmp_path):
+    path = str(tmp_path / 'history.db')
+
+    for outcome in ['passed', 'failed', 'passed']:
+        trends = History(path, Logger(False)).record(outcomes_of({'test_a': outcome}), 'Nightly', 10, 0.2)
+
+    # The trends are computed over all runs, including those after the run with the same results
+    assert runs(path) == [(1, 1), (2, 1), (3, 1)]
+    assert trends.runs == 3
+    assert trends.entries[0].flips == 2
+
+
+def test_watch_mode_run_with_results_of_an_older_run_is_kept(tmp_path):
+    path = str(tmp_path / 'history.db')
+    results = {'test_a': 'passed', 'test_b': 'passed'}
+
+    History(path, Logger(False)).add(outcomes_of(results), 'Nightly')
+
+    history = History(path, Logger(False))
+    history.add(outcomes_of({'test_a': 'passed'}), 'Nightly')
+
+    assert runs(path) == [(1, 2), (2, 1)]
+
+    assert history.add(outcomes_of(results), 'Nightly') == 2
+    assert runs(path) == [(1, 2), (2, 2)]
+
+    trends = history.record(outcomes_of(results), 'Nightly', 10, 0.2)
+
+    assert trends.runs == 2
+    assert runs(path) == [(1, 2), (2, 2)]
+
+
+def test_ids_are_read_in_chunks(tmp_path, monkeypatch):
+    monkeypatch.setattr(History, 'CHUNK_SIZE', 3)
+
+    path = str(tmp_path / 'history.db')
+    results = {f'test_{i}': 'passed' for i in range(10)}
+
+    History(path, Logger(False)).add(outcomes_of({'test_other': 'passed'}), 'Nightly')
+    trends = History(path, Logger(False)).record(outcomes_of(results), 'Nightly', 10, 0.2)
+
+    assert sorted([entry.name for entry in trends.entries]) == sorted(results)
+
+    with sqlite3.connect(path) as connection:
+        assert connection.execute('SELECT COUNT(*) FROM tests').fetchone() == (11,)
+
+
+def test_version_1_history_is_migrated(tmp_path):
+    path = str(tmp_path / 'history.db')
+
+    with sqlite3.connect(path) as connection:
+        connection.execute('CREATE TABLE runs (id INTEGER PRIMARY KEY, title TEXT NOT NULL, created REAL NOT NULL, '
+                           'digest TEXT NOT NULL, UNIQUE (title, digest))')
+
+        for statement in History.SCHEMA[1:]:
+            connection.execute(statement)
+
+        connection.execute('PRAGMA user_version = 1')
+
+    History(path, Logger(False)).add(outcomes_of({'test_a': 'passed'}), 'Nightly')
+    History(path, Logger(False)).add(outcomes_of({'test_a': 'failed'}), 'Nightly')
+    History(path, Logger(False)).add(outcomes_of({'test_a': 'passed'}), 'Nightly')
+
+    assert runs(path) == [(1, 1), (2, 1), (3, 1)]
+
+    with sqlite3.connect(path) as connection:
+        assert connection.execute('PRAGMA user_version').fetchone() == (History.VERSION,)
+
+
+def test_unreadable_history(tmp_path):
+    (tmp_path / 'history.db').write_text('not a database' * 100)
+
+    assert History(str(tmp_path / 'history.db'), Logger(False)).record(outcomes_of({'test_a': 'passed'}), 'Nightly', 10, 0.2) is None
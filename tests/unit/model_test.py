@@ -0,0 +1,85 @@
+# SPDX-License-Identifier: MIT
+# type: ignore
+
+import pytest
+
+from internal import parser
+from internal.parser import Execution, Step, Summary
+
+
+def execution(device: str, outcome: str, duration: float = 1.0, steps: list[str] = []) -> Execution:
+    e = Execution()
+
+    e.device = device
+    e.outcome = outcome
+    e.duration = duration
+
+    for i, step_outcome in enumerate(steps):
+        s = Step()
+
+        s.id = i
+        s.description = f'step {i}'
+        s.outcome = step_outcome
+
+        e.steps.append(s)
+
+    return e
+
+
+def model(name: str, *executions: Execution) -> parser.Test:
+    test = parser.Test()
+
+    test.name = name
+    test.node_id = name
+    test.executions = list(executions)
+
+    return test
+
+
+@pytest.mark.parametrize('outcomes, outcome', [
+    (['passed', 'failed', 'skipped'], 'failed'),
+    (['skipped', 'passed'], 'passed'),
+    (['skipped'], 'skipped'),
+    (['error'], 'unknown'),
+    ([], 'unknown'),
+])
+def test_summary_outcome(outcomes, outcome):
+    summary = Summary()
+
+    for o in outcomes:
+        summary.add(o)
+
+    assert summary.total == len(outcomes)
+    assert summary.get_outcome() == outcome
+
+
+def test_test_aggregates():
+    test = model('test_a', execution('board-a', 'passed', 1.5, ['passed', 'passed']),
+                 execution('board-b', 'failed', 2.0, ['passed', 'failed', 'skipped']),
+                 execution('board-a', 'passed', 0.5))
+
+    assert test.get_outcome() == 'failed'
+    assert not test.has_same_outcome()
+    assert test.get_devices() == ['board-a', 'board-b']
+    assert test.get_duration() == 4.0
+
+    summary = test.executions[1].get_summary()
+
+    assert (summary.total, summary.passed, summary.failed, summary.skipped) == (3, 1, 1, 1)
+
+
+def test_added_executions_reset_the_aggregates():
+    tests = parser.Tests()
+    test = model('test_a', execution('board-a', 'passed'))
+
+    tests.add(test)
+
+    assert test.has_same_outcome()
+    assert tests.get_summary().passed == 1
+
+    tests.add_execution(test, execution('board-b', 'failed'))
+
+    assert test.get_outcome() == 'failed'
+    assert test.get_devices() == ['board-a', 'board-b']
+    assert tests.get_summary().failed == 1
+    assert tests.get_summary().passed == 0
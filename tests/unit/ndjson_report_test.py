@@ -0,0 +1,79 @@
+# SPDX-License-Identifier: MIT
+# type: ignore
+
+import json
+import os
+
+import pytest
+
+pytest_plugins = ['pytester']
+
+TESTS = '''
+import pytest
+
+
+@pytest.fixture
+def broken():
+    yield
+    raise RuntimeError('teardown')
+
+
+def test_pass(json_metadata):
+    json_metadata['device'] = 'board-a'
+    json_metadata['active_test'] = 'test_pass'
+
+
+def test_fail():
+    assert False
+
+
+@pytest.mark.skip
+def test_skip():
+    pass
+
+
+def test_teardown(broken):
+    pass
+
+
+def test_fail_and_teardown(broken):
+    assert False
+'''
+
+
+def test_records(pytester):
+    pytest.importorskip('pytest_jsonreport')
+
+    pytester.makepyfile(test_example=TESTS)
+    pytester.runpytest_inprocess('-p', 'tests.ndjson_report', '--ndjson-report', 'results.ndjson')
+
+    records = [json.loads(line) for line in (pytester.path / 'results.ndjson').read_text().splitlines()]
+
+    assert [(record['nodeid'], record['outcome']) for record in records] == [
+        ('test_example.py::test_pass', 'passed'),
+        ('test_example.py::test_fail', 'failed'),
+        ('test_example.py::test_skip', 'skipped'),
+        ('test_example.py::test_teardown', 'error'),
+        # The first stage which did not pass decides
+        ('test_example.py::test_fail_and_teardown', 'failed'),
+    ]
+
+    assert records[0]['metadata'] == {'device': 'board-a', 'active_test': 'test_pass'}
+    assert records[0]['call']['outcome'] == 'passed'
+    assert 'call' not in records[2]
+
+
+def test_previous_results_are_replaced(pytester):
+    pytest.importorskip('pytest_jsonreport')
+
+    pytester.makepyfile(test_example=TESTS)
+    pytester.runpytest_inprocess('-p', 'tests.ndjson_report', '--ndjson-report', 'results.ndjson')
+
+    # A reader of the previous results keeps reading the old file, which is not truncated
+    with open(pytester.path / 'results.ndjson') as previous:
+        pytester.runpytest_inprocess('-p', 'tests.ndjson_report', '--ndjson-report', 'results.ndjson', '-k', 'test_pass')
+
+        assert len(previous.read().splitlines()) == 5
+
+    assert len((pytester.path / 'results.ndjson').read_text().splitlines()) == 1
+    assert not os.path.exists(pytester.path / 'results.ndjson.tmp')
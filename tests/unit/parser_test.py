@@ -0,0 +1,249 @@
+# SPDX-License-Identifier: MIT
+# type: ignore
+
+import json
+import os
+
+from internal.logger import Logger
+from internal.parser import Parser
+
+
+def record(name: str, device: str, outcome: str, steps: list[tuple[str, str]] = [], **metadata) -> dict:
+    test = {
+        'nodeid': metadata.pop('nodeid', f'tests/{name}.py::{name}'),
+        'outcome': outcome,
+        'call': {'duration': 1.5},
+        'metadata': {'device': device, 'description': f'Description of {name}', 'active_test': name, 'steps': len(steps)}
+    }
+
+    for i, (description, step_outcome) in enumerate(steps):
+        test['metadata'][f'step-{i}'] = {'description': description, 'outcome': step_outcome}
+
+    test['metadata'].update(metadata)
+
+    return test
+
+
+def write(path, records: list[dict]) -> str:
+    path.write_text(json.dumps({'tests': records}))
+    return str(path)
+
+
+def test_executions_are_merged_per_test(tmp_path):
+    path = write(tmp_path / 'report.json', [
+        record('test_a', 'board-a', 'passed', [('Power on', 'passed'), ('Boot', 'passed')]),
+        record('test_b', 'board-a', 'failed'),
+        record('test_a', 'board-b', 'failed', [('Power on', 'passed'), ('Boot', 'failed')]),
+    ])
+
+    tests = Parser(path, False, Logger(False)).parse()
+
+    assert list(tests.tests) == ['test_a', 'test_b']
+    assert [test.id for test in tests.tests.values()] == [0, 1]
+
+    test = tests.get('test_a')
+
+    assert [(execution.id, execution.device, execution.outcome) for execution in test.executions] == [
+        (0, 'board-a', 'passed'), (1, 'board-b', 'failed')]
+    assert [(step.id, step.description, step.outcome) for step in test.executions[1].steps] == [
+        (0, 'Power on', 'passed'), (1, 'Boot', 'failed')]
+    assert test.executions[0].duration == 1.5
+
+
+def test_lookups(tmp_path):
+    path = write(tmp_path / 'report.json', [
+        record('test_a', 'board-a', 'passed', nodeid='tests/test_a.py::test_a[1]'),
+        record('test_a', 'board-b', 'passed', nodeid='tests/test_a.py::test_a[2]'),
+        record('test_b', 'board-b', 'passed'),
+    ])
+
+    tests = Parser(path, False, Logger(False)).parse()
+
+    assert tests.get('test_a').node_id == 'tests/test_a.py::test_a'
+    assert tests.get('test_c') is None
+    assert [test.name for test in tests.get_by_node_id('tests/test_a.py::test_a')] == ['test_a']
+    assert [test.name for test in tests.get_by_device('board-a')] == ['test_a']
+    assert [test.name for test in tests.get_by_device('board-b')] == ['test_a', 'test_b']
+    assert tests.get_by_device('board-c') == []
+
+
+def test_self_tests(tmp_path):
+    path = write(tmp_path / 'report.json', [
+        record('test_a', 'board-a', 'passed'),
+        record('test_self', 'board-a', 'passed', self_test=True),
+    ])
+
+    assert list(Parser(path, False, Logger(False)).parse().tests) == ['test_a']
+    assert list(Parser(path, True, Logger(False)).parse().tests) == ['test_a', 'test_self']
+
+
+def test_invalid_records(tmp_path):
+    mismatch = record('test_a', 'board-b', 'passed')
+    mismatch['metadata']['description'] = 'Other description'
+
+    no_step = record('test_a', 'board-a', 'passed')
+    no_step['metadata']['steps'] = 1
+
+    for records in [
+        [record('test_a', 'board-a', 'passed'), mismatch],
+        [record('test_a', 'board-a', 'passed', nodeid='tests/test_b.py::test_b')],
+        [no_step],
+    ]:
+        assert Parser(write(tmp_path / 'report.json', records), False, Logger(False)).parse() is None
+
+
+def devices(path: str, jobs: int = 1) -> list[tuple[int, str, list[str]]]:
+    tests = Parser(path, False, Logger(False), jobs).parse()
+    return [(test.id, test.name, [execution.device for execution in test.executions]) for test in tests.tests.values()]
+
+
+def results(tmp_path) -> None:
+    (tmp_path / 'results' / 'nested').mkdir(parents=True)
+
+    for i, name in enumerate(['b', 'a', 'nested/c']):
+        write(tmp_path / 'results' / f'{name}.json', [record(f'test_{j}', f'device {name}', 'passed') for j in range(i, i + 3)])
+
+    (tmp_path / 'results' / 'notes.txt').write_text('not a report')
+
+
+def test_folders_are_scanned_recursively_in_sorted_order(tmp_path):
+    results(tmp_path)
+
+    assert devices(str(tmp_path / 'results')) == [
+        (0, 'test_1', ['device a', 'device b']),
+        (1, 'test_2', ['device a', 'device b', 'device nested/c']),
+        (2, 'test_3', ['device a', 'device nested/c']),
+        (3, 'test_0', ['device b']),
+        (4, 'test_4', ['device nested/c']),
+    ]
+
+
+def test_files_and_patterns_keep_the_given_order(tmp_path):
+    results(tmp_path)
+    folder = tmp_path / 'results'
+
+    # Files matched more than once are read once, at their first position
+    path = f'{folder}/nested/c.json,{folder}/*.json,{folder}/a.json'
+
+    assert [devices for _, _, devices in devices(path)][0] == ['device nested/c', 'device a', 'device b']
+
+
+def test_parallel_parse_matches_sequential_parse(tmp_path):
+    results(tmp_path)
+
+    assert devices(str(tmp_path / 'results'), 3) == devices(str(tmp_path / 'results'), 1)
+
+
+def test_parser_is_not_sent_to_the_parse_processes(tmp_path, monkeypatch):
+    results(tmp_path)
+
+    def reduce(parser):
+        raise AssertionError('the parser is pickled')
+
+    monkeypatch.setattr(Parser, '__reduce__', reduce, raising=False)
+
+    assert devices(str(tmp_path / 'results'), 3) == devices(str(tmp_path / 'results'), 1)
+
+
+def test_no_input_files(tmp_path):
+    assert Parser(str(tmp_path / '*.json'), False, Logger(False)).parse() is None
+    assert Parser(str(tmp_path), False, Logger(False)).parse() is None
+
+
+def test_repeated_strings_are_shared(tmp_path):
+    for name in ['a', 'b']:
+        write(tmp_path / f'{name}.json', [record(f'test_{i}', 'board-' + 'a', 'passed', [('Power ' + 'on', 'passed')])
+                                          for i in range(2)])
+
+    tests = Parser(str(tmp_path), False, Logger(False), 2).parse()
+    executions = [execution for test in tests.tests.values() for execution in test.executions]
+    steps = [step for execution in executions for step in execution.steps]
+
+    assert len(executions) == 4
+    assert all([execution.device is executions[0].device for execution in executions])
+    assert all([execution.outcome is executions[0].outcome for execution in executions])
+    assert all([step.description is steps[0].description for step in steps])
+
+    # Slotted models have no attribute dictionary
+    assert not hasattr(executions[0], '__dict__')
+    assert not hasattr(steps[0], '__dict__')
+    assert not hasattr(tests.get('test_0'), '__dict__')
+
+
+def test_update_reads_only_new_and_changed_files(tmp_path):
+    write(tmp_path / 'a.json', [record('test_a', 'board-a', 'passed')])
+    write(tmp_path / 'b.json', [record('test_b', 'board-a', 'passed')])
+
+    parser = Parser(str(tmp_path), False, Logger(False))
+    parser.parse()
+
+    a = parser.files[str(tmp_path / 'a.json')]
+
+    write(tmp_path / 'b.json', [record('test_b', 'board-a', 'failed'), record('test_b', 'board-b', 'failed')])
+    write(tmp_path / 'c.json', [record('test_c', 'board-a', 'passed')])
+
+    tests = parser.update()
+
+    assert parser.files[str(tmp_path / 'a.json')] is a
+    assert [(test.name, test.get_outcome(), len(test.executions)) for test in tests.tests.values()] == [
+        ('test_a', 'passed', 1), ('test_b', 'failed', 2), ('test_c', 'passed', 1)]
+
+    (tmp_path / 'a.json').unlink()
+
+    assert list(parser.update().tests) == ['test_b', 'test_c']
+    assert sorted(parser.files) == [str(tmp_path / 'b.json'), str(tmp_path / 'c.json')]
+
+
+def test_snapshot_finds_new_files(tmp_path):
+    write(tmp_path / 'a.json', [record('test_a', 'board-a', 'passed')])
+
+    parser = Parser(str(tmp_path), False, Logger(False))
+    parser.parse()
+    snapshot = parser.snapshot()
+
+    write(tmp_path / 'b.json', [record('test_b', 'board-a', 'passed')])
+
+    assert list(parser.snapshot()) == [str(tmp_path / 'a.json'), str(tmp_path / 'b.json')]
+    assert parser.snapshot()[str(tmp_path / 'a.json')] == snapshot[str(tmp_path / 'a.json')]
+
+
+def test_stats_of_the_parse_match_the_snapshot(tmp_path):
+    # The watcher starts from the stats of the files which were read
+    write(tmp_path / 'a.json', [record('test_a', 'board-a', 'passed')])
+    (tmp_path / 'b.ndjson').write_text(json.dumps(record('test_b', 'board-a', 'passed')) + '\n')
+
+    parser = Parser(str(tmp_path), False, Logger(False))
+    parser.parse()
+
+    assert parser.stats == parser.snapshot()
+
+
+def test_streams_are_tailed(tmp_path):
+    path = tmp_path / 'results.ndjson'
+    lines = [json.dumps(record(f'test_{i}', 'board-a', 'passed')) + '\n' for i in range(4)]
+
+    def names(tests) -> list[str]:
+        return list(tests.tests)
+
+    path.write_text(lines[0] + lines[1] + lines[2][:10])
+
+    parser = Parser(str(tmp_path), False, Logger(False))
+
+    assert names(parser.parse()) == ['test_0', 'test_1']
+
+    # Only the records after the last complete line are parsed
+    path.write_text(''.join(lines[:3]))
+
+    assert names(parser.update()) == ['test_0', 'test_1', 'test_2']
+    assert parser.offsets[str(path)] == len(''.join(lines[:3]))
+
+    # A stream which became smaller was started over
+    path.write_text(lines[3])
+
+    assert names(parser.update()) == ['test_3']
+
+    # As is a stream which was replaced by a new file, also when the new file is larger
+    (tmp_path / 'new.tmp').write_text(''.join(lines[1:3]))
+    os.replace(tmp_path / 'new.tmp', path)
+
+    assert names(parser.update()) == ['test_1', 'test_2']
@@ -0,0 +1,113 @@
+# SPDX-License-Identifier: MIT
+# type: ignore
+
+import json
+import os
+import subprocess
+import sys
+import tracemalloc
+
+import pytest
+
+from internal.logger import Logger
+from internal.parser import Parser
+from internal.profiler import Profiler
+
+
+GENERATE = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', 'generate.py'))
+
+
+@pytest.fixture(autouse=True)
+def stop_tracing():
+    yield
+
+    if tracemalloc.is_tracing():
+        tracemalloc.stop()
+
+
+def test_disabled(tmp_path):
+    profiler = Profiler(False, Logger(False))
+
+    with profiler.stage('parse'):
+        pass
+
+    assert profiler.stages == {}
+    assert profiler.write(str(tmp_path / 'profile.json'), {})
+    assert os.listdir(tmp_path) == []
+
+
+def test_stages(tmp_path):
+    profiler = Profiler(True, Logger(False), 'build', True)
+
+    with profiler.stage('parse'):
+        data = [bytearray(1024 * 1024)]
+
+    with profiler.stage('build'):
+        sum(range(10000))
+
+    profiler.count('files', 2)
+
+    assert profiler.write(str(tmp_path / 'profile.json'), {'title': 'Nightly'})
+
+    profile = json.loads((tmp_path / 'profile.json').read_text())
+
+    assert list(profile['stages']) == ['parse', 'build']
+    assert profile['details'] == {'title': 'Nightly'}
+    assert profile['counts'] == {'files': 2}
+    assert profile['stages']['parse']['memory_peak'] >= len(data[0])
+    assert profile['stages']['parse']['memory_end'] - profile['stages']['parse']['memory_start'] >= len(data[0])
+    assert profile['total']['wall_time'] == sum([stage['wall_time'] for stage in profile['stages'].values()])
+
+    # The cProfile dump of the selected stage is written next to the profile
+    assert sorted(os.listdir(tmp_path)) == ['profile.build.prof', 'profile.json']
+
+
+def test_memory_is_only_traced_when_asked_for(tmp_path):
+    profiler = Profiler(True, Logger(False))
+
+    with profiler.stage('parse'):
+        assert not tracemalloc.is_tracing()
+
+    assert profiler.write(str(tmp_path / 'profile.json'), {})
+
+    profile = json.loads((tmp_path / 'profile.json').read_text())
+
+    assert list(profile['stages']['parse']) == ['wall_time', 'cpu_time']
+    assert list(profile['total']) == ['wall_time', 'cpu_time']
+
+
+def report(i: int, outcome: str) -> dict:
+    return {'tests': [{
+        'nodeid': f'tests/test.py::test_{i}', 'outcome': outcome, 'call': {'duration': 1.0},
+        'metadata': {'device': 'board-a', 'description': '', 'active_test': f'test_{i}', 'steps': 0}
+    }]}
+
+
+@pytest.mark.parametrize('options, mode', [([], 'static'), (['-d'], 'dynamic'), (['-b', 'baseline.json'], 'diff')])
+def test_profile_of_the_script(tmp_path, options, mode):
+    (tmp_path / 'report.json').write_text(json.dumps(report(0, 'failed')))
+    (tmp_path / 'baseline.json').write_text(json.dumps(report(0, 'passed')))
+
+    subprocess.run([sys.executable, GENERATE, '-i', 'report.json', '-o', '.', '-t', 'Nightly', '--no-cache', '--profile',
+                    'profile.json'] + options, cwd=tmp_path, check=True, capture_output=True)
+
+    profile = json.loads((tmp_path / 'profile.json').read_text())
+
+    assert profile['details'] == {'title': 'Nightly', 'mode': mode}
+    assert ('test_data' in profile['stages']) == (mode == 'dynamic')
+    assert 'memory_peak' not in profile['total']
+
+
+def test_count_tests(tmp_path):
+    report = {'tests': [{
+        'nodeid': f'tests/test.py::test_{i}', 'outcome': 'passed', 'call': {'duration': 1.0},
+        'metadata': {'device': device, 'description': '', 'active_test': f'test_{i}', 'steps': 2,
+                     'step-0': {'description': 'a', 'outcome': 'passed'}, 'step-1': {'description': 'b', 'outcome': 'passed'}}
+    } for i in range(3) for device in ['board-a', 'board-b']]}
+
+    (tmp_path / 'report.json').write_text(json.dumps(report))
+
+    profiler = Profiler(True, Logger(False))
+    profiler.count_tests(Parser(str(tmp_path / 'report.json'), False, Logger(False)).parse())
+
+    assert profiler.counts == {'tests': 3, 'executions': 6, 'steps': 12}
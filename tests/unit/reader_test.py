@@ -0,0 +1,155 @@
+# SPDX-License-Identifier: MIT
+# type: ignore
+
+import json
+import mmap
+import os
+
+import pytest
+
+from internal.reader import NDJSONReader, Reader, Window
+
+
+STRINGS = [
+    'plain',
+    'quote " and backslash \\ and slash /',
+    'newline \n tab \t carriage return \r',
+    'unicode é ü ✓ 測試',
+    'emoji 😀 outside the basic plane',
+    'escaped \u0000 \u001f control characters',
+    '{"not": ["an", "object"]}',
+    '',
+]
+
+
+def record(i: int, description: str, padding: int = 0) -> dict:
+    return {
+        'nodeid': f'tests/test_{i}.py::test_{i}',
+        'lineno': i,
+        'keywords': ['x' * padding, description],
+        'outcome': 'passed',
+        'setup': {'duration': 0.1, 'outcome': 'passed'},
+        'call': {'duration': i / 3, 'outcome': 'passed', 'longrepr': description},
+        'metadata': {'device': f'device {i}', 'description': description, 'steps': [{'step': description}]}
+    }
+
+
+def expected(report: dict) -> list[dict]:
+    # The fields read by the parser
+    return [{'nodeid': test['nodeid'], 'outcome': test['outcome'], 'metadata': test['metadata'],
+             'call': {'duration': test['call']['duration']}} for test in report['tests']]
+
+
+def write(tmp_path, text: str) -> str:
+    path = tmp_path / 'report.json'
+    path.write_bytes(text.encode('utf-8'))
+    return str(path)
+
+
+@pytest.mark.parametrize('window_size', [64, 1024, 1024 * 1024])
+@pytest.mark.parametrize('ensure_ascii', [True, False])
+def test_same_as_json_load(tmp_path, window_size, ensure_ascii):
+    report = {'created': 1.0, 'summary': {'passed': len(STRINGS)}, 'tests': [record(i, s) for i, s in enumerate(STRINGS)]}
+    path = write(tmp_path, json.dumps(report, indent=4, ensure_ascii=ensure_ascii))
+
+    with open(path, encoding='utf-8') as file:
+        assert list(Reader(path, window_size=window_size).tests()) == expected(json.load(file))
+
+
+@pytest.mark.parametrize('window_size', [16, 100, 1000])
+def test_records_larger_than_the_window(tmp_path, window_size):
+    # Multi-byte characters end up on the boundaries of the window
+    report = {'tests': [record(i, 'é✓😀' * (i * 50), padding=i * 500) for i in range(10)]}
+    path = write(tmp_path, json.dumps(report, ensure_ascii=False))
+
+    assert list(Reader(path, window_size=window_size).tests()) == expected(report)
+
+
+def test_tests_after_other_keys(tmp_path):
+    report = {'environment': {'tests': 'not these', 'nested': [[{}], '"]}']}, 'tests': [record(0, 'a')]}
+    path = write(tmp_path, json.dumps(report))
+
+    assert list(Reader(path).tests()) == expected(report)
+
+
+def test_no_tests(tmp_path):
+    path = write(tmp_path, '{"tests": []}')
+
+    assert list(Reader(path).tests()) == []
+
+
+@pytest.mark.parametrize('text', [
+    '',
+    '[]',
+    '{"summary": {}}',
+    '{"tests": [{"nodeid": "a", "outcome": "passed"}',
+    '{"tests": [{"nodeid": "a" "outcome": "passed"}]}',
+    '{"tests": [{"nodeid": "a"}, {"nodeid": "b"} {"nodeid": "c"}]}',
+    '{"tests": [{"nodeid": "unterminated}]}',
+    '{"tests": [{"nodeid": "a", "metadata": {"steps": [1, 2}]}',
+])
+@pytest.mark.parametrize('window_size', [8, 1024 * 1024])
+def test_malformed_input(tmp_path, text, window_size):
+    path = write(tmp_path, text)
+
+    with pytest.raises((Reader.Error, json.JSONDecodeError)):
+        list(Reader(path, window_size=window_size).tests())
+
+
+def test_ndjson_records(tmp_path):
+    records = [record(i, s) for i, s in enumerate(STRINGS)]
+    path = write(tmp_path, ''.join([json.dumps(r) + '\n' for r in records]) + '\n')
+
+    reader = NDJSONReader(path)
+
+    assert list(reader.tests()) == expected({'tests': records})
+    assert reader.offset == os.path.getsize(path)
+
+
+def test_ndjson_partial_last_line(tmp_path):
+    first = json.dumps(record(0, 'a')) + '\n'
+    second = json.dumps(record(1, 'é✓'))
+    path = write(tmp_path, first + second[:20])
+
+    reader = NDJSONReader(path)
+
+    assert list(reader.tests()) == expected({'tests': [record(0, 'a')]})
+    assert reader.offset == len(first.encode('utf-8'))
+
+    # The next read starts at the offset of the incomplete line
+    write(tmp_path, first + second + '\n')
+
+    assert list(NDJSONReader(path, offset=reader.offset).tests()) == expected({'tests': [record(1, 'é✓')]})
+
+
+@pytest.mark.parametrize('line', ['{"nodeid": "a"\n', '["a"]\n'])
+def test_ndjson_malformed_records(tmp_path, line):
+    path = write(tmp_path, json.dumps(record(0, 'a')) + '\n' + line)
+
+    with pytest.raises(Reader.Error):
+        list(NDJSONReader(path).tests())
+
+
+@pytest.mark.parametrize('text', ['ascii only', 'unicode é ✓ 😀'])
+def test_window_position_in_bytes(tmp_path, text):
+    values = [f'{text} {i}' for i in range(50)]
+    encoded = json.dumps(values, ensure_ascii=False).encode('utf-8')
+    path = tmp_path / 'values.json'
+    path.write_bytes(encoded)
+
+    with open(path, 'rb') as file:
+        data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        with data:
+            window = Window(data, 1, 64)
+            more = True
+
+            while more:
+                value = window.decode()
+
+                # The position after every value is its end in the file
+                assert encoded[:window.position()].endswith(json.dumps(value, ensure_ascii=False).encode('utf-8'))
+
+                more = window.next(b']')
+
+            assert window.position() == len(encoded)
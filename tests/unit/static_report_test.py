@@ -0,0 +1,186 @@
+# SPDX-License-Identifier: MIT
+# type: ignore
+
+import multiprocessing
+import os
+import re
+
+import pytest
+
+from internal import parser
+from internal.builder import Builder, Serializer
+from internal.logger import Logger
+from internal.static.static_builder import StaticBuilder
+from internal.static.static_generator import StaticGenerator
+from internal.template import Fragment
+from reportify import build_report
+
+
+def suite(count: int) -> parser.Tests:
+    tests = parser.Tests()
+
+    for i in range(count):
+        test = parser.Test()
+
+        test.id = i
+        test.name = f'test_{i}'
+        test.node_id = f'tests/test.py::test_{i}'
+        test.description = f'Description of test {i}'
+
+        for device in ['board-a', 'board-b']:
+            execution = parser.Execution()
+
+            execution.id = len(test.executions)
+            execution.device = device
+            execution.outcome = 'passed' if i % 2 == 0 else 'failed'
+            execution.duration = 1.0
+
+            test.executions.append(execution)
+
+        tests.add(test)
+
+    tests.aggregate()
+
+    return tests
+
+
+def report(tmp_path, count: int, tests_per_page: int, jobs: int = 1) -> list[Builder.Page]:
+    builder = StaticBuilder([], [], Logger(False))
+    data = Builder.Data(suite(count), '', tests_per_page)
+
+    pages = builder.pages('Nightly', data)
+
+    generator = StaticGenerator([], [], Logger(False), jobs=jobs)
+
+    assert generator.report(builder.build('Nightly', data), str(tmp_path), pages)
+
+    return pages
+
+
+def test_single_page(tmp_path):
+    assert report(tmp_path, 5, 0) == []
+    assert os.listdir(tmp_path) == ['report.html']
+
+    html = (tmp_path / 'report.html').read_text()
+
+    assert all([f'Description of test {i}' in html for i in range(5)])
+    assert 'report-1.html' not in html
+
+
+@pytest.mark.parametrize('count, tests_per_page, sizes', [(5, 2, [2, 2, 1]), (4, 2, [2, 2]), (3, 10, [3])])
+def test_pages(tmp_path, count, tests_per_page, sizes):
+    pages = report(tmp_path, count, tests_per_page)
+
+    assert [len(page.tests) for page in pages] == sizes
+    assert sorted(os.listdir(tmp_path)) == sorted(['report.html'] + [f'report-{i + 1}.html' for i in range(len(sizes))])
+
+    index = (tmp_path / 'report.html').read_text()
+
+    # The index has the overview only, every test links to the page of its details
+    assert 'Description of test' not in index
+
+    for i in range(count):
+        page = i // tests_per_page + 1
+
+        assert f'href="report-{page}.html#test-{i}"' in index
+        assert f'id="test-{i}"' in (tmp_path / f'report-{page}.html').read_text()
+
+
+def test_pages_written_in_parallel(tmp_path):
+    os.mkdir(tmp_path / 'sequential')
+    os.mkdir(tmp_path / 'parallel')
+
+    report(tmp_path / 'sequential', 5, 2)
+    report(tmp_path / 'parallel', 5, 2, 2)
+
+    for name in os.listdir(tmp_path / 'sequential'):
+        assert (tmp_path / 'parallel' / name).read_text() == (tmp_path / 'sequential' / name).read_text()
+
+
+@pytest.mark.skipif(multiprocessing.get_start_method() != 'fork', reason='pages are pickled once per worker when not forked')
+def test_pages_are_not_sent_to_the_workers(tmp_path, monkeypatch):
+    def reduce(page):
+        raise AssertionError('page sent to a worker')
+
+    # Only the indices of the pages are sent, the workers inherit the pages
+    monkeypatch.setattr(Builder.Page, '__reduce__', reduce, raising=False)
+
+    pages = report(tmp_path, 10, 2, 2)
+
+    assert sorted(os.listdir(tmp_path)) == sorted(['report.html'] + [page.filename() for page in pages])
+
+
+def test_stale_pages_are_removed(tmp_path):
+    (tmp_path / 'notes-1.html').write_text('')
+
+    report(tmp_path, 5, 1)
+    report(tmp_path, 5, 2)
+
+    assert sorted(os.listdir(tmp_path)) == ['notes-1.html', 'report-1.html', 'report-2.html', 'report-3.html', 'report.html']
+
+    report(tmp_path, 5, 0)
+
+    assert sorted(os.listdir(tmp_path)) == ['notes-1.html', 'report.html']
+
+
+def test_page_navigation(tmp_path):
+    report(tmp_path, 5, 2)
+
+    def links(number: int) -> list[str]:
+        return re.findall(r'<a href="([^"#]*)">', (tmp_path / f'report-{number}.html').read_text())
+
+    assert links(1) == ['report.html', 'report-2.html'] * 2
+    assert links(2) == ['report.html', 'report-1.html', 'report-3.html'] * 2
+    assert links(3) == ['report.html', 'report-2.html'] * 2
+
+
+def test_failed_write_keeps_the_previous_report(tmp_path, monkeypatch):
+    report(tmp_path, 2, 0)
+    previous = (tmp_path / 'report.html').read_text()
+
+    def fail(self, element, sink) -> int:
+        sink.write('<html>')
+        raise OSError('disk full')
+
+    monkeypatch.setattr(Serializer, 'write', fail)
+
+    builder = StaticBuilder([], [], Logger(False))
+
+    assert not StaticGenerator([], [], Logger(False)).report(builder.build('Nightly', Builder.Data(suite(3), '')), str(tmp_path))
+    assert os.listdir(tmp_path) == ['report.html']
+    assert (tmp_path / 'report.html').read_text() == previous
+
+
+def test_written_elements_and_bytes_are_counted(tmp_path):
+    builder = StaticBuilder([], [], Logger(False))
+    data = Builder.Data(suite(5), '', 2)
+    document = builder.build('Nightly', data)
+    pages = builder.pages('Nightly', data)
+
+    def count(element) -> int:
+        if isinstance(element, Fragment):
+            return element.elements
+
+        return 1 + sum([count(e) for e in element.get()])
+
+    generator = StaticGenerator([], [], Logger(False))
+
+    assert generator.report(document, str(tmp_path), pages)
+    assert generator.elements == count(document) + sum([count(page.build()) for page in pages])
+    assert generator.bytes == sum([os.path.getsize(tmp_path / name) for name in os.listdir(tmp_path)])
+
+
+def test_user_strings_are_escaped(tmp_path):
+    records = [{'name': 'test_<script>', 'description': '\nChecks <b>\nthat & works', 'device': 'board <a>',
+                'outcome': 'passed', 'steps': [('Power <on>', 'passed')]}]
+
+    assert build_report(records, 'Nightly <1>', 'static', str(tmp_path))
+
+    html = (tmp_path / 'report.html').read_text()
+
+    assert '<script>' not in html
+    assert 'test_&lt;script&gt;' in html
+    assert '<td class="passed">board &lt;a&gt;</td>' in html
+    assert 'Power &lt;on&gt;' in html
+    assert 'Checks &lt;b&gt;<br/>\nthat &amp; works<br/>' in html
+    assert 'Nightly &lt;1&gt;' in html
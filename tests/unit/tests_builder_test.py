@@ -0,0 +1,110 @@
+# SPDX-License-Identifier: MIT
+# type: ignore
+
+import os
+
+from collections import namedtuple
+
+import reportify
+
+from internal.generator import Generator
+from internal.logger import Logger
+from reportify import build_report, build_tests
+
+
+def record(name: str, device: str, outcome: str, **fields) -> dict:
+    return {'name': name, 'description': f'Description of {name}', 'device': device, 'outcome': outcome, **fields}
+
+
+def test_executions_are_merged_per_test():
+    tests = build_tests([record('test_a', 'board-a', 'passed'), record('test_b', 'board-a', 'failed'),
+                         record('test_a', 'board-b', 'failed', steps=[('Power on', 'passed'), ('Boot', 'failed')])])
+
+    assert [test.name for test in tests.tests.values()] == ['test_a', 'test_b']
+    assert [test.id for test in tests.tests.values()] == [0, 1]
+    assert [execution.device for execution in tests.tests['test_a'].executions] == ['board-a', 'board-b']
+    assert [step.description for step in tests.tests['test_a'].executions[1].steps] == ['Power on', 'Boot']
+    assert tests.tests['test_a'].get_outcome() == 'failed'
+
+
+def test_records_and_steps_as_objects():
+    Record = namedtuple('Record', ['name', 'description', 'device', 'outcome', 'duration', 'steps', 'node_id'])
+    Step = namedtuple('Step', ['description', 'outcome'])
+
+    tests = build_tests([Record('test_a', 'A', 'board-a', 'passed', 2.5,
+                                [Step('Power on', 'passed'), {'description': 'Boot', 'outcome': 'passed'}],
+                                'tests/test.py::test_a[board-a]')])
+
+    test = tests.tests['test_a']
+
+    assert test.node_id == 'tests/test.py::test_a'
+    assert test.executions[0].duration == 2.5
+    assert [(step.id, step.description) for step in test.executions[0].steps] == [(0, 'Power on'), (1, 'Boot')]
+
+
+def test_self_tests_are_left_out_by_default():
+    records = [record('test_a', 'board-a', 'passed'), record('test_self', 'board-a', 'passed', self_test=True)]
+
+    assert list(build_tests(records).tests) == ['test_a']
+    assert list(build_tests(records, False).tests) == ['test_a']
+    assert list(build_tests(records, True).tests) == ['test_a', 'test_self']
+
+
+def test_mismatching_executions_are_rejected():
+    builder = reportify.TestsBuilder(False, Logger(False))
+
+    assert builder.add('test_a', 'First description', 'board-a', 'passed')
+    assert builder.add('test_a', 'Other description', 'board-b', 'passed')
+    assert builder.build() is None
+
+
+def test_invalid_records_are_rejected():
+    assert build_tests([record('test_a', 'board-a', 'passed', node_id='test_b')]) is None
+    assert build_tests([record('test_a', '', 'passed')]) is None
+    assert build_tests([record('test_a', 'board-a', 'passed', duration='1 s')]) is None
+    assert build_tests([record('test_a', 'board-a', 'passed', steps=[('Power on', None)])]) is None
+    assert build_tests([{'name': 'test_a', 'device': 'board-a', 'outcome': 'passed'}]) is None
+
+
+def test_build_report(tmp_path):
+    records = [record('test_a', 'board-a', 'passed'), record('test_b', 'board-a', 'failed')]
+
+    assert build_report(records, 'Nightly', 'static', str(tmp_path / 'static'))
+    assert build_report(build_tests(records), 'Nightly', reportify.ReportMode.DYNAMIC, str(tmp_path / 'dynamic'))
+    assert not build_report(records, 'Nightly', 'pdf', str(tmp_path / 'pdf'))
+
+    assert 'Description of test_b' in (tmp_path / 'static' / 'report.html').read_text()
+    assert os.path.exists(tmp_path / 'dynamic' / 'report' / 'report.html')
+    assert not os.path.exists(tmp_path / 'pdf')
+
+
+def test_build_static_report_without_test_data(tmp_path, monkeypatch):
+    def test_data(generator, tests, compress=False):
+        raise AssertionError('test data of a static report')
+
+    monkeypatch.setattr(Generator, 'test_data', test_data)
+
+    assert build_report([record('test_a', 'board-a', 'passed')], 'Nightly', 'static', str(tmp_path), tests_per_page=1)
+
+
+def test_build_report_leaves_out_self_tests(tmp_path):
+    records = [record('test_a', 'board-a', 'passed'), record('test_self', 'board-a', 'passed', self_test=True)]
+
+    assert build_report(records, 'Nightly', 'static', str(tmp_path / 'default'))
+    assert build_report(records, 'Nightly', 'static', str(tmp_path / 'self_tests'), include_self_tests=True)
+
+    assert 'test_self' not in (tmp_path / 'default' / 'report.html').read_text()
+    assert 'test_self' in (tmp_path / 'self_tests' / 'report.html').read_text()
+
+
+def test_no_records(tmp_path):
+    tests = build_tests([])
+
+    assert len(tests.tests) == 0
+    assert reportify.TestsBuilder(False, Logger(False)).build().tests == {}
+
+    assert build_report([], 'Nightly', 'static', str(tmp_path / 'static'))
+    assert build_report([], 'Nightly', 'dynamic', str(tmp_path / 'dynamic'))
+
+    assert 'No tests found' in (tmp_path / 'static' / 'report.html').read_text()
+    assert os.path.exists(tmp_path / 'dynamic' / 'report' / 'report.html')
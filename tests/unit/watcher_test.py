@@ -0,0 +1,60 @@
+# SPDX-License-Identifier: MIT
+# type: ignore
+
+import pytest
+
+from internal import watcher
+from internal.logger import Logger
+from internal.watcher import Watcher
+
+
+class Clock:
+    now: float
+
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def sleep(self, seconds: float) -> None:
+        self.now += seconds
+
+    def monotonic(self) -> float:
+        return self.now
+
+
+def watch(monkeypatch, snapshots: list[str], initial: str | None = None) -> list[float]:
+    # Times of the updates for the snapshots taken every second, with a debounce of two seconds
+    clock = Clock()
+    monkeypatch.setattr(watcher.time, 'sleep', clock.sleep)
+    monkeypatch.setattr(watcher.time, 'monotonic', clock.monotonic)
+
+    states = iter(snapshots)
+    updates: list[float] = []
+
+    def snapshot() -> dict:
+        state = next(states, None)
+        if state is None:
+            raise KeyboardInterrupt
+
+        return {'report.json': state}
+
+    Watcher(1.0, 2.0, Logger(False)).watch(snapshot, lambda: updates.append(clock.now),
+                                           {'report.json': initial} if initial is not None else None)
+
+    return updates
+
+
+@pytest.mark.parametrize('snapshots, updates', [
+    ('aaaaa', []),
+    ('abbbbb', [3.0]),
+    ('abcdeeeee', [6.0]),
+    ('abbbcccc', [3.0, 6.0]),
+    ('abab', []),
+])
+def test_updates_once_the_inputs_are_quiet(monkeypatch, snapshots, updates):
+    assert watch(monkeypatch, list(snapshots)) == updates
+
+
+def test_changes_while_the_first_report_is_generated(monkeypatch):
+    # The files were read in state a, but changed before the watcher started
+    assert watch(monkeypatch, list('bbbb'), 'a') == [3.0]
+    assert watch(monkeypatch, list('aaaa'), 'a') == []